@@ -9,7 +9,7 @@ Usage:
     
 Commands:
     scrape      Esegue scraping delle fonti
-    dashboard   Genera dashboard HTML
+    dashboard   Genera dashboard HTML ed export Excel
     stats       Mostra statistiche
     full        Pipeline completa: scrape → download → summarize → dashboard
     
@@ -91,13 +91,14 @@ def cmd_scrape(args):
     classifier = TopicClassifier()
     all_articles = classifier.classify_all(all_articles)
     
-    # Salva Excel
+    # Salva articoli (database; l'Excel si esporta con la dashboard)
     print(f"\n💾 Salvataggio...")
     excel = ExcelGenerator()
     excel.save(all_articles)
     
-    # Genera dashboard se richiesto
+    # Genera dashboard (ed export Excel) se richiesto
     if args.dashboard:
+        excel.export_to_excel()
         topic_groups = classifier.group_by_topic(all_articles)
         dashboard = DashboardGenerator()
         dashboard.generate(all_articles, topic_groups)
@@ -122,8 +123,9 @@ def cmd_scrape(args):
             print(f"   • {topic}: {count}")
     
     print("=" * 60)
-    print(f"📄 Excel: {OUTPUT_DIR / 'report_consulting.xlsx'}")
+    print(f"🗄️ Database: {excel.db_path}")
     if args.dashboard:
+        print(f"📄 Excel: {excel.filepath}")
         print(f"🌐 Dashboard: {OUTPUT_DIR / 'dashboard.html'}")
     
     return 0
@@ -143,6 +145,9 @@ def cmd_dashboard(args):
     
     articles = df.to_dict('records')
     
+    # Export Excel dal database
+    excel.export_to_excel()
+    
     # Classifica
     classifier = TopicClassifier()
     articles = classifier.classify_all(articles)
@@ -152,6 +157,7 @@ def cmd_dashboard(args):
     dashboard = DashboardGenerator()
     dashboard.generate(articles, topic_groups)
     
+    print(f"✅ Excel: {excel.filepath}")
     print(f"✅ Dashboard: {OUTPUT_DIR / 'dashboard.html'}")
     return 0
 
@@ -295,7 +301,8 @@ def cmd_full(args):
     # Salva anche Excel
     excel = ExcelGenerator()
     excel.save(all_articles)
-    print(f"✅ Excel: {OUTPUT_DIR / 'report_consulting.xlsx'}")
+    excel.export_to_excel()
+    print(f"✅ Excel: {excel.filepath}")
     
     # ===== RIEPILOGO =====
     print("\n" + "=" * 70)
@@ -364,7 +371,7 @@ def main():
     )
     
     # Comando dashboard
-    dash_parser = subparsers.add_parser('dashboard', help='Genera dashboard HTML')
+    dash_parser = subparsers.add_parser('dashboard', help='Genera dashboard HTML ed export Excel')
     
     # Comando stats
     stats_parser = subparsers.add_parser('stats', help='Mostra statistiche')
@@ -10,13 +10,27 @@ import logging
 import re
 import random
 from datetime import datetime
+from functools import lru_cache
 from typing import Any, Dict, List, Optional
 from urllib.parse import urljoin, urlparse
 
+import requests
 from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from .config import SCRAPING, LOGS_DIR
 
+# Import opzionale di lxml: parser HTML in C, molto più rapido di html.parser
+try:
+    import lxml
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+# Parser usato per tutte le pagine HTML scaricate
+HTML_PARSER = 'lxml' if LXML_AVAILABLE else 'html.parser'
+
 # ==============================================================================
 # LOGGING SETUP
 # ==============================================================================
@@ -65,6 +79,12 @@ logger = setup_logger()
 # TEXT UTILITIES  
 # ==============================================================================
 
+# Regex precompilate: clean_text e slugify sono chiamate per ogni campo estratto
+_RE_WHITESPACE = re.compile(r'\s+')
+_RE_SLUG_INVALID = re.compile(r'[^\w\s-]')
+_RE_SLUG_SEPARATORS = re.compile(r'[-\s]+')
+
+
 def clean_text(text: str, max_length: int = 500) -> str:
     """
     Pulisce e normalizza testo
@@ -80,7 +100,7 @@ def clean_text(text: str, max_length: int = 500) -> str:
         return ''
     
     # Rimuovi whitespace multipli
-    text = re.sub(r'\s+', ' ', text)
+    text = _RE_WHITESPACE.sub(' ', text)
     
     # Strip
     text = text.strip()
@@ -106,8 +126,8 @@ def extract_text(element: Any) -> str:
 def slugify(text: str) -> str:
     """Converte testo in slug URL-safe"""
     text = text.lower()
-    text = re.sub(r'[^\w\s-]', '', text)
-    text = re.sub(r'[-\s]+', '-', text)
+    text = _RE_SLUG_INVALID.sub('', text)
+    text = _RE_SLUG_SEPARATORS.sub('-', text)
     return text.strip('-')
 
 # ==============================================================================
@@ -191,10 +211,64 @@ def get_request_headers() -> Dict[str, str]:
     headers['User-Agent'] = get_random_user_agent()
     return headers
 
+
+# Risposte transitorie ritentate dalla sessione (con backoff esponenziale)
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+
+def create_session() -> requests.Session:
+    """
+    Crea una Session HTTP con headers casuali e retry automatici
+    
+    La Session riusa le connessioni (keep-alive) verso lo stesso host;
+    gli errori transitori sono ritentati fino a SCRAPING.max_retries volte.
+    
+    Returns:
+        Session configurata
+    """
+    session = requests.Session()
+    session.headers.update(get_request_headers())
+    
+    adapter = HTTPAdapter(max_retries=Retry(
+        total=SCRAPING.max_retries,
+        backoff_factor=1,
+        status_forcelist=RETRY_STATUS_CODES,
+    ))
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    
+    return session
+
 # ==============================================================================
 # DATE UTILITIES
 # ==============================================================================
 
+# Formati numerici più comuni, riconosciuti senza passare da strptime
+_RE_ISO_DATE = re.compile(r'(\d{4})-(\d{1,2})-(\d{1,2})')
+_RE_SLASH_DATE = re.compile(r'(\d{1,2})/(\d{1,2})/(\d{4})')
+
+
+def _parse_numeric_date(date_str: str) -> Optional[datetime]:
+    """YYYY-MM-DD o DD/MM/YYYY (poi MM/DD/YYYY), come i formati di default"""
+    match = _RE_ISO_DATE.fullmatch(date_str)
+    if match:
+        year, month, day = match.groups()
+        candidates = [(year, month, day)]
+    else:
+        match = _RE_SLASH_DATE.fullmatch(date_str)
+        if not match:
+            return None
+        first, second, year = match.groups()
+        candidates = [(year, second, first), (year, first, second)]
+    
+    for year, month, day in candidates:
+        try:
+            return datetime(int(year), int(month), int(day))
+        except ValueError:
+            continue
+    return None
+
+
 def parse_date(date_str: str, formats: List[str] = None) -> Optional[datetime]:
     """
     Parsa stringa data in datetime
@@ -212,6 +286,11 @@ def parse_date(date_str: str, formats: List[str] = None) -> Optional[datetime]:
     date_str = date_str.strip()
     
     if formats is None:
+        # Percorso rapido: date numeriche senza eccezioni di strptime
+        parsed = _parse_numeric_date(date_str)
+        if parsed:
+            return parsed
+        
         formats = [
             '%B %d, %Y',      # December 23, 2025
             '%d %B %Y',       # 23 December 2025
@@ -276,6 +355,12 @@ def create_article(
     }
 
 
+@lru_cache(maxsize=32)
+def _keywords_pattern(keywords: tuple) -> re.Pattern:
+    """Una sola regex (alternanza di letterali) per tutte le keyword"""
+    return re.compile('|'.join(map(re.escape, keywords)))
+
+
 def is_relevant(title: str, description: str = '', keywords: List[str] = None) -> bool:
     """
     Verifica se articolo è rilevante per tecnologie dirompenti
@@ -293,9 +378,13 @@ def is_relevant(title: str, description: str = '', keywords: List[str] = None) -
     if keywords is None:
         keywords = RELEVANCE_KEYWORDS
     
+    if not keywords:
+        return False
+    
     text = f"{title} {description}".lower()
     
-    return any(kw in text for kw in keywords)
+    # Stessa semantica di any(kw in text): match di sottostringa, un solo passaggio
+    return _keywords_pattern(tuple(keywords)).search(text) is not None
 
 
 def deduplicate_articles(articles: List[Dict]) -> List[Dict]:
@@ -1,8 +1,14 @@
 # -*- coding: utf-8 -*-
 """
 Excel Generator - Generazione report Excel
+
+Gli articoli sono conservati in un database SQLite accanto al file Excel:
+save inserisce solo le righe nuove, export_to_excel rigenera il file Excel
+(export del database, modifiche manuali all'Excel non vengono reimportate).
 """
 
+import json
+import sqlite3
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List
@@ -12,6 +18,13 @@ import pandas as pd
 from ..core.config import OUTPUT_DIR, OUTPUT
 from ..core.utils import logger
 
+# Import opzionale xlsxwriter: scrive il file in streaming (una riga in RAM)
+try:
+    import xlsxwriter
+    XLSXWRITER_AVAILABLE = True
+except ImportError:
+    XLSXWRITER_AVAILABLE = False
+
 
 class ExcelGenerator:
     """
@@ -31,14 +44,82 @@ class ExcelGenerator:
             filename = OUTPUT.excel_filename
         
         self.filepath = OUTPUT_DIR / filename
+        self.db_path = self.filepath.with_suffix('.db')
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Apre il database articoli, importando l'Excel esistente alla prima apertura"""
+        is_new = not self.db_path.exists()
+        conn = sqlite3.connect(self.db_path)
+        
+        # Un articolo per URL: INSERT OR REPLACE tiene l'ultima versione, in coda
+        conn.execute('CREATE TABLE IF NOT EXISTS articles '
+                     '(url TEXT PRIMARY KEY NOT NULL, data TEXT NOT NULL)')
+        conn.execute('CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)')
+        
+        if is_new and self.filepath.exists():
+            self._import_excel(conn)
+        elif self.filepath.exists() and self._excel_mtime() != self._get_meta(conn, 'excel_mtime_ns'):
+            logger.warning(f"{self.filepath.name} modificato dopo l'ultimo export: "
+                           f"le modifiche manuali non sono in {self.db_path.name} "
+                           f"e verranno sovrascritte dal prossimo export")
+        
+        return conn
+    
+    def _excel_mtime(self) -> str:
+        """mtime del file Excel (ns), per riconoscere modifiche esterne"""
+        return str(self.filepath.stat().st_mtime_ns)
+    
+    @staticmethod
+    def _get_meta(conn: sqlite3.Connection, key: str):
+        row = conn.execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else None
+    
+    @staticmethod
+    def _set_meta(conn: sqlite3.Connection, key: str, value: str) -> None:
+        with conn:
+            conn.execute('INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)', (key, value))
+    
+    def _import_excel(self, conn: sqlite3.Connection) -> None:
+        """Migra nel database gli articoli di un Excel creato prima del database"""
+        try:
+            df = pd.read_excel(self.filepath)
+        except Exception as e:
+            logger.warning(f"Errore lettura esistente: {e}")
+            return
+        
+        df = df.astype(object).where(df.notna(), None)
+        imported = self._insert(conn, df.to_dict('records'))
+        self._set_meta(conn, 'excel_mtime_ns', self._excel_mtime())
+        logger.info(f"Importati {imported} record da {self.filepath.name} in {self.db_path.name} "
+                    f"(da ora il database è la fonte dei dati, l'Excel ne è l'export)")
+    
+    def _insert(self, conn: sqlite3.Connection, articles: List[Dict]) -> int:
+        """Inserisce (o sostituisce per URL) gli articoli; ritorna quanti ne ha scritti"""
+        rows = [(a['url'], json.dumps(a, ensure_ascii=False, default=str))
+                for a in articles if a.get('url')]
+        
+        skipped = len(articles) - len(rows)
+        if skipped:
+            logger.warning(f"{skipped} articoli senza URL non salvati")
+        
+        with conn:
+            conn.executemany('INSERT OR REPLACE INTO articles (url, data) VALUES (?, ?)', rows)
+        return len(rows)
+    
+    def _read_all(self, conn: sqlite3.Connection) -> pd.DataFrame:
+        """Tutti gli articoli, in ordine di inserimento"""
+        rows = conn.execute('SELECT data FROM articles ORDER BY rowid')
+        return pd.DataFrame([json.loads(data) for (data,) in rows])
     
     def save(self, articles: List[Dict], append: bool = True) -> bool:
         """
-        Salva articoli su Excel
+        Salva articoli nel database (solo le righe nuove)
+        
+        Il file Excel si rigenera con export_to_excel.
         
         Args:
             articles: Lista articoli
-            append: Se True, aggiunge a file esistente
+            append: Se True, aggiunge agli articoli esistenti
             
         Returns:
             True se successo
@@ -48,61 +129,105 @@ class ExcelGenerator:
             return False
         
         try:
-            # Converti a DataFrame
-            df_new = pd.DataFrame(articles)
-            
             # Aggiungi timestamp
-            df_new['scraped_at'] = datetime.now().isoformat()
+            scraped_at = datetime.now().isoformat()
+            new_articles = [{**a, 'scraped_at': scraped_at} for a in articles]
             
-            # Carica esistente se append
-            if append and self.filepath.exists():
-                try:
-                    df_existing = pd.read_excel(self.filepath)
-                    df = pd.concat([df_existing, df_new], ignore_index=True)
-                    
-                    # Rimuovi duplicati per URL
-                    df = df.drop_duplicates(subset=['url'], keep='last')
-                    
-                    logger.info(f"Aggiunti {len(df_new)} record (totale: {len(df)})")
-                except Exception as e:
-                    logger.warning(f"Errore lettura esistente: {e}")
-                    df = df_new
-            else:
-                df = df_new
+            conn = self._connect()
+            try:
+                if not append:
+                    with conn:
+                        conn.execute('DELETE FROM articles')
+                
+                # Duplicati per URL risolti dalla chiave primaria
+                added = self._insert(conn, new_articles)
+                total = conn.execute('SELECT COUNT(*) FROM articles').fetchone()[0]
+            finally:
+                conn.close()
             
-            # Ordina colonne
-            columns_order = [
-                'title', 'source', 'category', 'topic', 
-                'description', 'url', 'date', 'scraped_at'
-            ]
-            cols = [c for c in columns_order if c in df.columns]
-            cols += [c for c in df.columns if c not in cols]
-            df = df[cols]
+            logger.info(f"Aggiunti {added} record (totale: {total}) in {self.db_path}")
+            return True
             
-            # Salva
-            df.to_excel(self.filepath, index=False, engine='openpyxl')
-            logger.info(f"✅ Salvato: {self.filepath}")
+        except Exception as e:
+            logger.error(f"Errore salvataggio articoli: {e}")
+            return False
+    
+    def export_to_excel(self) -> bool:
+        """
+        Rigenera il file Excel da tutti gli articoli del database
+        
+        Returns:
+            True se successo
+        """
+        try:
+            conn = self._connect()
+            try:
+                df = self._read_all(conn)
+                
+                if df.empty:
+                    logger.warning("Nessun articolo da esportare")
+                    return False
+                
+                # Ordina colonne
+                columns_order = [
+                    'title', 'source', 'category', 'topic', 
+                    'description', 'url', 'date', 'scraped_at'
+                ]
+                cols = [c for c in columns_order if c in df.columns]
+                cols += [c for c in df.columns if c not in cols]
+                df = df[cols]
+                
+                if XLSXWRITER_AVAILABLE:
+                    self._write_xlsxwriter(df)
+                else:
+                    df.to_excel(self.filepath, index=False, engine='openpyxl')
+                
+                self._set_meta(conn, 'excel_mtime_ns', self._excel_mtime())
+            finally:
+                conn.close()
             
+            logger.info(f"✅ Salvato: {self.filepath}")
             return True
             
         except Exception as e:
             logger.error(f"Errore salvataggio Excel: {e}")
             return False
     
+    def _write_xlsxwriter(self, df: pd.DataFrame) -> None:
+        """Scrive il DataFrame riga per riga con xlsxwriter in constant_memory"""
+        # Celle vuote al posto di NaN (xlsxwriter non scrive NaN come numero)
+        df = df.astype(object).where(df.notna(), None)
+        
+        wb = xlsxwriter.Workbook(str(self.filepath), {
+            'constant_memory': True,
+            'strings_to_urls': False,
+        })
+        try:
+            ws = wb.add_worksheet()
+            ws.write_row(0, 0, list(df.columns))
+            for row_idx, row in enumerate(df.itertuples(index=False, name=None), start=1):
+                ws.write_row(row_idx, 0, row)
+        finally:
+            wb.close()
+    
     def load(self) -> pd.DataFrame:
         """
-        Carica articoli da Excel
+        Carica articoli dal database (o dall'Excel, alla prima apertura)
         
         Returns:
             DataFrame con articoli
         """
-        if not self.filepath.exists():
+        if not self.db_path.exists() and not self.filepath.exists():
             return pd.DataFrame()
         
         try:
-            return pd.read_excel(self.filepath)
+            conn = self._connect()
+            try:
+                return self._read_all(conn)
+            finally:
+                conn.close()
         except Exception as e:
-            logger.error(f"Errore lettura Excel: {e}")
+            logger.error(f"Errore lettura articoli: {e}")
             return pd.DataFrame()
     
     def get_stats(self) -> Dict:
@@ -11,17 +11,39 @@ from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 from urllib.parse import urlparse, urljoin
 
-import requests
+import soupsieve
 from bs4 import BeautifulSoup
 
 from ..core.config import OUTPUT_DIR, SCRAPING
-from ..core.utils import logger, get_request_headers, slugify
+from ..core.utils import logger, create_session, slugify, HTML_PARSER
 
 
+# Download consecutivi verso lo stesso dominio prima della pausa di cortesia
+DOWNLOADS_PER_PAUSE = 5
+
 # Directory per documenti scaricati
 DOCS_DIR = OUTPUT_DIR.parent / "docs"
 DOCS_DIR.mkdir(exist_ok=True)
 
+# Selettori comuni per il contenuto articolo, in ordine di priorità
+MAIN_CONTENT_SELECTORS = [
+    'article',
+    'main',
+    '[role="main"]',
+    '.article-content',
+    '.article-body',
+    '.post-content',
+    '.entry-content',
+    '.content-main',
+    '#content',
+    '.insight-content',
+    '.publication-content',
+]
+
+# Un solo selettore composto (una visita dell'albero) + un matcher per selettore
+_MAIN_CONTENT_QUERY = soupsieve.compile(', '.join(MAIN_CONTENT_SELECTORS))
+_MAIN_CONTENT_MATCHERS = [soupsieve.compile(sel) for sel in MAIN_CONTENT_SELECTORS]
+
 
 class DocumentDownloader:
     """
@@ -34,10 +56,13 @@ class DocumentDownloader:
     """
     
     def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update(get_request_headers())
+        self.session = create_session()
         self.downloaded = []
         self.failed = []
+        
+        # Rate limiting per dominio: download fatti e prossimo istante consentito
+        self._domain_hits: Dict[str, int] = {}
+        self._domain_ready_at: Dict[str, float] = {}
     
     def download_article(self, article: Dict) -> Dict:
         """
@@ -93,16 +118,31 @@ class DocumentDownloader:
         """
         logger.info(f"📥 Download documenti (max {max_docs})...")
         
-        for i, article in enumerate(articles[:max_docs]):
+        for article in articles[:max_docs]:
+            # Rate limiting per dominio: la pausa di un sito non blocca gli altri
+            domain = urlparse(article.get('url', '')).netloc
+            self._wait_for_domain(domain)
+            
             article = self.download_article(article)
             
-            # Rate limiting
-            if i > 0 and i % 5 == 0:
-                time.sleep(SCRAPING.request_delay)
+            self._record_domain_hit(domain)
         
         logger.info(f"✅ Downloaded: {len(self.downloaded)}, Failed: {len(self.failed)}")
         return articles
     
+    def _wait_for_domain(self, domain: str) -> None:
+        """Attende solo se il dominio è ancora in pausa"""
+        wait = self._domain_ready_at.get(domain, 0.0) - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+    
+    def _record_domain_hit(self, domain: str) -> None:
+        """Ogni DOWNLOADS_PER_PAUSE download mette il dominio in pausa"""
+        hits = self._domain_hits.get(domain, 0) + 1
+        self._domain_hits[domain] = hits
+        if hits % DOWNLOADS_PER_PAUSE == 0:
+            self._domain_ready_at[domain] = time.monotonic() + SCRAPING.request_delay
+    
     def _download_pdf(self, url: str, filename: str) -> Optional[Dict]:
         """Scarica PDF"""
         try:
@@ -139,7 +179,7 @@ class DocumentDownloader:
             response = self.session.get(url, timeout=30)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = BeautifulSoup(response.text, HTML_PARSER)
             
             # Rimuovi elementi non utili
             for tag in soup(['script', 'style', 'nav', 'header', 'footer', 
@@ -179,23 +219,12 @@ class DocumentDownloader:
     
     def _find_main_content(self, soup: BeautifulSoup) -> Optional[BeautifulSoup]:
         """Trova il contenuto principale della pagina"""
-        # Prova selettori comuni per contenuto articolo
-        selectors = [
-            'article',
-            'main',
-            '[role="main"]',
-            '.article-content',
-            '.article-body',
-            '.post-content',
-            '.entry-content',
-            '.content-main',
-            '#content',
-            '.insight-content',
-            '.publication-content',
-        ]
+        # Candidati di tutti i selettori in una sola visita, in ordine di documento
+        candidates = _MAIN_CONTENT_QUERY.select(soup)
         
-        for selector in selectors:
-            content = soup.select_one(selector)
+        # Per ogni selettore (in ordine di priorità) conta il primo candidato
+        for matcher in _MAIN_CONTENT_MATCHERS:
+            content = next((el for el in candidates if matcher.match(el)), None)
             if content and len(content.get_text(strip=True)) > 500:
                 return content
         
@@ -12,8 +12,9 @@ from bs4 import BeautifulSoup
 
 from ..core.config import SCRAPING, SourceConfig
 from ..core.utils import (
-    logger, get_request_headers, normalize_url, 
-    create_article, deduplicate_articles, extract_category_from_url
+    logger, create_session, normalize_url, 
+    create_article, deduplicate_articles, extract_category_from_url,
+    HTML_PARSER
 )
 
 
@@ -32,8 +33,7 @@ class BaseScraper(ABC):
             source: Configurazione della fonte
         """
         self.source = source
-        self.session = requests.Session()
-        self.session.headers.update(get_request_headers())
+        self.session = create_session()
     
     @abstractmethod
     def scrape(self, max_articles: int = None) -> List[Dict]:
@@ -72,7 +72,7 @@ class BaseScraper(ABC):
     
     def parse_html(self, html: str) -> BeautifulSoup:
         """Parsa HTML in BeautifulSoup"""
-        return BeautifulSoup(html, 'html.parser')
+        return BeautifulSoup(html, HTML_PARSER)
     
     def extract_links(self, soup: BeautifulSoup, pattern: str) -> List[Dict]:
         """
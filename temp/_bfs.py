@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""
+BFS su grafi in formato CSR (indptr/indices con ID interi)
+Compilata con Numba se disponibile, altrimenti in Python puro
+"""
+
+from typing import List
+
+# Import opzionale di Numba per compilare il ciclo BFS
+try:
+    import numpy as np
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+def bfs_parents_py(indptr, indices, src: int, n: int) -> List[int]:
+    """
+    BFS in Python puro
+
+    Returns:
+        Padre di ogni nodo nel percorso più breve da src;
+        -1 per la sorgente e per i nodi non raggiungibili
+    """
+    parents = [-1] * n
+    seen = [False] * n
+    seen[src] = True
+    queue = [src]
+    append = queue.append
+    head = 0
+
+    # Coda su lista con indice di testa: niente popleft né LOAD_ATTR nel ciclo
+    while head < len(queue):
+        current = queue[head]
+        head += 1
+        for neighbor in indices[indptr[current]:indptr[current + 1]]:
+            if not seen[neighbor]:
+                seen[neighbor] = True
+                parents[neighbor] = current
+                append(neighbor)
+
+    return parents
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def bfs_parents(indptr, indices, src, n):
+        """
+        BFS compilata: stessa semantica di bfs_parents_py, ritorna un array int32
+
+        cache=True salva il codice compilato su disco: la compilazione
+        avviene una sola volta, non a ogni avvio del processo.
+        """
+        parents = np.full(n, -1, np.int32)
+        seen = np.zeros(n, np.bool_)
+        queue = np.empty(n, np.int32)
+        seen[src] = True
+        queue[0] = src
+        head = 0
+        tail = 1
+
+        while head < tail:
+            current = queue[head]
+            head += 1
+            for k in range(indptr[current], indptr[current + 1]):
+                neighbor = indices[k]
+                if not seen[neighbor]:
+                    seen[neighbor] = True
+                    parents[neighbor] = current
+                    queue[tail] = neighbor
+                    tail += 1
+
+        return parents
+else:
+    bfs_parents = bfs_parents_py
@@ -12,7 +12,7 @@ Data: 22 Dicembre 2025
 import os
 import re
 import json
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 
 # AI APIs
@@ -30,6 +30,38 @@ except ImportError:
 
 import utils
 
+# Limite di caratteri per documento inviato all'LLM (~3000 tokens)
+MAX_DOCUMENT_CHARS = 12000
+
+# Token di output massimi dei modelli predefiniti (gpt-4-turbo-preview, claude-3-sonnet)
+MAX_OUTPUT_TOKENS = 4096
+
+# Token di output riservati all'analisi di un documento
+TOKENS_PER_ANALYSIS = 2000
+
+# Documenti per chiamata batch senza superare MAX_OUTPUT_TOKENS
+MAX_BATCH_DOCS = max(1, MAX_OUTPUT_TOKENS // TOKENS_PER_ANALYSIS)
+
+# Struttura JSON richiesta per l'analisi di un documento
+ANALYSIS_JSON_SCHEMA = """{
+    "summary": "Riassunto esecutivo del documento (200-300 parole)",
+    "topics": ["Lista", "di", "topic", "rilevanti"],
+    "key_insights": [
+        "Insight 1 - punto chiave o finding importante",
+        "Insight 2 - altro punto chiave",
+        "Insight 3 - ...",
+    ],
+    "technologies": ["Tecnologie", "menzionate"],
+    "trends": ["Trend", "identificati"],
+    "business_implications": "Implicazioni per il business (100 parole)",
+    "sentiment": "positive/neutral/negative",
+    "confidence": "high/medium/low"
+}"""
+
+ANALYSIS_GUIDELINES = """- Estrai insights concreti e specifici
+- Identifica tecnologie emergenti menzionate
+- I topics devono essere categorie ampie (AI, Blockchain, Cloud, Cybersecurity, etc.)"""
+
 
 class AIAnalyzer:
     """Analizza documenti usando AI"""
@@ -80,18 +112,11 @@ class AIAnalyzer:
         Returns:
             Dict con risultati analisi
         """
-        text = parsed_doc.get('text', '')
+        text = self._prepare_text(parsed_doc)
         
-        if not text or len(text) < 100:
-            self.logger.warning(f"⚠️  Testo troppo breve per analisi: {len(text)} caratteri")
+        if text is None:
             return None
         
-        # Tronca testo se troppo lungo (limiti API)
-        max_chars = 12000  # ~3000 tokens
-        if len(text) > max_chars:
-            self.logger.info(f"  Troncamento testo: {len(text)} -> {max_chars} caratteri")
-            text = text[:max_chars] + "..."
-        
         if analysis_type == 'full':
             return self._full_analysis(text, parsed_doc)
         elif analysis_type == 'summary':
@@ -103,6 +128,29 @@ class AIAnalyzer:
         else:
             raise ValueError(f"Tipo analisi non supportato: {analysis_type}")
     
+    def _prepare_text(self, parsed_doc: Dict) -> Optional[str]:
+        """Testo da analizzare, troncato ai limiti API (None se troppo breve)"""
+        text = parsed_doc.get('text', '')
+        
+        if not text or len(text) < 100:
+            self.logger.warning(f"⚠️  Testo troppo breve per analisi: {len(text)} caratteri")
+            return None
+        
+        # Tronca testo se troppo lungo (limiti API)
+        if len(text) > MAX_DOCUMENT_CHARS:
+            self.logger.info(f"  Troncamento testo: {len(text)} -> {MAX_DOCUMENT_CHARS} caratteri")
+            text = text[:MAX_DOCUMENT_CHARS] + "..."
+        
+        return text
+    
+    def _add_metadata(self, result: Dict, parsed_doc: Dict) -> Dict:
+        """Aggiunge all'analisi i metadata di modello e documento"""
+        result['analyzed_at'] = datetime.now().isoformat()
+        result['model'] = self.model
+        result['provider'] = self.provider
+        result['source_document'] = parsed_doc['filename']
+        return result
+    
     def _full_analysis(self, text: str, parsed_doc: Dict) -> Dict:
         """Analisi completa del documento"""
         
@@ -114,26 +162,11 @@ DOCUMENTO:
 {text}
 
 Fornisci l'analisi in formato JSON con questa struttura:
-{{
-    "summary": "Riassunto esecutivo del documento (200-300 parole)",
-    "topics": ["Lista", "di", "topic", "rilevanti"],
-    "key_insights": [
-        "Insight 1 - punto chiave o finding importante",
-        "Insight 2 - altro punto chiave",
-        "Insight 3 - ...",
-    ],
-    "technologies": ["Tecnologie", "menzionate"],
-    "trends": ["Trend", "identificati"],
-    "business_implications": "Implicazioni per il business (100 parole)",
-    "sentiment": "positive/neutral/negative",
-    "confidence": "high/medium/low"
-}}
+{ANALYSIS_JSON_SCHEMA}
 
 IMPORTANTE:
 - Rispondi SOLO con JSON valido
-- Estrai insights concreti e specifici
-- Identifica tecnologie emergenti menzionate
-- I topics devono essere categorie ampie (AI, Blockchain, Cloud, Cybersecurity, etc.)
+{ANALYSIS_GUIDELINES}
 """
         
         try:
@@ -144,10 +177,7 @@ IMPORTANTE:
             
             if result:
                 # Aggiungi metadata
-                result['analyzed_at'] = datetime.now().isoformat()
-                result['model'] = self.model
-                result['provider'] = self.provider
-                result['source_document'] = parsed_doc['filename']
+                self._add_metadata(result, parsed_doc)
                 
                 self.logger.info(f"  ✅ Analisi completata: {len(result.get('key_insights', []))} insights estratti")
                 
@@ -231,8 +261,9 @@ Rispondi con lista numerata:
         
         return insights
     
-    def _call_llm(self, prompt: str, max_tokens: int = 2000) -> str:
+    def _call_llm(self, prompt: str, max_tokens: int = TOKENS_PER_ANALYSIS) -> str:
         """Chiama LLM (OpenAI o Anthropic)"""
+        max_tokens = min(max_tokens, MAX_OUTPUT_TOKENS)
         
         if self.provider == 'openai':
             response = openai.ChatCompletion.create(
@@ -257,6 +288,89 @@ Rispondi con lista numerata:
             )
             return message.content[0].text
     
+    def analyze_documents_batch(self, parsed_docs: List[Dict]) -> List[Optional[Dict]]:
+        """
+        Analisi completa di più documenti, una chiamata LLM per gruppo
+        
+        Prompt di sistema, istruzioni e latenza della richiesta sono pagati una
+        volta per gruppo di MAX_BATCH_DOCS documenti (limite dei token di
+        output). Se la risposta non è un array JSON valido con un'analisi per
+        documento, il gruppo ricade sull'analisi singola.
+        
+        Args:
+            parsed_docs: Documenti parsati (da DocumentParser)
+        
+        Returns:
+            Analisi nello stesso ordine di parsed_docs (None se non analizzabile)
+        """
+        results: List[Optional[Dict]] = [None] * len(parsed_docs)
+        batch = []
+        for i, doc in enumerate(parsed_docs):
+            text = self._prepare_text(doc)
+            if text is not None:
+                batch.append((i, doc, text))
+        
+        for start in range(0, len(batch), MAX_BATCH_DOCS):
+            self._analyze_group(batch[start:start + MAX_BATCH_DOCS], results)
+        
+        return results
+    
+    def _analyze_group(self, batch: List[Tuple[int, Dict, str]], results: List[Optional[Dict]]) -> None:
+        """Analizza (indice, documento, testo) con una chiamata, scrivendo in results"""
+        if len(batch) == 1:
+            i, doc, text = batch[0]
+            results[i] = self._full_analysis(text, doc)
+            return
+        
+        self.logger.info(f"🤖 Analisi AI batch: {len(batch)} documenti")
+        
+        documents = "\n\n".join(
+            f"<DOC {n}>\n{text}\n</DOC {n}>" for n, (_, _, text) in enumerate(batch, 1)
+        )
+        prompt = f"""Analizza ciascuno dei seguenti {len(batch)} documenti di consulenza aziendale.
+
+{documents}
+
+Rispondi con un array JSON di {len(batch)} oggetti, uno per documento e nello stesso ordine,
+ognuno con questa struttura:
+{ANALYSIS_JSON_SCHEMA}
+
+IMPORTANTE:
+- Rispondi SOLO con l'array JSON valido
+{ANALYSIS_GUIDELINES}
+"""
+        
+        try:
+            parsed = self._parse_json_array(
+                self._call_llm(prompt, max_tokens=TOKENS_PER_ANALYSIS * len(batch)))
+        except Exception as e:
+            self.logger.error(f"❌ Errore analisi AI batch: {e}")
+            parsed = None
+        
+        if parsed is None or len(parsed) != len(batch) or not all(isinstance(r, dict) for r in parsed):
+            self.logger.warning("⚠️  Risposta batch non valida: analisi documento per documento")
+            for i, doc, text in batch:
+                results[i] = self._full_analysis(text, doc)
+            return
+        
+        for (i, doc, _), result in zip(batch, parsed):
+            results[i] = self._add_metadata(result, doc)
+    
+    @staticmethod
+    def _parse_json_array(response: str) -> Optional[List]:
+        """Parse di un array JSON da risposta LLM"""
+        json_match = re.search(r'\[.*\]', response, re.DOTALL)
+        
+        if json_match:
+            try:
+                result = json.loads(json_match.group())
+                if isinstance(result, list):
+                    return result
+            except json.JSONDecodeError:
+                pass
+        
+        return None
+    
     @staticmethod
     def _parse_json_response(response: str) -> Optional[Dict]:
         """Parse JSON da risposta LLM"""
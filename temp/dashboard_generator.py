@@ -57,7 +57,7 @@ class DashboardGenerator:
         topics = []
         
         for topic_name, data in sorted(topics_data.items()):
-            if not data.reports and not data.insights:
+            if not data.report_count and not data.insight_count:
                 continue
             
             # Organizza report per source
@@ -76,8 +76,8 @@ class DashboardGenerator:
                 'slug': topic_name.lower().replace(' ', '-'),
                 'sources': data.sources,
                 'source_count': len(data.sources),
-                'report_count': len(data.reports),
-                'insight_count': len(data.insights),
+                'report_count': data.report_count,
+                'insight_count': data.insight_count,
                 'reports_by_source': reports_by_source,
                 'top_insights': top_insights,
                 'narrative': data.narrative,
@@ -13,6 +13,7 @@ import json
 from typing import Dict, Optional, List
 from datetime import datetime
 from pathlib import Path
+from threading import Lock
 import requests
 import utils
 
@@ -38,6 +39,10 @@ class DocumentManager:
         # File per tracciare documenti scaricati (evitare duplicati)
         self.index_file = self.metadata_dir / 'document_index.json'
         self.index = self._load_index()
+        self._index_lock = Lock()  # download paralleli aggiornano lo stesso indice
+        
+        # Sessione condivisa: connessioni keep-alive riusate tra i download
+        self.session = requests.Session()
         
         self.logger = utils.logger
     
@@ -80,7 +85,7 @@ class DocumentManager:
         self.logger.info(f"⬇️  Downloading: {document_url}")
         
         try:
-            response = requests.get(
+            response = self.session.get(
                 document_url,
                 timeout=30,
                 headers={'User-Agent': utils.get_random_user_agent()}
@@ -133,8 +138,9 @@ class DocumentManager:
             }
             
             # Aggiungi a index
-            self.index[url_hash] = metadata
-            self._save_index()
+            with self._index_lock:
+                self.index[url_hash] = metadata
+                self._save_index()
             
             # Salva metadata individuale
             metadata_file = self.metadata_dir / f"{filename}.json"
@@ -4,10 +4,18 @@ Enhanced Scraper - Supporto Selenium per siti JS-heavy
 Global Insight Tracker v2.1
 """
 
+import asyncio
+import queue
+import shutil
+import tempfile
 import time
 import re
-from typing import List, Dict, Optional
-from bs4 import BeautifulSoup
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Dict, Optional, Set, Union
+from bs4 import BeautifulSoup, SoupStrainer
 import logging
 
 logger = logging.getLogger(__name__)
@@ -20,18 +28,198 @@ try:
     from selenium.webdriver.common.by import By
     from selenium.webdriver.support.ui import WebDriverWait
     from selenium.webdriver.support import expected_conditions as EC
+    from selenium.common.exceptions import TimeoutException
     from webdriver_manager.chrome import ChromeDriverManager
     SELENIUM_AVAILABLE = True
 except ImportError:
     SELENIUM_AVAILABLE = False
     logger.warning("Selenium non disponibile - pip install selenium webdriver-manager")
 
+# Import opzionale Playwright (fetch concorrente di più URL)
+try:
+    from playwright.async_api import async_playwright
+    from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+    PLAYWRIGHT_AVAILABLE = True
+except ImportError:
+    PLAYWRIGHT_AVAILABLE = False
+
+# Import opzionale xxhash (fingerprint URL)
+try:
+    import xxhash
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
+
+# Lock del profilo Chrome: fcntl (POSIX) o msvcrt (Windows)
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False
+try:
+    import msvcrt
+    MSVCRT_AVAILABLE = True
+except ImportError:
+    MSVCRT_AVAILABLE = False
+
+# Import opzionale lxml (parsing in streaming dei link)
+try:
+    from lxml import etree
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+# Pagine caricate in parallelo da Playwright
+MAX_CONCURRENT_PAGES = 5
+
+# Driver Selenium condivisi tra tutte le fonti in scrape_all
+POOL_SIZE = 4
+
+# Flag Chrome per ridurre lavoro di rendering in background
+PERF_CHROME_FLAGS = [
+    '--disable-background-timer-throttling',
+    '--disable-renderer-backgrounding',
+    '--disable-hang-monitor',
+    '--mute-audio',
+    '--disable-client-side-phishing-detection',
+]
+
+# Contenuti non usati per l'estrazione link (2 = blocca)
+BLOCKED_CONTENT_PREFS = {
+    "profile.managed_default_content_settings.images": 2,
+    "profile.managed_default_content_settings.stylesheets": 2,
+    "profile.default_content_setting_values.notifications": 2,
+}
+
+BLOCKED_URL_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.woff*", "*.mp4",
+    "*google-analytics*", "*doubleclick*",
+]
+
+# Parsing limitato ai soli anchor con href (fallback senza lxml)
+_ANCHOR_STRAINER = SoupStrainer('a', href=True)
+
+# Profilo Chrome persistente (cache HTTP/DNS calde tra esecuzioni)
+DEFAULT_PROFILE_DIR = Path.home() / '.cache' / 'git_scraper_profile'
+DISK_CACHE_SIZE = 200 * 1024 * 1024
+
+# File di lock che riserva il profilo a un solo driver
+PROFILE_LOCK_NAME = '.scraper.lock'
+
+# Attesa massima (secondi) di nuovi contenuti dopo uno scroll
+SCROLL_CONTENT_WAIT = 2
+
+# Limite di sicurezza sugli scroll di una pagina (liste a scroll infinito)
+MAX_SCROLL_STEPS = 100
+
+# Altezza pagina e numero di link: cambiano quando arriva contenuto lazy
+_PAGE_CONTENT_JS = "return [document.body.scrollHeight, document.links.length];"
+
+# Dimensione blocchi passati al parser incrementale
+_PARSE_CHUNK_SIZE = 64 * 1024
+
+_WS_RE = re.compile(r'\s+')
+
+# Titoli di link di navigazione/generici da scartare
+_SKIP_RE = re.compile(
+    r'subscribe|newsletter|contact|about|login|sign in|register|careers|locations|search',
+    re.IGNORECASE
+)
+
+# Path di navigazione da scartare prima di estrarre il titolo
+_SKIP_HREF_RE = re.compile(
+    r'/(about|careers|contact|locations|subscribe|newsletter|login|register|search)(/|$)',
+    re.IGNORECASE
+)
+
+# Pattern URL -> categoria (l'ordine conta: vince il primo match)
+_CATEGORY_PATTERNS = (
+    ('technology', 'Technology'),
+    ('digital', 'Digital Transformation'),
+    ('ai', 'Artificial Intelligence'),
+    ('data', 'Data & Analytics'),
+    ('cloud', 'Cloud'),
+    ('cyber', 'Cybersecurity'),
+    ('financial', 'Financial Services'),
+    ('healthcare', 'Healthcare'),
+    ('consumer', 'Consumer'),
+    ('energy', 'Energy'),
+    ('manufacturing', 'Manufacturing'),
+)
+
+# Frammento dominio -> nome sorgente
+_DOMAIN_MAP = (
+    ('deloitte', 'Deloitte'),
+    ('pwc', 'PwC'),
+    ('mckinsey', 'McKinsey'),
+    ('bcg', 'BCG'),
+    ('ey.', 'EY'),
+    ('ey-', 'EY'),
+    ('kpmg', 'KPMG'),
+    ('accenture', 'Accenture'),
+    ('bain', 'Bain'),
+    ('gartner', 'Gartner'),
+    ('forrester', 'Forrester'),
+    ('idc', 'IDC'),
+)
+
+
+def _collapse_ws(text: str) -> str:
+    """Riduce spazi multipli/newline/tab a uno spazio, solo se presenti"""
+    if '  ' in text or '\n' in text or '\t' in text or '\r' in text:
+        return _WS_RE.sub(' ', text)
+    return text
+
+
+@lru_cache(maxsize=4096)
+def _extract_category(url: str) -> str:
+    """Categoria da URL (memoizzata: gli href si ripetono molto tra pagine)"""
+    url_lower = url.lower()
+    for pattern, category in _CATEGORY_PATTERNS:
+        if pattern in url_lower:
+            return category
+    return 'General'
+
+
+def url_fingerprint(url: str) -> int:
+    """Fingerprint intero a 64 bit di un URL per deduplica"""
+    if XXHASH_AVAILABLE:
+        return xxhash.xxh3_64_intdigest(url)
+    return hash(url) & ((1 << 63) - 1)
+
+
+def _try_lock(lock_path: Path):
+    """Lock esclusivo non bloccante; None se il file è già bloccato"""
+    handle = open(lock_path, 'a+')
+    try:
+        if FCNTL_AVAILABLE:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        elif MSVCRT_AVAILABLE:
+            handle.seek(0)
+            msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)
+    except OSError:
+        handle.close()
+        return None
+    return handle
+
 
 class EnhancedScraper:
     """Scraper potenziato con supporto Selenium per siti JavaScript-heavy"""
     
-    def __init__(self):
+    def __init__(self, profile_dir: Optional[Path] = None, pool_size: int = 1):
+        """
+        Args:
+            profile_dir: Directory profilo Chrome; se già in uso da un altro
+                driver si ripiega su un profilo temporaneo
+            pool_size: Driver Selenium usati in parallelo da fetch_pages
+        """
         self.driver = None
+        self._profile_dir = Path(profile_dir) if profile_dir else DEFAULT_PROFILE_DIR
+        self._profile_lock = None
+        self._temp_profile_dir: Optional[Path] = None
+        self.pool_size = max(1, pool_size)
+        self._workers: List['EnhancedScraper'] = []
+        self._cdp_navigation = False
         
     def _get_driver(self):
         """Inizializza Chrome driver"""
@@ -46,26 +234,95 @@ class EnhancedScraper:
             opts.add_argument('--no-sandbox')
             opts.add_argument('--disable-dev-shm-usage')
             opts.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36')
+            for flag in PERF_CHROME_FLAGS:
+                opts.add_argument(flag)
+            profile_dir = self._acquire_profile_dir()
+            opts.add_argument(f'--user-data-dir={profile_dir}')
+            opts.add_argument(f'--disk-cache-dir={profile_dir / "cache"}')
+            opts.add_argument(f'--disk-cache-size={DISK_CACHE_SIZE}')
+            opts.add_experimental_option("prefs", BLOCKED_CONTENT_PREFS)
             
             service = Service(ChromeDriverManager().install())
             self.driver = webdriver.Chrome(service=service, options=opts)
             
+            # Blocca risorse non necessarie all'estrazione dei link
+            try:
+                self.driver.execute_cdp_cmd("Network.enable", {})
+                self.driver.execute_cdp_cmd("Network.setBlockedURLs",
+                                            {"urls": BLOCKED_URL_PATTERNS})
+            except Exception as e:
+                logger.debug(f"Blocco risorse CDP non disponibile: {e}")
+            
+            # Navigazione via CDP (non attende tracker e beacon)
+            try:
+                self.driver.execute_cdp_cmd("Page.enable", {})
+                self._cdp_navigation = True
+            except Exception as e:
+                logger.debug(f"Navigazione CDP non disponibile: {e}")
+            
         return self.driver
     
+    def _acquire_profile_dir(self) -> Path:
+        """Profilo persistente se libero (creato al primo uso), altrimenti temporaneo"""
+        if self._profile_lock is not None:
+            return self._profile_dir
+        if self._temp_profile_dir is not None:
+            return self._temp_profile_dir
+        
+        try:
+            self._profile_dir.mkdir(parents=True, exist_ok=True)
+            self._profile_lock = _try_lock(self._profile_dir / PROFILE_LOCK_NAME)
+        except OSError as e:
+            logger.debug(f"Profilo Chrome {self._profile_dir} non utilizzabile: {e}")
+        
+        if self._profile_lock is not None:
+            return self._profile_dir
+        
+        logger.warning(f"Profilo Chrome {self._profile_dir} già in uso - uso un profilo temporaneo")
+        self._temp_profile_dir = Path(tempfile.mkdtemp(prefix=f"{self._profile_dir.name}-"))
+        return self._temp_profile_dir
+    
+    def _release_profile_dir(self) -> None:
+        """Rilascia il lock del profilo e rimuove l'eventuale profilo temporaneo"""
+        if self._profile_lock is not None:
+            self._profile_lock.close()
+            self._profile_lock = None
+        if self._temp_profile_dir is not None:
+            shutil.rmtree(self._temp_profile_dir, ignore_errors=True)
+            self._temp_profile_dir = None
+    
+    def _get_workers(self) -> List['EnhancedScraper']:
+        """Scraper del pool: questo più pool_size-1 con profilo Chrome dedicato"""
+        if not self._workers:
+            self._workers = [self] + [
+                EnhancedScraper(profile_dir=self._profile_dir.with_name(
+                    f"{self._profile_dir.name}-{i}"))
+                for i in range(1, self.pool_size)
+            ]
+        return self._workers
+    
     def close(self):
-        """Chiudi browser"""
+        """Chiudi browser (anche quelli del pool)"""
+        for worker in self._workers:
+            if worker is not self:
+                worker.close()
+        self._workers = []
         if self.driver:
             self.driver.quit()
             self.driver = None
+        self._release_profile_dir()
     
-    def fetch_with_js(self, url: str, wait_time: int = 8, scroll: bool = True) -> str:
+    def fetch_with_js(self, url: str, wait_time: int = 8, scroll: bool = True,
+                      link_pattern: Optional[str] = None) -> str:
         """
         Scarica pagina con rendering JavaScript completo
         
         Args:
             url: URL da scaricare
-            wait_time: Secondi da attendere per rendering
+            wait_time: Secondi massimi da attendere per rendering
             scroll: Se True, scrolla la pagina per caricare lazy content
+            link_pattern: Pattern degli href attesi; se presente si attende
+                la comparsa dei link invece di un tempo fisso
             
         Returns:
             HTML completo della pagina
@@ -73,24 +330,169 @@ class EnhancedScraper:
         driver = self._get_driver()
         
         logger.info(f"Caricamento JS: {url}")
-        driver.get(url)
+        self._navigate(driver, url, wait_time)
         
-        # Attendi rendering iniziale
-        time.sleep(wait_time)
+        # Attendi rendering iniziale (ritorna appena i link sono presenti)
+        if link_pattern:
+            selector = f"a[href*='{link_pattern}']"
+            try:
+                WebDriverWait(driver, wait_time).until(
+                    lambda d: len(d.find_elements(By.CSS_SELECTOR, selector)) >= 10
+                )
+            except TimeoutException:
+                logger.debug(f"Timeout attesa link '{link_pattern}' su {url}")
+        else:
+            time.sleep(wait_time)
         
         # Scroll per caricare lazy content
         if scroll:
-            for i in range(3):
-                driver.execute_script(f"window.scrollTo(0, {(i+1) * 1000});")
-                time.sleep(1)
-            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(2)
-            driver.execute_script("window.scrollTo(0, 0);")
+            self._scroll_page(driver, wait_time)
         
         return driver.page_source
     
+    def fetch_pages(self, urls: List[str], link_pattern: Union[str, List[str]],
+                    wait_time: int = 8) -> List[tuple]:
+        """
+        Scarica più pagine con rendering JavaScript
+        
+        Usa un solo Chromium Playwright con un contesto per pagina se
+        disponibile, altrimenti distribuisce gli URL sul pool di driver Selenium.
+        
+        Args:
+            urls: URL da scaricare
+            link_pattern: Pattern degli href attesi, unico o uno per URL
+            wait_time: Secondi massimi di attesa per pagina
+            
+        Returns:
+            Lista di tuple (url, html) dove html è un'eccezione se il fetch fallisce
+        """
+        if isinstance(link_pattern, str):
+            patterns = [link_pattern] * len(urls)
+        else:
+            patterns = list(link_pattern)
+        
+        if PLAYWRIGHT_AVAILABLE:
+            try:
+                pages = asyncio.run(self.fetch_many(urls, patterns, wait_time))
+                return list(zip(urls, pages))
+            except Exception as e:
+                logger.warning(f"Playwright non utilizzabile, uso Selenium: {e}")
+        
+        workers = queue.Queue()
+        for worker in self._get_workers():
+            workers.put(worker)
+        
+        def fetch(job):
+            url, pattern = job
+            worker = workers.get()
+            try:
+                return url, worker.fetch_with_js(url, wait_time=wait_time,
+                                                 link_pattern=pattern)
+            except Exception as e:
+                return url, e
+            finally:
+                workers.put(worker)
+        
+        with ThreadPoolExecutor(max_workers=self.pool_size) as executor:
+            return list(executor.map(fetch, zip(urls, patterns)))
+    
+    async def fetch_many(self, urls: List[str], link_pattern: Union[str, List[str]],
+                         wait_time: int = 8) -> List:
+        """
+        Scarica URL in parallelo con Playwright (un BrowserContext per pagina)
+        
+        Returns:
+            HTML per ogni URL, nello stesso ordine, o l'eccezione sollevata
+        """
+        if isinstance(link_pattern, str):
+            link_pattern = [link_pattern] * len(urls)
+        
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=True, args=PERF_CHROME_FLAGS)
+            sem = asyncio.Semaphore(MAX_CONCURRENT_PAGES)
+            
+            async def one(url: str, pattern: str) -> str:
+                selector = f"a[href*='{pattern}']"
+                async with sem:
+                    ctx = await browser.new_context()
+                    try:
+                        page = await ctx.new_page()
+                        logger.info(f"Caricamento JS: {url}")
+                        await page.goto(url, wait_until='domcontentloaded')
+                        try:
+                            await page.wait_for_selector(selector, timeout=wait_time * 1000)
+                        except PlaywrightTimeoutError:
+                            logger.debug(f"Timeout attesa link '{pattern}' su {url}")
+                        return await page.content()
+                    finally:
+                        await ctx.close()
+            
+            try:
+                return await asyncio.gather(*(one(u, p) for u, p in zip(urls, link_pattern)),
+                                            return_exceptions=True)
+            finally:
+                await browser.close()
+    
+    def _navigate(self, driver, url: str, wait_time: int):
+        """
+        Naviga a URL ritornando al DOMContentLoaded invece che al load completo
+        
+        Il marker su window distingue il nuovo documento da quello precedente,
+        che potrebbe essere ancora 'complete' subito dopo Page.navigate.
+        """
+        if not self._cdp_navigation:
+            driver.get(url)
+            return
+        
+        driver.execute_script("window.__git_previous_page = true;")
+        driver.execute_cdp_cmd("Page.navigate", {"url": url})
+        try:
+            WebDriverWait(driver, wait_time).until(
+                lambda d: d.execute_script(
+                    "return !window.__git_previous_page && "
+                    "document.readyState !== 'loading';"
+                )
+            )
+        except TimeoutException:
+            logger.debug(f"Timeout DOMContentLoaded su {url}")
+    
+    def _scroll_page(self, driver, wait_time: int):
+        """
+        Scrolla a passi di una viewport fino al fondo pagina
+        
+        Al fondo attende che lo scroll carichi altro contenuto (altezza o
+        numero di link in crescita) e in quel caso prosegue; MAX_SCROLL_STEPS
+        limita le pagine a scroll infinito.
+        """
+        timeout = min(wait_time, SCROLL_CONTENT_WAIT)
+        for _ in range(MAX_SCROLL_STEPS):
+            content = driver.execute_script(_PAGE_CONTENT_JS)
+            at_bottom = driver.execute_script(
+                "window.scrollBy(0, window.innerHeight);"
+                "return window.pageYOffset + window.innerHeight >= document.body.scrollHeight - 1;"
+            )
+            # Fondo pagina: nessuna attesa del load completo, si prosegue
+            # solo se lo scroll ha caricato altro contenuto
+            if at_bottom and not self._wait_for_new_content(driver, content, timeout):
+                break
+        else:
+            logger.debug(f"Limite di {MAX_SCROLL_STEPS} scroll raggiunto")
+        driver.execute_script("window.scrollTo(0, 0);")
+    
+    @staticmethod
+    def _wait_for_new_content(driver, content: List[int], timeout: float) -> bool:
+        """Attende che altezza pagina o numero di link cambino; False al timeout"""
+        try:
+            WebDriverWait(driver, timeout).until(
+                lambda d: d.execute_script(_PAGE_CONTENT_JS) != content
+            )
+            return True
+        except TimeoutException:
+            return False
+    
     def extract_insight_links(self, html: str, base_url: str, 
-                               link_pattern: str = "/insights/") -> List[Dict]:
+                               link_pattern: str = "/insights/",
+                               seen: Optional[Set[int]] = None) -> List[Dict]:
         """
         Estrae link a insight/report da HTML
         
@@ -98,21 +500,24 @@ class EnhancedScraper:
             html: HTML della pagina
             base_url: URL base per link relativi
             link_pattern: Pattern da cercare negli href
+            seen: Fingerprint URL già estratti, condiviso tra pagine e fonti
             
         Returns:
             Lista di dizionari con titolo, url, etc.
         """
-        soup = BeautifulSoup(html, 'html.parser')
+        if seen is None:
+            seen = set()
         results = []
-        seen_urls = set()
-        
-        # Trova tutti i link con pattern
-        links = soup.find_all('a', href=lambda x: x and link_pattern in x)
-        
-        logger.info(f"Trovati {len(links)} link con pattern '{link_pattern}'")
+        found = 0
+        source = self._extract_domain(base_url)
         
-        for link in links:
-            href = link.get('href', '')
+        # Scorre gli anchor con pattern senza materializzare l'intero DOM
+        for href, link in self._iter_links(html, link_pattern):
+            found += 1
+            
+            # Scarta link di navigazione prima di qualsiasi estrazione
+            if _SKIP_HREF_RE.search(href):
+                continue
             
             # Costruisci URL completo
             if href.startswith('/'):
@@ -122,42 +527,83 @@ class EnhancedScraper:
             else:
                 continue
             
-            # Deduplica
-            if full_url in seen_urls:
+            # Deduplica (l'URL diventa 'visto' solo se produce un articolo)
+            fingerprint = url_fingerprint(full_url)
+            if fingerprint in seen:
                 continue
-            seen_urls.add(full_url)
             
             # Estrai titolo
-            title = self._extract_title(link)
+            title, category, description = self._link_fields(href, link)
             if not title or len(title) < 5:
                 continue
             
             # Filtra navigazione e link generici
-            skip_patterns = ['subscribe', 'newsletter', 'contact', 'about', 'login', 
-                           'sign in', 'register', 'careers', 'locations', 'search']
-            if any(p in title.lower() for p in skip_patterns):
+            if _SKIP_RE.search(title):
                 continue
             
             results.append({
                 'title': title,
                 'url': full_url,
-                'source': self._extract_domain(base_url),
-                'category': self._extract_category(href),
-                'description': self._extract_description(link),
+                'source': source,
+                'category': category,
+                'description': description,
                 'date': ''
             })
+            seen.add(fingerprint)
         
+        logger.info(f"Trovati {found} link con pattern '{link_pattern}'")
         logger.info(f"Estratti {len(results)} articoli unici")
         return results
     
+    def _iter_links(self, html: str, link_pattern: str):
+        """
+        Genera (href, elemento) per ogni anchor che matcha il pattern
+        
+        Con lxml il documento viene passato per intero all'HTMLPullParser
+        prima di leggere gli eventi: titolo e descrizione (anche quella che
+        segue il link nel parent) sono così completi indipendentemente dai
+        blocchi; altrimenti ricade su BeautifulSoup.
+        """
+        if not LXML_AVAILABLE:
+            soup = BeautifulSoup(html, 'html.parser', parse_only=_ANCHOR_STRAINER)
+            for link in soup.find_all('a'):
+                href = link.get('href', '')
+                if link_pattern in href:
+                    yield href, link
+            return
+        
+        parser = etree.HTMLPullParser(events=('end',), tag='a')
+        for start in range(0, len(html), _PARSE_CHUNK_SIZE):
+            parser.feed(html[start:start + _PARSE_CHUNK_SIZE])
+        parser.close()
+        
+        for _, el in parser.read_events():
+            href = el.get('href') or ''
+            if link_pattern in href:
+                yield href, el
+    
+    def _link_fields(self, href: str, link) -> tuple:
+        """Ritorna (titolo, categoria, descrizione) di un anchor"""
+        if LXML_AVAILABLE:
+            title = self._extract_title_lxml(link)
+            description = self._extract_description_lxml(link)
+        else:
+            title = self._extract_title(link)
+            description = self._extract_description(link)
+        
+        return title, self._extract_category(href), description
+    
     def _extract_title(self, element) -> str:
         """Estrai titolo da elemento"""
-        # Prima prova testo diretto
-        text = element.get_text(strip=True)
+        # Prima prova testo diretto (.string evita la visita ricorsiva
+        # quando l'anchor contiene un solo nodo di testo)
+        string = element.string
+        if string is not None:
+            text = string.strip()
+        else:
+            text = element.get_text(' ', strip=True)
         if text and len(text) > 5:
-            # Pulisci
-            text = re.sub(r'\s+', ' ', text)
-            return text[:200]
+            return _collapse_ws(text)[:200]
         
         # Cerca in elementi figli
         for child in element.find_all(['span', 'h2', 'h3', 'h4', 'p']):
@@ -167,88 +613,141 @@ class EnhancedScraper:
         
         return ''
     
+    def _extract_title_lxml(self, element) -> str:
+        """Estrai titolo da elemento lxml"""
+        if len(element) == 0:
+            text = (element.text or '').strip()
+        else:
+            text = ' '.join(element.itertext()).strip()
+        if text and len(text) > 5:
+            return _collapse_ws(text)[:200]
+        
+        for child in element.iter('span', 'h2', 'h3', 'h4', 'p'):
+            text = _collapse_ws(''.join(child.itertext()).strip())
+            if text and len(text) > 5:
+                return text[:200]
+        
+        return ''
+    
     def _extract_description(self, element) -> str:
-        """Estrai descrizione"""
-        parent = element.parent
-        if parent:
-            desc = parent.find(['p', 'span'], class_=lambda x: x and 'desc' in str(x).lower())
+        """Estrai descrizione (dentro il link o nel parent)"""
+        for container in (element, element.parent):
+            # Con lo strainer il parent è la radice del documento
+            if container is None or isinstance(container, BeautifulSoup):
+                continue
+            desc = container.find(['p', 'span'], class_=lambda x: x and 'desc' in str(x).lower())
             if desc:
                 return desc.get_text(strip=True)[:500]
         return ''
     
+    def _extract_description_lxml(self, element) -> str:
+        """Estrai descrizione da elemento lxml (dentro il link o nel parent)"""
+        for container in (element, element.getparent()):
+            if container is None:
+                continue
+            for desc in container.iter('p', 'span'):
+                if 'desc' in (desc.get('class') or '').lower():
+                    return ''.join(desc.itertext()).strip()[:500]
+        return ''
+    
     def _extract_category(self, url: str) -> str:
         """Estrai categoria da URL"""
-        patterns = {
-            'technology': 'Technology',
-            'digital': 'Digital Transformation',
-            'ai': 'Artificial Intelligence',
-            'data': 'Data & Analytics',
-            'cloud': 'Cloud',
-            'cyber': 'Cybersecurity',
-            'financial': 'Financial Services',
-            'healthcare': 'Healthcare',
-            'consumer': 'Consumer',
-            'energy': 'Energy',
-            'manufacturing': 'Manufacturing'
-        }
-        url_lower = url.lower()
-        for pattern, category in patterns.items():
-            if pattern in url_lower:
-                return category
-        return 'General'
+        return _extract_category(url)
     
-    def _extract_domain(self, url: str) -> str:
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _extract_domain(url: str) -> str:
         """Estrai nome sorgente da URL"""
-        import urllib.parse
-        parsed = urllib.parse.urlparse(url)
-        domain = parsed.netloc.lower()
-        
-        if 'deloitte' in domain:
-            return 'Deloitte'
-        elif 'pwc' in domain:
-            return 'PwC'
-        elif 'mckinsey' in domain:
-            return 'McKinsey'
-        elif 'bcg' in domain:
-            return 'BCG'
-        elif 'ey.' in domain or 'ey-' in domain:
-            return 'EY'
-        elif 'kpmg' in domain:
-            return 'KPMG'
-        elif 'accenture' in domain:
-            return 'Accenture'
-        elif 'bain' in domain:
-            return 'Bain'
-        elif 'gartner' in domain:
-            return 'Gartner'
-        elif 'forrester' in domain:
-            return 'Forrester'
-        elif 'idc' in domain:
-            return 'IDC'
+        domain = urllib.parse.urlparse(url).netloc.lower()
+        
+        for fragment, name in _DOMAIN_MAP:
+            if fragment in domain:
+                return name
         
         return domain.split('.')[0].capitalize()
 
 
-def scrape_deloitte() -> List[Dict]:
-    """Scrape Deloitte Insights con Selenium"""
-    scraper = EnhancedScraper()
-    all_articles = []
+# Fonti scrapate da scrape_all: wait_pattern è atteso nel DOM durante il
+# caricamento, patterns sono i filtri href applicati all'estrazione
+SOURCES = [
+    {
+        'name': 'Deloitte',
+        'base': 'https://www2.deloitte.com',
+        'wait_pattern': '/insights/',
+        'patterns': ['/insights/'],
+        'urls': [
+            'https://www2.deloitte.com/us/en/insights.html',
+            'https://www2.deloitte.com/us/en/insights/focus/tech-trends.html',
+            'https://www2.deloitte.com/us/en/insights/topics/digital-transformation.html',
+        ],
+    },
+    {
+        'name': 'McKinsey',
+        'base': 'https://www.mckinsey.com',
+        'wait_pattern': 'insights/',
+        'patterns': ['/our-insights/', '/featured-insights/'],
+        'urls': [
+            'https://www.mckinsey.com/featured-insights',
+            'https://www.mckinsey.com/capabilities/mckinsey-digital/our-insights',
+            'https://www.mckinsey.com/capabilities/strategy-and-corporate-finance/our-insights',
+        ],
+    },
+    {
+        'name': 'BCG',
+        'base': 'https://www.bcg.com',
+        'wait_pattern': '/publications/',
+        'patterns': ['/publications/'],
+        'urls': [
+            'https://www.bcg.com/publications',
+            'https://www.bcg.com/capabilities/digital-technology-data',
+        ],
+    },
+]
+
+_SOURCES_BY_NAME = {src['name']: src for src in SOURCES}
+
+
+def scrape_all(sources: Optional[List[Dict]] = None,
+               seen: Optional[Set[int]] = None,
+               pool_size: int = POOL_SIZE) -> List[Dict]:
+    """
+    Scrape di più fonti con un unico pool di browser condiviso
+    
+    Args:
+        sources: Configurazioni fonte (default: SOURCES)
+        seen: Fingerprint URL già estratti, per deduplica globale
+        pool_size: Driver Selenium in parallelo
+        
+    Returns:
+        Lista articoli unici di tutte le fonti
+    """
+    if sources is None:
+        sources = SOURCES
+    if seen is None:
+        seen = set()
     
-    urls = [
-        'https://www2.deloitte.com/us/en/insights.html',
-        'https://www2.deloitte.com/us/en/insights/focus/tech-trends.html',
-        'https://www2.deloitte.com/us/en/insights/topics/digital-transformation.html',
-    ]
+    scraper = EnhancedScraper(pool_size=pool_size)
+    all_articles = []
+    jobs = [(src, url) for src in sources for url in src['urls']]
     
     try:
-        for url in urls:
+        pages = scraper.fetch_pages(
+            [url for _, url in jobs],
+            [src['wait_pattern'] for src, _ in jobs],
+            wait_time=8
+        )
+        for (src, _), (url, html) in zip(jobs, pages):
             try:
-                html = scraper.fetch_with_js(url, wait_time=8)
-                articles = scraper.extract_insight_links(
-                    html, 
-                    'https://www2.deloitte.com',
-                    '/insights/'
-                )
+                if isinstance(html, Exception):
+                    raise html
+                articles = []
+                for pattern in src['patterns']:
+                    articles.extend(scraper.extract_insight_links(
+                        html,
+                        src['base'],
+                        pattern,
+                        seen
+                    ))
                 all_articles.extend(articles)
                 print(f"✓ {url}: {len(articles)} articoli")
             except Exception as e:
@@ -256,96 +755,22 @@ def scrape_deloitte() -> List[Dict]:
     finally:
         scraper.close()
     
-    # Deduplica per URL
-    seen = set()
-    unique = []
-    for art in all_articles:
-        if art['url'] not in seen:
-            seen.add(art['url'])
-            unique.append(art)
-    
-    return unique
+    return all_articles
+
+
+def scrape_deloitte(seen: Optional[Set[int]] = None) -> List[Dict]:
+    """Scrape Deloitte Insights"""
+    return scrape_all([_SOURCES_BY_NAME['Deloitte']], seen)
 
 
-def scrape_mckinsey() -> List[Dict]:
+def scrape_mckinsey(seen: Optional[Set[int]] = None) -> List[Dict]:
     """Scrape McKinsey Insights"""
-    scraper = EnhancedScraper()
-    all_articles = []
-    
-    urls = [
-        'https://www.mckinsey.com/featured-insights',
-        'https://www.mckinsey.com/capabilities/mckinsey-digital/our-insights',
-        'https://www.mckinsey.com/capabilities/strategy-and-corporate-finance/our-insights',
-    ]
-    
-    try:
-        for url in urls:
-            try:
-                html = scraper.fetch_with_js(url, wait_time=8)
-                articles = scraper.extract_insight_links(
-                    html,
-                    'https://www.mckinsey.com',
-                    '/our-insights/'
-                )
-                # Aggiungi anche featured-insights
-                articles.extend(scraper.extract_insight_links(
-                    html,
-                    'https://www.mckinsey.com', 
-                    '/featured-insights/'
-                ))
-                all_articles.extend(articles)
-                print(f"✓ {url}: {len(articles)} articoli")
-            except Exception as e:
-                print(f"✗ {url}: {e}")
-    finally:
-        scraper.close()
-    
-    # Deduplica
-    seen = set()
-    unique = []
-    for art in all_articles:
-        if art['url'] not in seen:
-            seen.add(art['url'])
-            unique.append(art)
-    
-    return unique
+    return scrape_all([_SOURCES_BY_NAME['McKinsey']], seen)
 
 
-def scrape_bcg() -> List[Dict]:
+def scrape_bcg(seen: Optional[Set[int]] = None) -> List[Dict]:
     """Scrape BCG Insights"""
-    scraper = EnhancedScraper()
-    all_articles = []
-    
-    urls = [
-        'https://www.bcg.com/publications',
-        'https://www.bcg.com/capabilities/digital-technology-data',
-    ]
-    
-    try:
-        for url in urls:
-            try:
-                html = scraper.fetch_with_js(url, wait_time=8)
-                articles = scraper.extract_insight_links(
-                    html,
-                    'https://www.bcg.com',
-                    '/publications/'
-                )
-                all_articles.extend(articles)
-                print(f"✓ {url}: {len(articles)} articoli")
-            except Exception as e:
-                print(f"✗ {url}: {e}")
-    finally:
-        scraper.close()
-    
-    # Deduplica
-    seen = set()
-    unique = []
-    for art in all_articles:
-        if art['url'] not in seen:
-            seen.add(art['url'])
-            unique.append(art)
-    
-    return unique
+    return scrape_all([_SOURCES_BY_NAME['BCG']], seen)
 
 
 def main():
@@ -354,28 +779,14 @@ def main():
     print("Enhanced Scraper - Test")
     print("=" * 60)
     
-    all_results = []
-    
-    print("\n--- DELOITTE ---")
-    deloitte = scrape_deloitte()
-    all_results.extend(deloitte)
-    print(f"Totale Deloitte: {len(deloitte)} articoli")
-    for art in deloitte[:5]:
-        print(f"  • {art['title'][:60]}")
-    
-    print("\n--- MCKINSEY ---")
-    mckinsey = scrape_mckinsey()
-    all_results.extend(mckinsey)
-    print(f"Totale McKinsey: {len(mckinsey)} articoli")
-    for art in mckinsey[:5]:
-        print(f"  • {art['title'][:60]}")
+    all_results = scrape_all()
     
-    print("\n--- BCG ---")
-    bcg = scrape_bcg()
-    all_results.extend(bcg)
-    print(f"Totale BCG: {len(bcg)} articoli")
-    for art in bcg[:5]:
-        print(f"  • {art['title'][:60]}")
+    for src in SOURCES:
+        articles = [art for art in all_results if art['source'] == src['name']]
+        print(f"\n--- {src['name'].upper()} ---")
+        print(f"Totale {src['name']}: {len(articles)} articoli")
+        for art in articles[:5]:
+            print(f"  • {art['title'][:60]}")
     
     print("\n" + "=" * 60)
     print(f"TOTALE: {len(all_results)} articoli")
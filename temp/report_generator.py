@@ -8,44 +8,35 @@ Data: 22 Dicembre 2025
 """
 
 import os
-from typing import Dict, List
+import re
+from itertools import chain
+from typing import Dict, List, Set
 from datetime import datetime
 from pathlib import Path
-import pandas as pd
-from jinja2 import Template
+from openpyxl import Workbook
+from jinja2 import DictLoader, Environment
 
 import utils
 
+# Import opzionale xlsxwriter (report Excel molto grandi)
+try:
+    import xlsxwriter
+    XLSXWRITER_AVAILABLE = True
+except ImportError:
+    XLSXWRITER_AVAILABLE = False
 
-class TopicReportGenerator:
-    """Genera report organizzati per topic"""
-    
-    def __init__(self, output_dir: str = None):
-        if output_dir is None:
-            output_dir = os.path.join(os.path.dirname(__file__), 'output')
-        
-        self.output_dir = Path(output_dir)
-        self.output_dir.mkdir(exist_ok=True)
-        
-        self.logger = utils.logger
-    
-    def generate_html_report(self, stories: Dict[str, Dict], summary: Dict) -> str:
-        """
-        Genera report HTML interattivo organizzato per topic
-        
-        Args:
-            stories: Dict di stories per topic
-            summary: Summary statistiche
-        
-        Returns:
-            Path al file HTML
-        """
-        self.logger.info(f"\n{'='*80}")
-        self.logger.info(f"📊 Generando Report HTML per Topics")
-        self.logger.info(f"{'='*80}\n")
-        
-        # Template HTML
-        html_template = """
+# Righe insight oltre le quali si usa xlsxwriter invece di openpyxl
+XLSXWRITER_ROW_THRESHOLD = 10_000
+
+# Lunghezza massima di un nome sheet Excel
+MAX_SHEET_NAME_LENGTH = 31
+
+# Caratteri non ammessi nei nomi sheet Excel
+_INVALID_SHEET_CHARS_RE = re.compile(r"[\[\]:*?/\\]")
+
+
+# Parti statiche del report HTML (CSS e chiusura), scritte così come sono
+_STATIC_HEAD = """
 <!DOCTYPE html>
 <html lang="it">
 <head>
@@ -348,7 +339,21 @@ class TopicReportGenerator:
 </head>
 <body>
     <div class="container">
-        <header>
+"""
+
+_STATIC_FOOT = """        </div>
+        
+        <footer>
+            <p>Global Insight Tracker - AI-Powered Intelligence Aggregation</p>
+            <p>Generated on {timestamp}</p>
+        </footer>
+    </div>
+</body>
+</html>
+"""
+
+# Frammenti dinamici: intestazione/summary e sezione di un singolo topic
+_INTRO_TEMPLATE = """        <header>
             <h1>🌍 Global Insight Tracker</h1>
             <p>Intelligence Report Aggregato per Topic | {{ timestamp }}</p>
         </header>
@@ -374,20 +379,21 @@ class TopicReportGenerator:
         <div class="topics-nav">
             <h3>🗂️ Navigate Topics</h3>
             <div class="topic-pills">
-                {% for topic in summary.topics %}
-                <a href="#{{ topic|replace(' ', '-') }}" class="topic-pill">{{ topic }}</a>
+                {% for topic, anchor in topic_anchors %}
+                <a href="#{{ anchor }}" class="topic-pill">{{ topic }}</a>
                 {% endfor %}
             </div>
         </div>
         
         <div class="content">
-            {% for topic, story in stories.items() %}
-            <div class="topic-section" id="{{ topic|replace(' ', '-') }}">
+"""
+
+_TOPIC_TEMPLATE = """            <div class="topic-section" id="{{ story.anchor }}">
                 <div class="topic-header">
                     <h2>{{ topic }}</h2>
                     <div class="topic-meta">
                         <span>📄 {{ story.document_count }} documenti</span>
-                        <span>💡 {{ story.insights|length }} insights</span>
+                        <span>💡 {{ story.insight_count }} insights</span>
                         <span>😊 Sentiment: {{ story.sentiment }}</span>
                     </div>
                 </div>
@@ -416,12 +422,12 @@ class TopicReportGenerator:
                 {% endif %}
                 
                 <div class="insights">
-                    <h3>💡 Key Insights (Top {{ story.top_insights|length }})</h3>
+                    <h3>💡 Key Insights (Top {{ story.top_count }})</h3>
                     {% for insight in story.top_insights %}
                     <div class="insight-card">
                         <div class="insight-text">{{ insight.text }}</div>
                         <div class="insight-meta">
-                            <span class="badge badge-{{ insight.confidence }}">{{ insight.confidence }} confidence</span>
+                            <span class="badge {{ insight.badge_class }}">{{ insight.confidence }} confidence</span>
                             <span style="margin-left: 10px;">📄 {{ insight.source }}</span>
                         </div>
                     </div>
@@ -437,39 +443,107 @@ class TopicReportGenerator:
                     </ul>
                 </div>
             </div>
-            {% endfor %}
-        </div>
-        
-        <footer>
-            <p>Global Insight Tracker - AI-Powered Intelligence Aggregation</p>
-            <p>Generated on {{ timestamp }}</p>
-        </footer>
-    </div>
-</body>
-</html>
 """
+
+# Template compilati una sola volta all'import
+_ENV = Environment(
+    loader=DictLoader({
+        'intro.html': _INTRO_TEMPLATE,
+        'topic.html': _TOPIC_TEMPLATE,
+    }),
+    auto_reload=False,
+    trim_blocks=True,
+    lstrip_blocks=True,
+    keep_trailing_newline=True,
+)
+_INTRO = _ENV.get_template('intro.html')
+_TOPIC = _ENV.get_template('topic.html')
+
+
+def _topic_anchor(topic: str) -> str:
+    """ID HTML della sezione di un topic"""
+    return topic.replace(' ', '-')
+
+
+def _unique_sheet_name(name: str, used: Set[str]) -> str:
+    """Nome sheet valido per Excel, con suffisso ' (N)' se già usato (confronto case-insensitive)"""
+    base = _INVALID_SHEET_CHARS_RE.sub('_', name).strip("'")[:MAX_SHEET_NAME_LENGTH] or 'Sheet'
+    candidate = base
+    n = 1
+    while candidate.lower() in used:
+        n += 1
+        suffix = f" ({n})"
+        candidate = base[:MAX_SHEET_NAME_LENGTH - len(suffix)] + suffix
+    used.add(candidate.lower())
+    return candidate
+
+
+class TopicReportGenerator:
+    """Genera report organizzati per topic"""
+    
+    def __init__(self, output_dir: str = None):
+        if output_dir is None:
+            output_dir = os.path.join(os.path.dirname(__file__), 'output')
+        
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(exist_ok=True)
+        
+        self.logger = utils.logger
+    
+    def generate_html_report(self, stories: Dict[str, Dict], summary: Dict) -> str:
+        """
+        Genera report HTML interattivo organizzato per topic
         
-        # Renderizza template
-        template = Template(html_template)
+        Args:
+            stories: Dict di stories per topic
+            summary: Summary statistiche
         
-        html_content = template.render(
-            stories=stories,
-            summary=summary,
-            timestamp=datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        )
+        Returns:
+            Path al file HTML
+        """
+        self.logger.info(f"\n{'='*80}")
+        self.logger.info(f"📊 Generando Report HTML per Topics")
+        self.logger.info(f"{'='*80}\n")
         
-        # Salva file
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         filename = f"topic_report_{timestamp}.html"
         filepath = self.output_dir / filename
         
+        generated_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        
+        # Solo intestazione e sezioni topic passano da Jinja
         with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+            f.write(_STATIC_HEAD)
+            _INTRO.stream(
+                summary=summary,
+                topic_anchors=[(t, _topic_anchor(t)) for t in summary['topics']],
+                timestamp=generated_at
+            ).dump(f)
+            for topic, story in self._prepare_stories(stories).items():
+                _TOPIC.stream(topic=topic, story=story).dump(f)
+            f.write(_STATIC_FOOT.format(timestamp=generated_at))
         
         self.logger.info(f"✅ Report HTML salvato: {filepath}")
         
         return str(filepath)
     
+    def _prepare_stories(self, stories: Dict[str, Dict]) -> Dict[str, Dict]:
+        """Copia le stories aggiungendo anchor, conteggi e classi badge pronti per il template"""
+        prepared = {}
+        for topic, story in stories.items():
+            top_insights = [
+                {**insight, 'badge_class': f"badge-{insight['confidence']}"}
+                for insight in story['top_insights']
+            ]
+            prepared[topic] = {
+                **story,
+                'anchor': _topic_anchor(topic),
+                'insight_count': len(story['insights']),
+                'top_insights': top_insights,
+                'top_count': len(top_insights),
+            }
+        return prepared
+    
     def generate_excel_report(self, stories: Dict[str, Dict], summary: Dict) -> str:
         """
         Genera report Excel con sheet per ogni topic
@@ -487,47 +561,68 @@ class TopicReportGenerator:
         filename = f"topic_report_{timestamp}.xlsx"
         filepath = self.output_dir / filename
         
-        with pd.ExcelWriter(filepath, engine='openpyxl') as writer:
-            # Sheet 1: Summary
-            summary_data = {
-                'Metric': [
-                    'Total Topics',
-                    'Total Documents',
-                    'Total Insights',
-                    'Report Generated'
-                ],
-                'Value': [
-                    summary['total_topics'],
-                    summary['total_documents'],
-                    summary['total_insights'],
-                    datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                ]
-            }
-            df_summary = pd.DataFrame(summary_data)
-            df_summary.to_excel(writer, sheet_name='Summary', index=False)
-            
-            # Sheet per ogni topic
-            for topic, story in stories.items():
-                # Prepara dati insights
-                insights_data = []
-                
-                for insight in story['insights']:
-                    insights_data.append({
-                        'Insight': insight['text'],
-                        'Source': insight['source'],
-                        'Confidence': insight['confidence']
-                    })
-                
-                if insights_data:
-                    df_topic = pd.DataFrame(insights_data)
-                    
-                    # Limita nome sheet (Excel max 31 char)
-                    sheet_name = topic[:31]
-                    
-                    df_topic.to_excel(writer, sheet_name=sheet_name, index=False)
-                    
-                    self.logger.info(f"  ✅ Sheet creato: {sheet_name}")
+        sheets = self._excel_sheets(stories, summary)
+        total_rows = sum(len(story['insights']) for story in stories.values())
+        
+        # Oltre la soglia xlsxwriter in constant_memory serializza più in fretta
+        if XLSXWRITER_AVAILABLE and total_rows > XLSXWRITER_ROW_THRESHOLD:
+            self._write_excel_xlsxwriter(filepath, sheets)
+        else:
+            self._write_excel_openpyxl(filepath, sheets)
         
         self.logger.info(f"✅ Report Excel salvato: {filepath}\n")
         
         return str(filepath)
+    
+    def _excel_sheets(self, stories: Dict[str, Dict], summary: Dict):
+        """
+        Genera (nome sheet, righe) con intestazione come prima riga
+        
+        I nomi sono resi validi e univoci qui, così openpyxl e xlsxwriter
+        producono gli stessi sheet.
+        """
+        used_names = {'summary'}
+        yield 'Summary', [
+            ['Metric', 'Value'],
+            ['Total Topics', summary['total_topics']],
+            ['Total Documents', summary['total_documents']],
+            ['Total Insights', summary['total_insights']],
+            ['Report Generated', datetime.now().strftime('%Y-%m-%d %H:%M:%S')],
+        ]
+        
+        # Sheet per ogni topic
+        for topic, story in stories.items():
+            if not story['insights']:
+                continue
+            
+            # Limita nome sheet (Excel max 31 char), senza duplicati
+            sheet_name = _unique_sheet_name(topic, used_names)
+            
+            rows = ([insight['text'], insight['source'], insight['confidence']]
+                    for insight in story['insights'])
+            yield sheet_name, chain([['Insight', 'Source', 'Confidence']], rows)
+            
+            self.logger.info(f"  ✅ Sheet creato: {sheet_name}")
+    
+    def _write_excel_openpyxl(self, filepath: Path, sheets) -> None:
+        """Scrive gli sheet con openpyxl write-only (righe serializzate man mano)"""
+        wb = Workbook(write_only=True)
+        for sheet_name, rows in sheets:
+            ws = wb.create_sheet(sheet_name)
+            for row in rows:
+                ws.append(row)
+        wb.save(filepath)
+    
+    def _write_excel_xlsxwriter(self, filepath: Path, sheets) -> None:
+        """Scrive gli sheet con xlsxwriter in constant_memory (una riga in RAM)"""
+        wb = xlsxwriter.Workbook(str(filepath), {
+            'constant_memory': True,
+            'strings_to_urls': False,
+        })
+        try:
+            for sheet_name, rows in sheets:
+                ws = wb.add_worksheet(sheet_name)
+                for row_idx, row in enumerate(rows):
+                    ws.write_row(row_idx, 0, row)
+        finally:
+            wb.close()
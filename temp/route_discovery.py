@@ -12,6 +12,7 @@ from typing import Dict, List, Optional, Set, Tuple
 from urllib.parse import urljoin, urlparse
 from collections import deque
 from datetime import datetime
+from functools import lru_cache
 
 from bs4 import BeautifulSoup
 import requests
@@ -19,6 +20,32 @@ import requests
 from site_graph import SiteGraph, GraphNode, NodeType, SiteGraphRegistry
 import utils
 
+# Import opzionale di lxml: costruisce l'albero HTML in C
+try:
+    import lxml
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+# Parser delle pagine visitate (html.parser se lxml non è installato)
+HTML_PARSER = 'lxml' if LXML_AVAILABLE else 'html.parser'
+
+
+# Gli stessi href (menu, footer) ricorrono su ogni pagina dello stesso sito:
+# join e dominio vengono calcolati una volta sola
+@lru_cache(maxsize=16384)
+def _normalize_url(url: str, base_url: str) -> str:
+    """URL assoluto senza frammento né query"""
+    if not url.startswith('http'):
+        url = urljoin(base_url, url)
+    return url.split('#')[0].split('?')[0]
+
+
+@lru_cache(maxsize=8192)
+def _site_domain(url: str) -> str:
+    """Dominio senza 'www.'"""
+    return urlparse(url).netloc.replace('www.', '')
+
 
 class RouteDiscovery:
     """
@@ -98,8 +125,11 @@ class RouteDiscovery:
         else:
             graph = SiteGraph(site_name, base_url)
         
-        # BFS per esplorare il sito
+        # BFS per esplorare il sito: ogni URL entra in coda una sola volta
+        # (controllo prima dell'accodamento), alla profondità minima
+        start_url = self._normalize_url(start_url, base_url)
         visited: Set[str] = set()
+        enqueued: Set[str] = {start_url}
         queue = deque([(start_url, 0, None)])  # (url, depth, parent_url)
         
         pages_visited = 0
@@ -107,13 +137,6 @@ class RouteDiscovery:
         while queue and pages_visited < self.max_pages:
             current_url, depth, parent_url = queue.popleft()
             
-            # Normalizza URL
-            current_url = self._normalize_url(current_url, base_url)
-            
-            # Skip se già visitato o troppo profondo
-            if current_url in visited or depth > self.max_depth:
-                continue
-            
             # Skip URL esterni
             if not self._is_same_domain(current_url, base_url):
                 continue
@@ -148,7 +171,9 @@ class RouteDiscovery:
             
             for link_url, link_text in links:
                 if link_url not in visited:
-                    queue.append((link_url, depth + 1, current_url))
+                    if link_url not in enqueued and depth < self.max_depth:
+                        enqueued.add(link_url)
+                        queue.append((link_url, depth + 1, current_url))
                     
                     # Aggiungi edge anche se non ancora visitato
                     graph.add_edge(current_url, link_url, link_text)
@@ -158,7 +183,11 @@ class RouteDiscovery:
         
         return graph
     
-    def quick_scan(self, site_name: str, urls: List[str]) -> SiteGraph:
+    def quick_scan(self, site_name: str, urls: List[str],
+                   existing_graph: Optional[SiteGraph] = None,
+                   etags: Optional[Dict[str, str]] = None,
+                   last_modified: Optional[Dict[str, str]] = None
+                   ) -> Tuple[SiteGraph, Dict[str, str], Dict[str, str]]:
         """
         Scan veloce di URL specifici (senza navigazione profonda)
         Utile per mappare velocemente sezioni note
@@ -166,21 +195,46 @@ class RouteDiscovery:
         Args:
             site_name: Nome del sito
             urls: Lista di URL da scansionare
+            existing_graph: Grafo della scansione precedente (opzionale):
+                ritornato invariato se nessun URL è cambiato (HTTP 304)
+            etags: ETag per URL, usati per If-None-Match (non modificati)
+            last_modified: Last-Modified per URL, usati per If-Modified-Since
+                (non modificati)
         
         Returns:
-            SiteGraph
+            Tupla (SiteGraph, etags, last_modified) con i validatori aggiornati,
+            da salvare solo dopo aver salvato il grafo
         """
         self.logger.info(f"\n🚀 QUICK SCAN: {site_name} - {len(urls)} URLs\n")
         
+        etags = dict(etags or {})
+        last_modified = dict(last_modified or {})
+        
+        # Richieste condizionali: se tutti gli URL rispondono 304 il grafo non cambia
+        pages: Dict[str, Optional[Dict]] = {}
+        if existing_graph is not None and (etags or last_modified):
+            for url in urls:
+                pages[url] = self._fetch_page(url, self._conditional_headers(url, etags, last_modified))
+            
+            if all(page and page['status'] == 304 for page in pages.values()):
+                self.logger.info(f"  ♻️ Nessuna modifica (304): grafo invariato")
+                return existing_graph, etags, last_modified
+        
         base_url = self._get_base_url(urls[0]) if urls else ""
         graph = SiteGraph(site_name, base_url)
         
         for url in urls:
             self.logger.info(f"  Scanning: {url[:70]}")
             
-            page_data = self._fetch_page(url)
+            page_data = pages[url] if url in pages else self._fetch_page(url)
+            
+            # Pagina invariata ma grafo da ricostruire: serve il contenuto
+            if page_data and page_data['status'] == 304:
+                page_data = self._fetch_page(url)
             
             if page_data:
+                self._store_validators(url, page_data, etags, last_modified)
+                
                 node = self._classify_page(url, page_data, depth=1, parent_url=None)
                 graph.add_node(node)
                 
@@ -203,15 +257,41 @@ class RouteDiscovery:
                     
                     self.logger.info(f"    📄 Found: {doc_text[:50] if doc_text else doc_url[-30:]}")
         
-        return graph
+        return graph, etags, last_modified
+    
+    @staticmethod
+    def _conditional_headers(url: str, etags: Optional[Dict[str, str]],
+                             last_modified: Optional[Dict[str, str]]) -> Dict[str, str]:
+        """Header per una richiesta condizionale (If-None-Match / If-Modified-Since)"""
+        headers = {}
+        if etags and url in etags:
+            headers['If-None-Match'] = etags[url]
+        if last_modified and url in last_modified:
+            headers['If-Modified-Since'] = last_modified[url]
+        return headers
+    
+    @staticmethod
+    def _store_validators(url: str, page_data: Dict, etags: Dict[str, str],
+                          last_modified: Dict[str, str]) -> None:
+        """Salva ETag / Last-Modified della risposta per la prossima scansione"""
+        for store, value in ((etags, page_data.get('etag')),
+                             (last_modified, page_data.get('last_modified'))):
+            if value:
+                store[url] = value
+            else:
+                store.pop(url, None)
     
-    def _fetch_page(self, url: str) -> Optional[Dict]:
-        """Scarica pagina e ritorna soup + metadata"""
+    def _fetch_page(self, url: str, headers: Optional[Dict[str, str]] = None) -> Optional[Dict]:
+        """Scarica pagina e ritorna soup + metadata ({'status': 304} se non modificata)"""
         try:
-            response = self.session.get(url, timeout=15, allow_redirects=True)
+            response = self.session.get(url, timeout=15, allow_redirects=True, headers=headers)
+            
+            if response.status_code == 304:
+                return {'status': 304}
+            
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = BeautifulSoup(response.text, HTML_PARSER)
             
             # Estrai metadata base
             title = ""
@@ -223,7 +303,9 @@ class RouteDiscovery:
                 'soup': soup,
                 'title': title,
                 'content_type': response.headers.get('content-type', ''),
-                'status': response.status_code
+                'status': response.status_code,
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified')
             }
         
         except Exception as e:
@@ -355,10 +437,7 @@ class RouteDiscovery:
     
     def _normalize_url(self, url: str, base_url: str) -> str:
         """Normalizza URL"""
-        if url.startswith('http'):
-            return url.split('#')[0].split('?')[0]
-        else:
-            return urljoin(base_url, url).split('#')[0].split('?')[0]
+        return _normalize_url(url, base_url)
     
     def _get_base_url(self, url: str) -> str:
         """Estrae base URL"""
@@ -368,14 +447,8 @@ class RouteDiscovery:
     def _is_same_domain(self, url: str, base_url: str) -> bool:
         """Verifica se URL è dello stesso dominio"""
         try:
-            url_domain = urlparse(url).netloc
-            base_domain = urlparse(base_url).netloc
-            
-            # Gestisci www
-            url_domain = url_domain.replace('www.', '')
-            base_domain = base_domain.replace('www.', '')
-            
-            return url_domain == base_domain
+            # Gestisci www (in _site_domain)
+            return _site_domain(url) == _site_domain(base_url)
         except:
             return False
 
@@ -470,9 +543,9 @@ def bootstrap_site_graphs(registry: SiteGraphRegistry,
     """
     for site_name, config in KNOWN_SITE_ROUTES.items():
         if not registry.get_graph(site_name):
-            graph = discovery.quick_scan(
+            graph, _, _ = discovery.quick_scan(
                 site_name=site_name,
                 urls=config['entry_points']
             )
-            registry.graphs[site_name] = graph
+            registry.add_graph(site_name, graph)
             registry.save_graph(site_name)
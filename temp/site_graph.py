@@ -7,16 +7,51 @@ Autore: Senior Python Developer
 Data: 23 Dicembre 2025
 """
 
+import sys
+import copy
 import json
+import time
 import hashlib
-from dataclasses import dataclass, field, asdict
-from typing import Dict, List, Optional, Set
+from array import array
+from dataclasses import dataclass, field, fields
+from functools import cached_property, partial
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 from datetime import datetime
 from pathlib import Path
 from enum import Enum
-from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
 import utils
+from _bfs import NUMBA_AVAILABLE, bfs_parents, bfs_parents_py
+
+# Import opzionale di orjson per save/load più rapidi
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Import opzionale di pyarrow per il formato colonnare (Parquet)
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# Import opzionali per la rappresentazione CSR del grafo
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+try:
+    from scipy.sparse import csr_matrix
+    from scipy.sparse.csgraph import breadth_first_order
+    SCIPY_AVAILABLE = NUMPY_AVAILABLE
+except ImportError:
+    SCIPY_AVAILABLE = False
 
 
 class NodeType(Enum):
@@ -29,6 +64,10 @@ class NodeType(Enum):
     UNKNOWN = "unknown"             # Ancora da classificare
 
 
+# Lookup diretto valore -> NodeType (evita Enum.__call__ nei caricamenti)
+_NODE_TYPE_BY_VALUE = {t.value: t for t in NodeType}
+
+
 @dataclass
 class GraphNode:
     """Singolo nodo nel grafo del sito"""
@@ -57,25 +96,40 @@ class GraphNode:
         if not self.discovered_at:
             self.discovered_at = datetime.now().isoformat()
     
-    @property
+    @cached_property
     def node_id(self) -> str:
-        """ID univoco basato su hash URL"""
+        """ID univoco basato su hash URL (calcolato al primo accesso)"""
         return hashlib.md5(self.url.encode()).hexdigest()[:12]
     
     def to_dict(self) -> Dict:
-        """Converte in dizionario serializzabile"""
-        d = asdict(self)
-        d['node_type'] = self.node_type.value
-        return d
+        """Converte in dizionario serializzabile (copia superficiale, senza asdict)"""
+        return {
+            'url': self.url,
+            'node_type': self.node_type.value,
+            'title': self.title,
+            'topics': self.topics,
+            'depth': self.depth,
+            'parent_url': self.parent_url,
+            'discovered_at': self.discovered_at,
+            'last_visited': self.last_visited,
+            'visit_count': self.visit_count,
+            'is_active': self.is_active,
+            'document_url': self.document_url,
+            'metadata': self.metadata,
+        }
     
     @classmethod
     def from_dict(cls, data: Dict) -> 'GraphNode':
         """Crea da dizionario"""
         data = data.copy()
-        data['node_type'] = NodeType(data['node_type'])
+        data['node_type'] = _NODE_TYPE_BY_VALUE[data['node_type']]
         return cls(**data)
 
 
+# Tipi di nodo considerati report
+REPORT_TYPES = (NodeType.REPORT_PAGE, NodeType.DOCUMENT)
+
+
 @dataclass
 class GraphEdge:
     """Connessione tra due nodi"""
@@ -86,7 +140,52 @@ class GraphEdge:
     weight: float = 1.0             # Importanza (1.0 = normale)
     
     def to_dict(self) -> Dict:
-        return asdict(self)
+        return {
+            'from_url': self.from_url,
+            'to_url': self.to_url,
+            'link_text': self.link_text,
+            'edge_type': self.edge_type,
+            'weight': self.weight,
+        }
+
+
+# Colonne (in ordine di costruttore) per il formato Parquet
+_NODE_FIELDS = [f.name for f in fields(GraphNode)]
+_EDGE_FIELDS = [f.name for f in fields(GraphEdge)]
+_PARQUET_TYPES = {
+    'depth': pa.int32(),
+    'visit_count': pa.int32(),
+    'is_active': pa.bool_(),
+    'weight': pa.float64(),
+} if PYARROW_AVAILABLE else {}
+
+
+def _dumps(obj) -> str:
+    """Serializza un singolo valore JSON (orjson se disponibile)"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj).decode('utf-8')
+    return json.dumps(obj, ensure_ascii=False)
+
+
+def _bfs_predecessors(indptr, indices, src: int, n: int) -> List[int]:
+    """
+    BFS su grafo CSR
+    
+    Returns:
+        Predecessore di ogni nodo nel percorso più breve da src;
+        -1 per la sorgente e per i nodi non raggiungibili
+    """
+    if NUMBA_AVAILABLE and NUMPY_AVAILABLE:
+        return bfs_parents(indptr, indices, src, n).tolist()
+    
+    if SCIPY_AVAILABLE:
+        graph = csr_matrix((np.ones(len(indices), dtype=np.int8), indices, indptr),
+                           shape=(n, n))
+        _, pred = breadth_first_order(graph, src, directed=True,
+                                      return_predecessors=True)
+        return np.where(pred < 0, -1, pred).tolist()
+    
+    return bfs_parents_py(indptr, indices, src, n)
 
 
 class SiteGraph:
@@ -104,6 +203,7 @@ class SiteGraph:
         
         self.nodes: Dict[str, GraphNode] = {}      # url -> node
         self.edges: List[GraphEdge] = []
+        self._edge_keys: Set[Tuple[str, str, str]] = set()  # dedup edges
         self.adjacency: Dict[str, Set[str]] = {}   # url -> set di url collegati
         
         # Rotte conosciute verso tipi di contenuto
@@ -115,28 +215,81 @@ class SiteGraph:
         
         # Topics coperti da questo sito
         self.site_topics: Set[str] = set()
+        # Notifica dei nuovi topics (impostata dal registry)
+        self._topic_listener: Optional[Callable[[List[str]], None]] = None
         
         # Metadata
         self.created_at = datetime.now().isoformat()
-        self.last_updated = self.created_at
+        self._last_updated = self.created_at
+        self._updated_at: Optional[float] = None  # epoch, formattato solo in lettura
+        self._dirty = False  # modifiche non ancora salvate
+        self._storage_format = 'json'  # formato da cui è stato caricato ('json' o 'parquet')
+        self._version = 0    # incrementato a ogni modifica (cache statistiche)
+        self._stats_cache: Optional[Tuple[int, Dict]] = None
+        
+        # Cache percorsi BFS, invalidate a ogni modifica del grafo
+        self._path_cache: Dict[Tuple[str, str], List[str]] = {}
+        self._parents_cache: Dict[str, Dict[str, Optional[str]]] = {}
+        
+        # Vista CSR (indici interi) dell'adjacency, costruita on demand
+        self._url_list: Optional[List[str]] = None
+        self._url_to_idx: Optional[Dict[str, int]] = None
+        self._indptr = None
+        self._indices = None
+        
+        # Colonna tipo per nodo e conteggi aggregati (per get_stats)
+        self._type_of: Dict[str, str] = {}
+        self._type_counts: Dict[str, int] = {}
+        
+        # Indici dei report: url -> topics indicizzati, topic -> url report
+        self._report_urls: Dict[str, Tuple[str, ...]] = {}
+        self._topic_to_reports: Dict[str, List[str]] = {}
         
         self.logger = utils.logger
     
     def add_node(self, node: GraphNode) -> None:
         """Aggiunge un nodo al grafo"""
+        # URL internati: una sola copia condivisa da nodes, adjacency ed edges
+        node.url = sys.intern(node.url)
+        if node.url in self._type_of:
+            self._unindex_node(node.url)
+        
         self.nodes[node.url] = node
+        self._index_node(node)
         
         if node.url not in self.adjacency:
             self.adjacency[node.url] = set()
         
         # Aggiorna topics del sito
-        self.site_topics.update(node.topics)
+        self._add_topics(node.topics)
         
-        self.last_updated = datetime.now().isoformat()
+        self._invalidate_paths()
+        self._updated_at = time.time()
+        self._dirty = True
+        self._version += 1
+    
+    @property
+    def last_updated(self) -> str:
+        """Timestamp ISO dell'ultima modifica (formattato solo quando letto)"""
+        if self._updated_at is not None:
+            self._last_updated = datetime.fromtimestamp(self._updated_at).isoformat()
+            self._updated_at = None
+        return self._last_updated
+    
+    @last_updated.setter
+    def last_updated(self, value: str) -> None:
+        self._last_updated = value
+        self._updated_at = None
     
     def add_edge(self, from_url: str, to_url: str, 
                  link_text: str = "", edge_type: str = "navigation") -> None:
-        """Aggiunge connessione tra due nodi"""
+        """Aggiunge connessione tra due nodi (ignora edge già presenti)"""
+        from_url = sys.intern(from_url)
+        to_url = sys.intern(to_url)
+        key = (from_url, to_url, edge_type)
+        if key in self._edge_keys:
+            return
+        self._edge_keys.add(key)
         
         edge = GraphEdge(
             from_url=from_url,
@@ -151,6 +304,110 @@ class SiteGraph:
         if from_url not in self.adjacency:
             self.adjacency[from_url] = set()
         self.adjacency[from_url].add(to_url)
+        
+        self._invalidate_paths()
+        self._dirty = True
+        self._version += 1
+    
+    def _index_node(self, node: GraphNode) -> None:
+        """Registra il nodo nei conteggi per tipo e negli indici dei report"""
+        node_type = node.node_type.value
+        self._type_of[node.url] = node_type
+        self._type_counts[node_type] = self._type_counts.get(node_type, 0) + 1
+        
+        if node.node_type not in REPORT_TYPES:
+            return
+        
+        topics = tuple(dict.fromkeys(node.topics))
+        self._report_urls[node.url] = topics
+        for topic in topics:
+            self._topic_to_reports.setdefault(topic, []).append(node.url)
+    
+    def _unindex_node(self, url: str) -> None:
+        """Rimuove un URL dai conteggi per tipo e dagli indici dei report"""
+        node_type = self._type_of.pop(url, None)
+        if node_type is not None:
+            remaining = self._type_counts[node_type] - 1
+            if remaining:
+                self._type_counts[node_type] = remaining
+            else:
+                del self._type_counts[node_type]
+        
+        topics = self._report_urls.pop(url, None)
+        if topics is None:
+            return
+        
+        for topic in topics:
+            urls = self._topic_to_reports[topic]
+            urls.remove(url)
+            if not urls:
+                del self._topic_to_reports[topic]
+    
+    def reindex_node(self, url: str) -> None:
+        """Aggiorna gli indici dopo aver modificato node_type o topics di un nodo"""
+        self._unindex_node(url)
+        node = self.nodes.get(url)
+        if node is not None:
+            self._index_node(node)
+            self._add_topics(node.topics)
+        self._dirty = True
+        self._version += 1
+    
+    def _add_topics(self, topics: Iterable[str]) -> None:
+        """Aggiunge topics al sito notificando solo quelli nuovi"""
+        new_topics = [t for t in dict.fromkeys(topics) if t not in self.site_topics]
+        if not new_topics:
+            return
+        
+        self.site_topics.update(new_topics)
+        if self._topic_listener is not None:
+            self._topic_listener(new_topics)
+    
+    def _invalidate_paths(self) -> None:
+        """Svuota le cache dei percorsi dopo una modifica del grafo"""
+        if self._path_cache:
+            self._path_cache.clear()
+        if self._parents_cache:
+            self._parents_cache.clear()
+        self._url_list = None
+    
+    def _freeze(self) -> None:
+        """
+        Costruisce la vista CSR dell'adjacency con ID interi per nodo
+        
+        I vicini del nodo i sono indices[indptr[i]:indptr[i+1]].
+        """
+        adjacency = self.adjacency
+        url_list = list(self.nodes)
+        url_to_idx = {url: idx for idx, url in enumerate(url_list)}
+        append_url = url_list.append
+        
+        # Include anche destinazioni di edge non ancora visitate come nodi
+        for from_url, targets in adjacency.items():
+            for url in (from_url, *targets):
+                if url not in url_to_idx:
+                    url_to_idx[url] = len(url_list)
+                    append_url(url)
+        
+        # Alias locali: evitano LOAD_ATTR ripetuti nel ciclo su tutti i nodi
+        adj_get = adjacency.get
+        idx_of = url_to_idx.__getitem__
+        indptr = [0]
+        indices = []
+        extend = indices.extend
+        append_ptr = indptr.append
+        for url in url_list:
+            extend(map(idx_of, adj_get(url, ())))
+            append_ptr(len(indices))
+        
+        if NUMPY_AVAILABLE:
+            self._indptr = np.asarray(indptr, dtype=np.int32)
+            self._indices = np.asarray(indices, dtype=np.int32)
+        else:
+            self._indptr = array('i', indptr)
+            self._indices = array('i', indices)
+        self._url_to_idx = url_to_idx
+        self._url_list = url_list
     
     def get_node(self, url: str) -> Optional[GraphNode]:
         """Ottiene nodo per URL"""
@@ -169,37 +426,85 @@ class SiteGraph:
         if from_url == to_url:
             return [from_url]
         
-        # BFS
-        queue = deque([(from_url, [from_url])])
-        visited = {from_url}
+        key = (from_url, to_url)
+        path = self._path_cache.get(key)
         
-        while queue:
-            current, path = queue.popleft()
-            
-            for neighbor in self.adjacency.get(current, []):
-                if neighbor == to_url:
-                    return path + [neighbor]
-                
-                if neighbor not in visited:
-                    visited.add(neighbor)
-                    queue.append((neighbor, path + [neighbor]))
+        if path is None:
+            parents = self.shortest_paths_from(from_url)
+            path = self._build_path(parents, to_url) if to_url in parents else []
+            self._path_cache[key] = path
+        
+        return list(path)
+    
+    def shortest_paths_from(self, source: str) -> Dict[str, Optional[str]]:
+        """
+        BFS completa da un nodo sorgente
         
-        return []
+        Il risultato è memorizzato per sorgente: percorsi successivi dalla
+        stessa sorgente costano solo la ricostruzione (O(lunghezza percorso)).
+        
+        Returns:
+            Mappa url -> padre nel percorso più breve (None per la sorgente),
+            contenente solo i nodi raggiungibili. Condivisa con la cache:
+            non va modificata.
+        """
+        parents = self._parents_cache.get(source)
+        if parents is not None:
+            return parents
+        
+        if self._url_list is None:
+            self._freeze()
+        
+        src = self._url_to_idx.get(source)
+        if src is None:
+            parents = {source: None}
+        else:
+            # BFS su indici interi, poi traduzione degli ID in URL
+            url_list = self._url_list
+            pred = _bfs_predecessors(self._indptr, self._indices, src, len(url_list))
+            parents = {
+                url_list[idx]: (url_list[p] if p >= 0 else None)
+                for idx, p in enumerate(pred)
+                if p >= 0 or idx == src
+            }
+        
+        self._parents_cache[source] = parents
+        return parents
+    
+    @staticmethod
+    def _build_path(parent: Dict[str, Optional[str]], to_url: str) -> List[str]:
+        """Ricostruisce il percorso risalendo la mappa dei padri"""
+        path = []
+        append = path.append
+        current = to_url
+        while current is not None:
+            append(current)
+            current = parent[current]
+        path.reverse()
+        return path
     
     def find_reports(self) -> List[GraphNode]:
         """Trova tutti i nodi che sono report"""
-        return [
-            node for node in self.nodes.values()
-            if node.node_type in [NodeType.REPORT_PAGE, NodeType.DOCUMENT]
-        ]
+        return [self.nodes[url] for url in self._report_urls]
     
     def find_reports_by_topic(self, topic: str) -> List[GraphNode]:
         """Trova report per un dato topic"""
-        return [
-            node for node in self.nodes.values()
-            if node.node_type in [NodeType.REPORT_PAGE, NodeType.DOCUMENT]
-            and topic in node.topics
-        ]
+        return [self.nodes[url] for url in self._topic_to_reports.get(topic, ())]
+    
+    def iter_reports(self) -> Iterator[GraphNode]:
+        """Come find_reports, ma senza costruire la lista (es. con islice)"""
+        nodes = self.nodes
+        return (nodes[url] for url in self._report_urls)
+    
+    def iter_reports_by_topic(self, topic: str) -> Iterator[GraphNode]:
+        """Come find_reports_by_topic, ma senza costruire la lista"""
+        nodes = self.nodes
+        return (nodes[url] for url in self._topic_to_reports.get(topic, ()))
+    
+    @property
+    def report_count(self) -> int:
+        """Numero di report nel grafo (dall'indice, senza scansione)"""
+        return len(self._report_urls)
     
     def get_route_to_reports(self) -> Dict[str, List[str]]:
         """
@@ -214,18 +519,23 @@ class SiteGraph:
         # Se homepage non nel grafo, usa primo nodo
         if homepage not in self.nodes:
             if self.nodes:
-                homepage = list(self.nodes.keys())[0]
+                homepage = next(iter(self.nodes))
             else:
                 return {}
         
-        # Per ogni report, trova la rotta
-        for node in self.find_reports():
-            path = self.find_path(homepage, node.url)
-            
-            if path:
-                for topic in node.topics:
-                    if topic not in routes or len(path) < len(routes[topic]):
-                        routes[topic] = path
+        # Una sola BFS dalla homepage, poi ricostruzione O(lunghezza) per report
+        parents = self.shortest_paths_from(homepage)
+        reached = [
+            (self._build_path(parents, node.url), node)
+            for node in self.find_reports()
+            if node.url in parents
+        ]
+        
+        # Ordinati per lunghezza (stabile): il primo percorso per topic è il migliore
+        reached.sort(key=lambda item: len(item[0]))
+        for path, node in reached:
+            for topic in node.topics:
+                routes.setdefault(topic, path)
         
         return routes
     
@@ -234,33 +544,39 @@ class SiteGraph:
         if route_type in self.known_routes:
             if url not in self.known_routes[route_type]:
                 self.known_routes[route_type].append(url)
+                self._dirty = True
+                self._version += 1
     
     def get_stats(self) -> Dict:
-        """Statistiche del grafo"""
-        node_types = {}
-        for node in self.nodes.values():
-            t = node.node_type.value
-            node_types[t] = node_types.get(t, 0) + 1
+        """Statistiche del grafo (ricalcolate solo se il grafo è cambiato)"""
+        # Copie profonde: i chiamanti possono modificare il risultato senza toccare la cache
+        if self._stats_cache is not None and self._stats_cache[0] == self._version:
+            return copy.deepcopy(self._stats_cache[1])
         
-        return {
+        stats = {
             'site_name': self.site_name,
             'base_url': self.base_url,
             'total_nodes': len(self.nodes),
             'total_edges': len(self.edges),
-            'node_types': node_types,
+            'node_types': dict(self._type_counts),
             'topics_covered': list(self.site_topics),
             'known_report_routes': len(self.known_routes.get('reports', [])),
             'created_at': self.created_at,
             'last_updated': self.last_updated
         }
+        self._stats_cache = (self._version, stats)
+        return copy.deepcopy(stats)
     
     def save(self, filepath: str) -> None:
-        """Salva grafo su file JSON"""
-        data = {
+        """
+        Salva grafo su file JSON
+        
+        Nodi ed edges sono codificati uno alla volta e scritti in streaming,
+        senza costruire in memoria il dizionario completo del grafo.
+        """
+        header = {
             'site_name': self.site_name,
             'base_url': self.base_url,
-            'nodes': {url: node.to_dict() for url, node in self.nodes.items()},
-            'edges': [e.to_dict() for e in self.edges],
             'known_routes': self.known_routes,
             'site_topics': list(self.site_topics),
             'created_at': self.created_at,
@@ -268,38 +584,142 @@ class SiteGraph:
         }
         
         with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-        
+            f.write('{\n')
+            for key, value in header.items():
+                f.write(f'  {_dumps(key)}: {_dumps(value)},\n')
+            
+            f.write('  "nodes": {')
+            sep = '\n'
+            for url, node in self.nodes.items():
+                f.write(f'{sep}    {_dumps(url)}: {_dumps(node.to_dict())}')
+                sep = ',\n'
+            
+            f.write('\n  },\n  "edges": [')
+            sep = '\n'
+            for edge in self.edges:
+                f.write(f'{sep}    {_dumps(edge.to_dict())}')
+                sep = ',\n'
+            f.write('\n  ]\n}\n')
+        
+        self._dirty = False
         self.logger.info(f"💾 Grafo salvato: {filepath}")
     
     @classmethod
     def load(cls, filepath: str) -> 'SiteGraph':
         """Carica grafo da file JSON"""
-        with open(filepath, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        if ORJSON_AVAILABLE:
+            data = orjson.loads(Path(filepath).read_bytes())
+        else:
+            with open(filepath, 'r', encoding='utf-8') as f:
+                data = json.load(f)
         
         graph = cls(data['site_name'], data['base_url'])
         
         # Ricostruisci nodi
         for url, node_data in data['nodes'].items():
-            graph.nodes[url] = GraphNode.from_dict(node_data)
+            node = GraphNode.from_dict(node_data)
+            node.url = sys.intern(node.url)
+            graph.nodes[sys.intern(url)] = node
+            graph._index_node(node)
         
         # Ricostruisci edges
         for edge_data in data['edges']:
-            graph.edges.append(GraphEdge(**edge_data))
-            
-            from_url = edge_data['from_url']
-            to_url = edge_data['to_url']
-            
-            if from_url not in graph.adjacency:
-                graph.adjacency[from_url] = set()
-            graph.adjacency[from_url].add(to_url)
+            graph._load_edge(GraphEdge(**edge_data))
         
-        graph.known_routes = data.get('known_routes', {})
-        graph.site_topics = set(data.get('site_topics', []))
-        graph.created_at = data.get('created_at', '')
-        graph.last_updated = data.get('last_updated', '')
+        graph._load_meta(data)
+        return graph
+    
+    def _load_edge(self, edge: GraphEdge) -> None:
+        """Inserisce un edge letto da file (senza invalidare le cache)"""
+        edge.from_url = from_url = sys.intern(edge.from_url)
+        edge.to_url = to_url = sys.intern(edge.to_url)
+        
+        # Scarta duplicati salvati da versioni precedenti
+        key = (from_url, to_url, edge.edge_type)
+        if key in self._edge_keys:
+            return
+        self._edge_keys.add(key)
+        self.edges.append(edge)
+        
+        if from_url not in self.adjacency:
+            self.adjacency[from_url] = set()
+        self.adjacency[from_url].add(to_url)
+    
+    def _load_meta(self, data: Dict) -> None:
+        """Ripristina rotte, topics e timestamp da file"""
+        self.known_routes = data.get('known_routes', {})
+        self.site_topics = set(data.get('site_topics', []))
+        self.created_at = data.get('created_at', '')
+        self.last_updated = data.get('last_updated', '')
+    
+    def save_parquet(self, dirpath: str) -> None:
+        """
+        Salva grafo in formato colonnare: nodes.parquet, edges.parquet
+        e un piccolo graph.json con i metadati del sito
+        """
+        if not PYARROW_AVAILABLE:
+            raise ImportError("pyarrow non installato. pip install pyarrow")
+        
+        directory = Path(dirpath)
+        directory.mkdir(parents=True, exist_ok=True)
+        
+        nodes = list(self.nodes.values())
+        node_columns = {name: [getattr(n, name) for n in nodes] for name in _NODE_FIELDS}
+        node_columns['node_type'] = [t.value for t in node_columns['node_type']]
+        node_columns['metadata'] = [_dumps(m) for m in node_columns['metadata']]
+        node_schema = pa.schema([
+            (name, pa.list_(pa.string()) if name == 'topics' else _PARQUET_TYPES.get(name, pa.string()))
+            for name in _NODE_FIELDS
+        ])
+        pq.write_table(pa.table(node_columns, schema=node_schema),
+                       directory / 'nodes.parquet')
+        
+        edge_columns = {name: [getattr(e, name) for e in self.edges] for name in _EDGE_FIELDS}
+        edge_schema = pa.schema([
+            (name, _PARQUET_TYPES.get(name, pa.string())) for name in _EDGE_FIELDS
+        ])
+        pq.write_table(pa.table(edge_columns, schema=edge_schema),
+                       directory / 'edges.parquet')
+        
+        meta = {
+            'site_name': self.site_name,
+            'base_url': self.base_url,
+            'known_routes': self.known_routes,
+            'site_topics': list(self.site_topics),
+            'created_at': self.created_at,
+            'last_updated': self.last_updated
+        }
+        (directory / 'graph.json').write_text(_dumps(meta), encoding='utf-8')
         
+        self._dirty = False
+        self.logger.info(f"💾 Grafo salvato (parquet): {dirpath}")
+    
+    @classmethod
+    def load_parquet(cls, dirpath: str) -> 'SiteGraph':
+        """Carica grafo salvato con save_parquet"""
+        if not PYARROW_AVAILABLE:
+            raise ImportError("pyarrow non installato. pip install pyarrow")
+        
+        directory = Path(dirpath)
+        meta = json.loads((directory / 'graph.json').read_text(encoding='utf-8'))
+        graph = cls(meta['site_name'], meta['base_url'])
+        
+        # Lettura colonnare, poi costruzione diretta dei nodi (senza dict intermedi)
+        columns = pq.read_table(directory / 'nodes.parquet').to_pydict()
+        columns['node_type'] = [_NODE_TYPE_BY_VALUE[t] for t in columns['node_type']]
+        columns['metadata'] = [json.loads(m) for m in columns['metadata']]
+        for values in zip(*(columns[name] for name in _NODE_FIELDS)):
+            node = GraphNode(*values)
+            node.url = sys.intern(node.url)
+            graph.nodes[node.url] = node
+            graph._index_node(node)
+        
+        columns = pq.read_table(directory / 'edges.parquet').to_pydict()
+        for values in zip(*(columns[name] for name in _EDGE_FIELDS)):
+            graph._load_edge(GraphEdge(*values))
+        
+        graph._load_meta(meta)
+        graph._storage_format = 'parquet'
         return graph
     
     def __repr__(self):
@@ -320,21 +740,50 @@ class SiteGraphRegistry:
         self.storage_dir.mkdir(parents=True, exist_ok=True)
         
         self.graphs: Dict[str, SiteGraph] = {}
+        self._topic_to_sites: Dict[str, List[str]] = {}  # topic -> chiavi siti
+        self._census_cache: Optional[Tuple[Tuple, Dict]] = None
         self.logger = utils.logger
         
         # Carica grafi esistenti
         self._load_all_graphs()
     
     def _load_all_graphs(self) -> None:
-        """Carica tutti i grafi salvati"""
-        for filepath in self.storage_dir.glob('*.json'):
+        """Carica tutti i grafi salvati (in parallelo: lettura file IO-bound)"""
+        files = [(fp, SiteGraph.load) for fp in self.storage_dir.glob('*.json')]
+        
+        # Grafi in formato colonnare: una cartella con nodes.parquet
+        if PYARROW_AVAILABLE:
+            files += [(fp.parent, SiteGraph.load_parquet)
+                      for fp in self.storage_dir.glob('*/nodes.parquet')]
+        
+        if not files:
+            return
+        
+        # Dal più vecchio al più recente: se un sito ha sia JSON sia Parquet
+        # vince la copia salvata per ultima
+        files.sort(key=lambda item: self._saved_at(item[0]))
+        
+        with ThreadPoolExecutor(max_workers=min(32, len(files))) as executor:
+            futures = [(fp, executor.submit(loader, str(fp))) for fp, loader in files]
+        
+        for filepath, future in futures:
             try:
-                graph = SiteGraph.load(str(filepath))
-                self.graphs[graph.site_name.lower()] = graph
+                graph = future.result()
+                self.add_graph(graph.site_name.lower(), graph)
                 self.logger.info(f"📂 Caricato grafo: {graph.site_name}")
             except Exception as e:
                 self.logger.error(f"❌ Errore caricamento {filepath}: {e}")
     
+    @staticmethod
+    def _saved_at(path: Path) -> int:
+        """Istante di salvataggio di un grafo (file JSON o cartella Parquet)"""
+        if path.is_dir():
+            path = path / 'graph.json'  # scritto per ultimo da save_parquet
+        try:
+            return path.stat().st_mtime_ns
+        except OSError:
+            return 0
+    
     def register_site(self, site_name: str, base_url: str) -> SiteGraph:
         """Registra nuovo sito o ritorna esistente"""
         key = site_name.lower()
@@ -343,7 +792,7 @@ class SiteGraphRegistry:
             return self.graphs[key]
         
         graph = SiteGraph(site_name, base_url)
-        self.graphs[key] = graph
+        self.add_graph(key, graph)
         
         # Salva immediatamente
         self.save_graph(key)
@@ -352,22 +801,47 @@ class SiteGraphRegistry:
         
         return graph
     
+    def add_graph(self, key: str, graph: SiteGraph) -> None:
+        """Inserisce (o sostituisce) un grafo mantenendo l'indice dei topics"""
+        old = self.graphs.get(key)
+        if old is not None:
+            old._topic_listener = None
+            for topic in old.site_topics:
+                sites = self._topic_to_sites[topic]
+                sites.remove(key)
+                if not sites:
+                    del self._topic_to_sites[topic]
+        
+        self.graphs[key] = graph
+        self._index_topics(key, graph.site_topics)
+        graph._topic_listener = partial(self._index_topics, key)
+    
+    def _index_topics(self, key: str, topics: Iterable[str]) -> None:
+        """Aggiunge il sito all'indice per ciascun topic"""
+        for topic in topics:
+            self._topic_to_sites.setdefault(topic, []).append(key)
+    
     def get_graph(self, site_name: str) -> Optional[SiteGraph]:
         """Ottiene grafo per nome sito"""
         return self.graphs.get(site_name.lower())
     
     def save_graph(self, site_name: str) -> None:
-        """Salva grafo specifico"""
+        """Salva grafo specifico (nello stesso formato da cui è stato caricato)"""
         key = site_name.lower()
         
-        if key in self.graphs:
-            filepath = self.storage_dir / f"{key}.json"
-            self.graphs[key].save(str(filepath))
+        graph = self.graphs.get(key)
+        if graph is None:
+            return
+        if graph._storage_format == 'parquet':
+            graph.save_parquet(str(self.storage_dir / key))
+        else:
+            graph.save(str(self.storage_dir / f"{key}.json"))
     
     def save_all(self) -> None:
-        """Salva tutti i grafi"""
-        for key in self.graphs:
-            self.save_graph(key)
+        """Salva tutti i grafi modificati dall'ultimo salvataggio"""
+        for key, graph in self.graphs.items():
+            if graph._dirty:
+                self.save_graph(key)
     
     def get_all_topics(self) -> Dict[str, List[str]]:
         """
@@ -376,35 +850,35 @@ class SiteGraphRegistry:
         Returns:
             Dict con topic come key e lista siti come value
         """
-        topic_sites = {}
-        
-        for site_name, graph in self.graphs.items():
-            for topic in graph.site_topics:
-                if topic not in topic_sites:
-                    topic_sites[topic] = []
-                topic_sites[topic].append(site_name)
-        
-        return topic_sites
+        return {topic: list(sites) for topic, sites in self._topic_to_sites.items()}
     
     def find_sources_for_topic(self, topic: str) -> List[SiteGraph]:
         """Trova tutti i siti che coprono un topic"""
-        return [
-            graph for graph in self.graphs.values()
-            if topic in graph.site_topics
-        ]
+        return [self.graphs[key] for key in self._topic_to_sites.get(topic, ())]
     
     def get_census(self) -> Dict:
         """
         Ritorna censimento completo di tutte le fonti
-        """
-        census = {
-            'total_sites': len(self.graphs),
-            'sites': {},
-            'topics_coverage': self.get_all_topics(),
-            'generated_at': datetime.now().isoformat()
-        }
         
-        for site_name, graph in self.graphs.items():
-            census['sites'][site_name] = graph.get_stats()
+        Il risultato è riutilizzato finché nessun grafo viene aggiunto,
+        sostituito o modificato; ogni chiamata ne riceve una copia con
+        generated_at aggiornato.
+        """
+        versions = tuple(
+            (key, id(graph), graph._version) for key, graph in self.graphs.items()
+        )
+        if self._census_cache is None or self._census_cache[0] != versions:
+            census = {
+                'total_sites': len(self.graphs),
+                'sites': {},
+                'topics_coverage': self.get_all_topics(),
+            }
+            
+            for site_name, graph in self.graphs.items():
+                census['sites'][site_name] = graph.get_stats()
+            
+            self._census_cache = (versions, census)
         
+        census = copy.deepcopy(self._census_cache[1])
+        census['generated_at'] = datetime.now().isoformat()
         return census
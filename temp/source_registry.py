@@ -7,15 +7,87 @@ Autore: Senior Python Developer
 Data: 23 Dicembre 2025
 """
 
+import os
+import sys
 import json
-from dataclasses import dataclass, field, asdict
-from typing import Dict, List, Optional, Set
+import sqlite3
+import tempfile
+import time
+from collections import Counter
+from contextlib import contextmanager
+from functools import partial
+from dataclasses import dataclass, field, fields
+from typing import Dict, List, Optional, Set, Tuple
 from datetime import datetime
 from pathlib import Path
 from enum import Enum
 
 import utils
 
+# Import opzionale di orjson per serializzazione più rapida
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Import opzionale di pysimdjson per il parsing del registry
+try:
+    import simdjson
+    SIMDJSON_AVAILABLE = True
+except ImportError:
+    SIMDJSON_AVAILABLE = False
+
+# Buffer di scrittura per il salvataggio in streaming
+WRITE_BUFFER_SIZE = 64 * 1024
+
+# Estensioni che selezionano lo storage SQLite (una riga per fonte)
+SQLITE_SUFFIXES = ('.db', '.sqlite', '.sqlite3')
+
+_SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sources (
+    slug TEXT PRIMARY KEY,
+    name TEXT,
+    source_type TEXT,
+    status TEXT,
+    base_url TEXT,
+    json TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS source_topics (
+    slug TEXT NOT NULL,
+    topic TEXT NOT NULL,
+    is_primary INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_source_topics_topic ON source_topics(topic);
+CREATE INDEX IF NOT EXISTS idx_source_topics_slug ON source_topics(slug);
+"""
+
+# Timestamp condiviso durante le creazioni in blocco (vedi _frozen_now)
+_FROZEN_NOW: Optional[str] = None
+
+
+def _now() -> str:
+    """Timestamp ISO corrente (o quello congelato, se attivo)"""
+    return _FROZEN_NOW or datetime.now().isoformat()
+
+
+@contextmanager
+def _frozen_now():
+    """Usa un unico timestamp per tutte le fonti create nel blocco"""
+    global _FROZEN_NOW
+    _FROZEN_NOW = datetime.now().isoformat()
+    try:
+        yield _FROZEN_NOW
+    finally:
+        _FROZEN_NOW = None
+
+
+def _encode(obj) -> bytes:
+    """Serializza un singolo valore JSON in bytes"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False).encode('utf-8')
+
 
 class SourceStatus(Enum):
     """Stato di una fonte"""
@@ -36,8 +108,18 @@ class SourceType(Enum):
     NEWS = "news"                       # Tech news
 
 
-@dataclass
-class SourceConfig:
+# Lookup diretto valore -> Enum (evita Enum.__call__ nei caricamenti)
+_SOURCE_STATUS_BY_VALUE = {s.value: s for s in SourceStatus}
+_SOURCE_TYPE_BY_VALUE = {t.value: t for t in SourceType}
+
+
+class _StatusObservable:
+    """Slot fuori dai campi serializzati: notifica stato e updated_at differito"""
+    __slots__ = ('_status_listener', '_updated_at_epoch')
+
+
+@dataclass(slots=True)
+class SourceConfig(_StatusObservable):
     """Configurazione di una singola fonte"""
     
     # Identificazione
@@ -79,49 +161,325 @@ class SourceConfig:
     created_at: str = ""
     updated_at: str = ""
     
+    # Validatori HTTP degli entry points (richieste condizionali in quick_scan)
+    entry_etags: Dict[str, str] = field(default_factory=dict)
+    entry_last_modified: Dict[str, str] = field(default_factory=dict)
+    
     def __post_init__(self):
-        if not self.created_at:
-            self.created_at = datetime.now().isoformat()
-        self.updated_at = datetime.now().isoformat()
+        self._status_listener = None  # impostato dal registry
+        self._updated_at_epoch = 0.0  # updated_at da formattare (vedi mark_error)
+        # Timestamp solo se mancanti: ricaricare una fonte non la modifica
+        if not (self.created_at and self.updated_at):
+            now = _now()
+            if not self.created_at:
+                self.created_at = now
+            if not self.updated_at:
+                self.updated_at = now
     
     def to_dict(self) -> Dict:
-        d = asdict(self)
+        self._sync_updated_at()
+        # Lettura diretta dei campi: asdict copierebbe ricorsivamente le liste
+        d = {name: getattr(self, name) for name in _SOURCE_FIELDS}
         d['source_type'] = self.source_type.value
         d['status'] = self.status.value
         return d
     
     @classmethod
     def from_dict(cls, data: Dict) -> 'SourceConfig':
-        data = data.copy()
-        data['source_type'] = SourceType(data['source_type'])
-        data['status'] = SourceStatus(data['status'])
-        return cls(**data)
+        source_type = _SOURCE_TYPE_BY_VALUE[data['source_type']]
+        status = _SOURCE_STATUS_BY_VALUE[data.get('status', SourceStatus.PENDING.value)]
+        
+        # Topics internati: una sola copia di ogni stringa tra tutte le fonti
+        topics = [sys.intern(t) for t in data.get('topics', ())]
+        primary_topics = [sys.intern(t) for t in data.get('primary_topics', ())]
+        
+        # Record completo (caso normale): costruzione posizionale, senza copie
+        if data.keys() == _SOURCE_FIELD_SET:
+            values = [data[name] for name in _SOURCE_FIELDS]
+            values[_SOURCE_TYPE_POS] = source_type
+            values[_STATUS_POS] = status
+            values[_TOPICS_POS] = topics
+            values[_PRIMARY_TOPICS_POS] = primary_topics
+            return cls(*values)
+        
+        return cls(**{**data, 'source_type': source_type, 'status': status,
+                      'topics': topics, 'primary_topics': primary_topics})
     
     def mark_success(self) -> None:
         """Segna fetch riuscito"""
-        self.last_successful_fetch = datetime.now().isoformat()
+        now = _now()
+        self.last_successful_fetch = now
         self.error_count = 0
         self.last_error = None
-        self.status = SourceStatus.ACTIVE
-        self.updated_at = datetime.now().isoformat()
+        self.touch(now)
+        self._set_status(SourceStatus.ACTIVE)
     
     def mark_error(self, error: str) -> None:
         """Segna errore"""
         self.error_count += 1
         self.last_error = error
-        self.updated_at = datetime.now().isoformat()
+        # Solo time.time(): la stringa ISO viene formattata al salvataggio
+        self._updated_at_epoch = time.time()
         
         if self.error_count >= 5:
-            self.status = SourceStatus.ERROR
+            self._set_status(SourceStatus.ERROR)
+    
+    def touch(self, now: Optional[str] = None) -> None:
+        """Imposta updated_at (annulla un eventuale timestamp differito)"""
+        self.updated_at = now or _now()
+        self._updated_at_epoch = 0.0
+    
+    def _sync_updated_at(self) -> None:
+        """Formatta in updated_at il timestamp differito di mark_error"""
+        if self._updated_at_epoch:
+            self.updated_at = datetime.fromtimestamp(self._updated_at_epoch).isoformat()
+            self._updated_at_epoch = 0.0
+    
+    def _set_status(self, status: SourceStatus) -> None:
+        """Cambia stato notificando il registry (se la fonte è registrata)"""
+        if status == self.status:
+            return
+        self.status = status
+        if self._status_listener is not None:
+            self._status_listener()
+
+
+# Ordine dei campi per la costruzione posizionale in from_dict
+_SOURCE_FIELDS = tuple(f.name for f in fields(SourceConfig))
+_SOURCE_FIELD_SET = frozenset(_SOURCE_FIELDS)
+_SOURCE_TYPE_POS = _SOURCE_FIELDS.index('source_type')
+_STATUS_POS = _SOURCE_FIELDS.index('status')
+_TOPICS_POS = _SOURCE_FIELDS.index('topics')
+_PRIMARY_TOPICS_POS = _SOURCE_FIELDS.index('primary_topics')
+
+
+def _encode_source(source: SourceConfig) -> bytes:
+    """Serializza una fonte (orjson gestisce direttamente dataclass ed Enum)"""
+    if ORJSON_AVAILABLE:
+        source._sync_updated_at()
+        return orjson.dumps(source)
+    return _encode(source.to_dict())
+
+
+# Fonti di default come dict pronti per from_dict: definite una sola volta
+_DEFAULT_SOURCE_DICTS: Tuple[Dict, ...] = (
+    # Big 4
+    dict(
+        name="Deloitte",
+        slug="deloitte",
+        source_type="consulting",
+        base_url="https://www2.deloitte.com",
+        entry_points=[
+            "https://www2.deloitte.com/us/en/insights.html",
+            "https://www2.deloitte.com/us/en/insights/focus/tech-trends.html",
+            "https://www2.deloitte.com/us/en/insights/topics/digital-transformation.html"
+        ],
+        topics=["AI", "Cloud", "Cybersecurity", "Digital Transformation", "Data"],
+        primary_topics=["AI", "Digital Transformation"],
+        description="Global consulting firm with Tech Trends annual report"
+    ),
+    dict(
+        name="PwC",
+        slug="pwc",
+        source_type="consulting",
+        base_url="https://www.pwc.com",
+        entry_points=[
+            "https://www.pwc.com/gx/en/issues.html",
+            "https://www.pwc.com/gx/en/issues/technology.html"
+        ],
+        topics=["AI", "ESG", "Digital Transformation", "Cybersecurity"],
+        primary_topics=["AI", "ESG"],
+        description="Big 4 firm with CEO Survey and Global Digital Trust"
+    ),
+    dict(
+        name="KPMG",
+        slug="kpmg",
+        source_type="consulting",
+        base_url="https://kpmg.com",
+        entry_points=[
+            "https://kpmg.com/xx/en/home/insights.html"
+        ],
+        topics=["AI", "ESG", "Cloud", "Digital Transformation"],
+        primary_topics=["Digital Transformation"],
+        description="Big 4 consulting with global insights"
+    ),
+    dict(
+        name="EY",
+        slug="ey",
+        source_type="consulting",
+        base_url="https://www.ey.com",
+        entry_points=[
+            "https://www.ey.com/en_gl/insights"
+        ],
+        topics=["AI", "ESG", "Digital Transformation"],
+        primary_topics=["ESG"],
+        description="Big 4 firm focused on sustainability"
+    ),
+
+    # MBB
+    dict(
+        name="McKinsey",
+        slug="mckinsey",
+        source_type="consulting",
+        base_url="https://www.mckinsey.com",
+        entry_points=[
+            "https://www.mckinsey.com/featured-insights",
+            "https://www.mckinsey.com/capabilities/mckinsey-digital/our-insights"
+        ],
+        topics=["AI", "Digital Transformation", "Data", "Automation"],
+        primary_topics=["AI", "Digital Transformation"],
+        description="Top strategy consulting with MGI research"
+    ),
+    dict(
+        name="BCG",
+        slug="bcg",
+        source_type="consulting",
+        base_url="https://www.bcg.com",
+        entry_points=[
+            "https://www.bcg.com/publications"
+        ],
+        topics=["AI", "Digital Transformation", "ESG", "Innovation"],
+        primary_topics=["AI", "Innovation"],
+        description="Strategy consulting with Henderson Institute"
+    ),
+    dict(
+        name="Bain",
+        slug="bain",
+        source_type="consulting",
+        base_url="https://www.bain.com",
+        entry_points=[
+            "https://www.bain.com/insights/"
+        ],
+        topics=["AI", "Digital Transformation", "Private Equity"],
+        primary_topics=["Digital Transformation"],
+        description="Strategy consulting with sector expertise"
+    ),
+
+    # Tech Advisory
+    dict(
+        name="Accenture",
+        slug="accenture",
+        source_type="consulting",
+        base_url="https://www.accenture.com",
+        entry_points=[
+            "https://www.accenture.com/us-en/insights"
+        ],
+        topics=["AI", "Cloud", "Digital Transformation", "Metaverse"],
+        primary_topics=["AI", "Cloud"],
+        description="Tech consulting with Technology Vision report"
+    ),
+
+    # Research Firms
+    dict(
+        name="Gartner",
+        slug="gartner",
+        source_type="research",
+        base_url="https://www.gartner.com",
+        entry_points=[
+            "https://www.gartner.com/en/articles",
+            "https://www.gartner.com/en/information-technology/insights"
+        ],
+        topics=["AI", "Cloud", "Cybersecurity", "Data", "IoT"],
+        primary_topics=["AI", "Cloud"],
+        description="IT research with Hype Cycle and Magic Quadrant",
+        requires_javascript=True
+    ),
+    dict(
+        name="Forrester",
+        slug="forrester",
+        source_type="research",
+        base_url="https://www.forrester.com",
+        entry_points=[
+            "https://www.forrester.com/research/"
+        ],
+        topics=["AI", "CX", "Digital Transformation", "Cloud"],
+        primary_topics=["CX", "AI"],
+        description="Technology and market research",
+        requires_javascript=True
+    ),
+
+    # Think Tanks
+    dict(
+        name="World Economic Forum",
+        slug="wef",
+        source_type="think_tank",
+        base_url="https://www.weforum.org",
+        entry_points=[
+            "https://www.weforum.org/publications/"
+        ],
+        topics=["AI", "ESG", "Future of Work", "Geopolitics"],
+        primary_topics=["AI", "ESG"],
+        description="Global issues and technology governance"
+    ),
+    dict(
+        name="Brookings",
+        slug="brookings",
+        source_type="think_tank",
+        base_url="https://www.brookings.edu",
+        entry_points=[
+            "https://www.brookings.edu/topic/technology-innovation/"
+        ],
+        topics=["AI", "Policy", "Digital Transformation"],
+        primary_topics=["AI", "Policy"],
+        description="Policy research on technology"
+    ),
+
+    # Tech Companies
+    dict(
+        name="Google AI",
+        slug="google_ai",
+        source_type="tech_company",
+        base_url="https://ai.google",
+        entry_points=[
+            "https://ai.google/research/",
+            "https://blog.google/technology/ai/"
+        ],
+        topics=["AI", "Machine Learning", "Quantum"],
+        primary_topics=["AI"],
+        description="Google AI research and blog"
+    ),
+    dict(
+        name="Microsoft Research",
+        slug="microsoft_research",
+        source_type="tech_company",
+        base_url="https://www.microsoft.com",
+        entry_points=[
+            "https://www.microsoft.com/en-us/research/"
+        ],
+        topics=["AI", "Cloud", "Quantum", "Security"],
+        primary_topics=["AI", "Cloud"],
+        description="Microsoft research publications"
+    ),
+    dict(
+        name="AWS",
+        slug="aws",
+        source_type="tech_company",
+        base_url="https://aws.amazon.com",
+        entry_points=[
+            "https://aws.amazon.com/blogs/",
+            "https://aws.amazon.com/executive-insights/"
+        ],
+        topics=["Cloud", "AI", "Data", "Security"],
+        primary_topics=["Cloud"],
+        description="AWS whitepapers and blogs"
+    )
+)
 
 
 class SourceRegistry:
     """
     Registro centrale di tutte le fonti.
     Gestisce censimento, configurazione, e stato.
+    
+    Le operazioni CRUD salvano subito se autosave=True; dentro
+    `with registry.batch():` (o `with registry:`) il salvataggio è
+    rimandato all'uscita dal blocco.
+    
+    Con storage_path *.db/*.sqlite le fonti sono salvate in SQLite, una
+    riga per fonte: le operazioni CRUD scrivono solo le righe modificate.
     """
     
-    def __init__(self, storage_path: str = None):
+    def __init__(self, storage_path: str = None, autosave: bool = True):
         if storage_path is None:
             storage_path = Path(__file__).parent / 'data' / 'sources.json'
         
@@ -131,8 +489,34 @@ class SourceRegistry:
         self.sources: Dict[str, SourceConfig] = {}
         self.logger = utils.logger
         
+        # Indici inversi topic -> slug (e topics indicizzati per slug)
+        self._topic_index: Dict[str, List[str]] = {}
+        self._primary_topic_index: Dict[str, List[str]] = {}
+        self._indexed_topics: Dict[str, Tuple[Tuple[str, ...], Tuple[str, ...]]] = {}
+        self._active: Dict[str, None] = {}  # slug fonti attive (insieme ordinato)
+        
+        # Colonne stato/tipo per slug con conteggi aggregati (census)
+        self._status_of: Dict[str, SourceStatus] = {}
+        self._status_counts: Counter = Counter()
+        self._type_of: Dict[str, SourceType] = {}
+        self._type_index: Dict[SourceType, List[str]] = {}
+        
+        # Scritture differite
+        self.autosave = autosave
+        self._dirty = False
+        self._batch_depth = 0
+        self._pending: Dict[str, bool] = {}  # slug -> True upsert / False delete
+        
+        # Storage SQLite opzionale
+        self._db: Optional[sqlite3.Connection] = None
+        exists = self.storage_path.exists()
+        if self.storage_path.suffix in SQLITE_SUFFIXES:
+            self._db = sqlite3.connect(str(self.storage_path))
+            self._db.executescript(_SQLITE_SCHEMA)
+            exists = self._db.execute('SELECT 1 FROM sources LIMIT 1').fetchone() is not None
+        
         # Carica fonti esistenti o inizializza defaults
-        if self.storage_path.exists():
+        if exists:
             self._load()
         else:
             self._initialize_defaults()
@@ -140,11 +524,28 @@ class SourceRegistry:
     def _load(self) -> None:
         """Carica registry da file"""
         try:
-            with open(self.storage_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            if self._db is not None:
+                rows = self._db.execute('SELECT slug, json FROM sources ORDER BY rowid')
+                for slug, payload in rows:
+                    data = orjson.loads(payload) if ORJSON_AVAILABLE else json.loads(payload)
+                    self._put_source(SourceConfig.from_dict(data), slug)
+                self.logger.info(f"📂 Caricato registry: {len(self.sources)} fonti")
+                return
             
-            for slug, source_data in data.get('sources', {}).items():
-                self.sources[slug] = SourceConfig.from_dict(source_data)
+            raw = self.storage_path.read_bytes()
+            
+            if SIMDJSON_AVAILABLE:
+                # Documento indicizzato in modo lazy: ogni fonte è convertita
+                # in dict solo al momento di costruire il SourceConfig
+                doc = simdjson.Parser().parse(raw)
+                if 'sources' in doc:
+                    sources = doc['sources']
+                    for slug in sources:
+                        self._put_source(SourceConfig.from_dict(sources[slug].as_dict()), slug)
+            else:
+                data = orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
+                for slug, source_data in data.get('sources', {}).items():
+                    self._put_source(SourceConfig.from_dict(source_data), slug)
             
             self.logger.info(f"📂 Caricato registry: {len(self.sources)} fonti")
         except Exception as e:
@@ -152,236 +553,190 @@ class SourceRegistry:
             self._initialize_defaults()
     
     def save(self) -> None:
-        """Salva registry su file"""
-        data = {
-            'version': '2.0',
-            'updated_at': datetime.now().isoformat(),
-            'sources': {slug: s.to_dict() for slug, s in self.sources.items()}
-        }
+        """
+        Salva registry su file
         
-        with open(self.storage_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        Le fonti sono codificate una alla volta e scritte in streaming (buffer
+        da 64 KB) su un file temporaneo, poi sostituito atomicamente.
+        Con SQLite riscrive tutte le righe in una sola transazione.
+        """
+        if self._db is not None:
+            with self._db:
+                self._db.execute('DELETE FROM sources')
+                self._db.execute('DELETE FROM source_topics')
+                for slug, source in self.sources.items():
+                    self._write_row(slug, source)
+            self._pending.clear()
+            self._dirty = False
+            self.logger.info(f"💾 Registry salvato: {len(self.sources)} fonti")
+            return
         
+        fd, tmp_path = tempfile.mkstemp(dir=self.storage_path.parent, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+                f.write(b'{\n  "version": "2.0",\n  "updated_at": ')
+                f.write(_encode(_now()))
+                f.write(b',\n  "sources": {')
+                sep = b'\n    '
+                for slug, source in self.sources.items():
+                    f.write(sep)
+                    f.write(_encode(slug))
+                    f.write(b': ')
+                    f.write(_encode_source(source))
+                    sep = b',\n    '
+                f.write(b'\n  }\n}\n')
+            os.replace(tmp_path, self.storage_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        
+        self._pending.clear()
+        self._dirty = False
         self.logger.info(f"💾 Registry salvato: {len(self.sources)} fonti")
     
+    def _write_row(self, slug: str, source: SourceConfig) -> None:
+        """Scrive (o sostituisce) la riga SQLite di una fonte"""
+        self._db.execute(
+            'INSERT OR REPLACE INTO sources (slug, name, source_type, status, base_url, json) '
+            'VALUES (?, ?, ?, ?, ?, ?)',
+            (slug, source.name, source.source_type.value, source.status.value,
+             source.base_url, _encode_source(source).decode('utf-8'))
+        )
+        self._db.execute('DELETE FROM source_topics WHERE slug = ?', (slug,))
+        primary = set(source.primary_topics)
+        self._db.executemany(
+            'INSERT INTO source_topics (slug, topic, is_primary) VALUES (?, ?, ?)',
+            [(slug, topic, int(topic in primary))
+             for topic in dict.fromkeys(source.topics + source.primary_topics)]
+        )
+    
+    def flush(self) -> None:
+        """Salva solo se ci sono modifiche CRUD non ancora scritte"""
+        if not self._dirty:
+            return
+        
+        if self._db is None:
+            self.save()
+            return
+        
+        # SQLite: solo le righe toccate, in un'unica transazione
+        with self._db:
+            for slug, upsert in self._pending.items():
+                if upsert and slug in self.sources:
+                    self._write_row(slug, self.sources[slug])
+                else:
+                    self._db.execute('DELETE FROM sources WHERE slug = ?', (slug,))
+                    self._db.execute('DELETE FROM source_topics WHERE slug = ?', (slug,))
+        self._pending.clear()
+        self._dirty = False
+    
+    def _mark_dirty(self, slug: str, upsert: bool = True) -> None:
+        """Registra una modifica e salva subito se non in batch"""
+        self._dirty = True
+        self._pending[slug] = upsert
+        if self.autosave and self._batch_depth == 0:
+            self.flush()
+    
+    @contextmanager
+    def batch(self):
+        """Raggruppa più operazioni CRUD in un solo salvataggio"""
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self.flush()
+    
+    def __enter__(self) -> 'SourceRegistry':
+        self._batch_depth += 1
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self._batch_depth -= 1
+        if self._batch_depth == 0:
+            self.flush()
+    
     def _initialize_defaults(self) -> None:
         """Inizializza fonti di default"""
         
-        default_sources = [
-            # Big 4
-            SourceConfig(
-                name="Deloitte",
-                slug="deloitte",
-                source_type=SourceType.CONSULTING,
-                base_url="https://www2.deloitte.com",
-                entry_points=[
-                    "https://www2.deloitte.com/us/en/insights.html",
-                    "https://www2.deloitte.com/us/en/insights/focus/tech-trends.html",
-                    "https://www2.deloitte.com/us/en/insights/topics/digital-transformation.html"
-                ],
-                topics=["AI", "Cloud", "Cybersecurity", "Digital Transformation", "Data"],
-                primary_topics=["AI", "Digital Transformation"],
-                description="Global consulting firm with Tech Trends annual report"
-            ),
-            SourceConfig(
-                name="PwC",
-                slug="pwc",
-                source_type=SourceType.CONSULTING,
-                base_url="https://www.pwc.com",
-                entry_points=[
-                    "https://www.pwc.com/gx/en/issues.html",
-                    "https://www.pwc.com/gx/en/issues/technology.html"
-                ],
-                topics=["AI", "ESG", "Digital Transformation", "Cybersecurity"],
-                primary_topics=["AI", "ESG"],
-                description="Big 4 firm with CEO Survey and Global Digital Trust"
-            ),
-            SourceConfig(
-                name="KPMG",
-                slug="kpmg",
-                source_type=SourceType.CONSULTING,
-                base_url="https://kpmg.com",
-                entry_points=[
-                    "https://kpmg.com/xx/en/home/insights.html"
-                ],
-                topics=["AI", "ESG", "Cloud", "Digital Transformation"],
-                primary_topics=["Digital Transformation"],
-                description="Big 4 consulting with global insights"
-            ),
-            SourceConfig(
-                name="EY",
-                slug="ey",
-                source_type=SourceType.CONSULTING,
-                base_url="https://www.ey.com",
-                entry_points=[
-                    "https://www.ey.com/en_gl/insights"
-                ],
-                topics=["AI", "ESG", "Digital Transformation"],
-                primary_topics=["ESG"],
-                description="Big 4 firm focused on sustainability"
-            ),
-            
-            # MBB
-            SourceConfig(
-                name="McKinsey",
-                slug="mckinsey",
-                source_type=SourceType.CONSULTING,
-                base_url="https://www.mckinsey.com",
-                entry_points=[
-                    "https://www.mckinsey.com/featured-insights",
-                    "https://www.mckinsey.com/capabilities/mckinsey-digital/our-insights"
-                ],
-                topics=["AI", "Digital Transformation", "Data", "Automation"],
-                primary_topics=["AI", "Digital Transformation"],
-                description="Top strategy consulting with MGI research"
-            ),
-            SourceConfig(
-                name="BCG",
-                slug="bcg",
-                source_type=SourceType.CONSULTING,
-                base_url="https://www.bcg.com",
-                entry_points=[
-                    "https://www.bcg.com/publications"
-                ],
-                topics=["AI", "Digital Transformation", "ESG", "Innovation"],
-                primary_topics=["AI", "Innovation"],
-                description="Strategy consulting with Henderson Institute"
-            ),
-            SourceConfig(
-                name="Bain",
-                slug="bain",
-                source_type=SourceType.CONSULTING,
-                base_url="https://www.bain.com",
-                entry_points=[
-                    "https://www.bain.com/insights/"
-                ],
-                topics=["AI", "Digital Transformation", "Private Equity"],
-                primary_topics=["Digital Transformation"],
-                description="Strategy consulting with sector expertise"
-            ),
-            
-            # Tech Advisory
-            SourceConfig(
-                name="Accenture",
-                slug="accenture",
-                source_type=SourceType.CONSULTING,
-                base_url="https://www.accenture.com",
-                entry_points=[
-                    "https://www.accenture.com/us-en/insights"
-                ],
-                topics=["AI", "Cloud", "Digital Transformation", "Metaverse"],
-                primary_topics=["AI", "Cloud"],
-                description="Tech consulting with Technology Vision report"
-            ),
-            
-            # Research Firms
-            SourceConfig(
-                name="Gartner",
-                slug="gartner",
-                source_type=SourceType.RESEARCH,
-                base_url="https://www.gartner.com",
-                entry_points=[
-                    "https://www.gartner.com/en/articles",
-                    "https://www.gartner.com/en/information-technology/insights"
-                ],
-                topics=["AI", "Cloud", "Cybersecurity", "Data", "IoT"],
-                primary_topics=["AI", "Cloud"],
-                description="IT research with Hype Cycle and Magic Quadrant",
-                requires_javascript=True
-            ),
-            SourceConfig(
-                name="Forrester",
-                slug="forrester",
-                source_type=SourceType.RESEARCH,
-                base_url="https://www.forrester.com",
-                entry_points=[
-                    "https://www.forrester.com/research/"
-                ],
-                topics=["AI", "CX", "Digital Transformation", "Cloud"],
-                primary_topics=["CX", "AI"],
-                description="Technology and market research",
-                requires_javascript=True
-            ),
-            
-            # Think Tanks
-            SourceConfig(
-                name="World Economic Forum",
-                slug="wef",
-                source_type=SourceType.THINK_TANK,
-                base_url="https://www.weforum.org",
-                entry_points=[
-                    "https://www.weforum.org/publications/"
-                ],
-                topics=["AI", "ESG", "Future of Work", "Geopolitics"],
-                primary_topics=["AI", "ESG"],
-                description="Global issues and technology governance"
-            ),
-            SourceConfig(
-                name="Brookings",
-                slug="brookings",
-                source_type=SourceType.THINK_TANK,
-                base_url="https://www.brookings.edu",
-                entry_points=[
-                    "https://www.brookings.edu/topic/technology-innovation/"
-                ],
-                topics=["AI", "Policy", "Digital Transformation"],
-                primary_topics=["AI", "Policy"],
-                description="Policy research on technology"
-            ),
-            
-            # Tech Companies
-            SourceConfig(
-                name="Google AI",
-                slug="google_ai",
-                source_type=SourceType.TECH_COMPANY,
-                base_url="https://ai.google",
-                entry_points=[
-                    "https://ai.google/research/",
-                    "https://blog.google/technology/ai/"
-                ],
-                topics=["AI", "Machine Learning", "Quantum"],
-                primary_topics=["AI"],
-                description="Google AI research and blog"
-            ),
-            SourceConfig(
-                name="Microsoft Research",
-                slug="microsoft_research",
-                source_type=SourceType.TECH_COMPANY,
-                base_url="https://www.microsoft.com",
-                entry_points=[
-                    "https://www.microsoft.com/en-us/research/"
-                ],
-                topics=["AI", "Cloud", "Quantum", "Security"],
-                primary_topics=["AI", "Cloud"],
-                description="Microsoft research publications"
-            ),
-            SourceConfig(
-                name="AWS",
-                slug="aws",
-                source_type=SourceType.TECH_COMPANY,
-                base_url="https://aws.amazon.com",
-                entry_points=[
-                    "https://aws.amazon.com/blogs/",
-                    "https://aws.amazon.com/executive-insights/"
-                ],
-                topics=["Cloud", "AI", "Data", "Security"],
-                primary_topics=["Cloud"],
-                description="AWS whitepapers and blogs"
-            )
-        ]
-        
-        for source in default_sources:
-            self.sources[source.slug] = source
+        # Stesso timestamp per tutte le fonti di default
+        with _frozen_now():
+            for data in _DEFAULT_SOURCE_DICTS:
+                # Liste copiate: le costanti di modulo restano immutate
+                source = SourceConfig.from_dict({**data, 'entry_points': list(data['entry_points'])})
+                self._put_source(source)
         
         self.save()
         self.logger.info(f"✅ Inizializzato registry con {len(self.sources)} fonti default")
     
+    # ==================== Indici ====================
+    
+    def _put_source(self, source: SourceConfig, slug: Optional[str] = None) -> None:
+        """Inserisce (o sostituisce) una fonte aggiornando gli indici"""
+        slug = source.slug if slug is None else slug
+        if slug in self._indexed_topics:
+            self._unindex_source(slug)
+            self.sources[slug]._status_listener = None
+        self.sources[slug] = source
+        self._index_source(slug, source)
+        source._status_listener = partial(self._refresh_status, slug)
+    
+    def _refresh_status(self, slug: str) -> None:
+        """Aggiorna stato indicizzato, conteggi e fonti attive per uno slug"""
+        self._drop_status(slug)
+        status = self.sources[slug].status
+        self._status_of[slug] = status
+        self._status_counts[status] += 1
+        if status == SourceStatus.ACTIVE:
+            self._active[slug] = None
+    
+    def _drop_status(self, slug: str) -> None:
+        """Rimuove lo slug da conteggi per stato e fonti attive"""
+        old = self._status_of.pop(slug, None)
+        if old is not None:
+            self._status_counts[old] -= 1
+        self._active.pop(slug, None)
+    
+    def _index_source(self, slug: str, source: SourceConfig) -> None:
+        """Registra i topics della fonte negli indici inversi"""
+        topics = tuple(dict.fromkeys(source.topics))
+        primary = tuple(dict.fromkeys(source.primary_topics))
+        self._indexed_topics[slug] = (topics, primary)
+        
+        for topic in topics:
+            self._topic_index.setdefault(topic, []).append(slug)
+        for topic in primary:
+            self._primary_topic_index.setdefault(topic, []).append(slug)
+        
+        self._type_of[slug] = source.source_type
+        self._type_index.setdefault(source.source_type, []).append(slug)
+        self._refresh_status(slug)
+    
+    def _unindex_source(self, slug: str) -> None:
+        """Rimuove la fonte dagli indici inversi"""
+        self._drop_status(slug)
+        source_type = self._type_of.pop(slug, None)
+        if source_type is not None:
+            self._type_index[source_type].remove(slug)
+        
+        indexed = self._indexed_topics.pop(slug, None)
+        if indexed is None:
+            return
+        
+        for index, topics in zip((self._topic_index, self._primary_topic_index), indexed):
+            for topic in topics:
+                slugs = index[topic]
+                slugs.remove(slug)
+                if not slugs:
+                    del index[topic]
+    
     # ==================== CRUD Operations ====================
     
     def add_source(self, source: SourceConfig) -> None:
         """Aggiunge nuova fonte"""
-        self.sources[source.slug] = source
-        self.save()
+        self._put_source(source)
+        self._mark_dirty(source.slug)
         self.logger.info(f"✅ Fonte aggiunta: {source.name}")
     
     def get_source(self, slug: str) -> Optional[SourceConfig]:
@@ -391,8 +746,9 @@ class SourceRegistry:
     def remove_source(self, slug: str) -> bool:
         """Rimuove fonte"""
         if slug in self.sources:
-            del self.sources[slug]
-            self.save()
+            self.sources.pop(slug)._status_listener = None
+            self._unindex_source(slug)
+            self._mark_dirty(slug, upsert=False)
             return True
         return False
     
@@ -403,8 +759,11 @@ class SourceRegistry:
             for key, value in kwargs.items():
                 if hasattr(source, key):
                     setattr(source, key, value)
-            source.updated_at = datetime.now().isoformat()
-            self.save()
+            if kwargs.keys() & {'topics', 'primary_topics', 'status', 'source_type'}:
+                self._unindex_source(slug)
+                self._index_source(slug, source)
+            source.touch()
+            self._mark_dirty(slug)
             return True
         return False
     
@@ -412,49 +771,46 @@ class SourceRegistry:
     
     def get_all_active(self) -> List[SourceConfig]:
         """Ottiene tutte le fonti attive"""
-        return [s for s in self.sources.values() if s.status == SourceStatus.ACTIVE]
+        return [self.sources[slug] for slug in self._active]
     
     def get_by_topic(self, topic: str) -> List[SourceConfig]:
         """Ottiene fonti che coprono un topic"""
-        return [s for s in self.sources.values() if topic in s.topics]
+        return [self.sources[slug] for slug in self._topic_index.get(topic, ())]
     
     def get_by_type(self, source_type: SourceType) -> List[SourceConfig]:
         """Ottiene fonti per tipo"""
-        return [s for s in self.sources.values() if s.source_type == source_type]
+        return [self.sources[slug] for slug in self._type_index.get(source_type, ())]
     
     def get_primary_sources_for_topic(self, topic: str) -> List[SourceConfig]:
         """Ottiene fonti dove topic è primario"""
-        return [s for s in self.sources.values() if topic in s.primary_topics]
+        return [self.sources[slug] for slug in self._primary_topic_index.get(topic, ())]
     
     def get_all_topics(self) -> Dict[str, int]:
         """Ottiene tutti i topics con count fonti"""
-        topic_counts = {}
-        for source in self.sources.values():
-            for topic in source.topics:
-                topic_counts[topic] = topic_counts.get(topic, 0) + 1
+        topic_counts = {topic: len(slugs) for topic, slugs in self._topic_index.items()}
         return dict(sorted(topic_counts.items(), key=lambda x: -x[1]))
     
     def get_census(self) -> Dict:
-        """Ottiene censimento completo"""
+        """Ottiene censimento completo (conteggi dagli indici per stato/tipo)"""
+        status_counts = self._status_counts
+        sources = []
+        
+        for s in self.sources.values():
+            sources.append({
+                'name': s.name,
+                'slug': s.slug,
+                'type': s.source_type.value,
+                'status': s.status.value,
+                'topics': s.topics,
+                'report_count': s.report_count
+            })
+        
         return {
             'total_sources': len(self.sources),
-            'active': len([s for s in self.sources.values() if s.status == SourceStatus.ACTIVE]),
-            'pending': len([s for s in self.sources.values() if s.status == SourceStatus.PENDING]),
-            'error': len([s for s in self.sources.values() if s.status == SourceStatus.ERROR]),
-            'by_type': {
-                t.value: len([s for s in self.sources.values() if s.source_type == t])
-                for t in SourceType
-            },
+            'active': status_counts[SourceStatus.ACTIVE],
+            'pending': status_counts[SourceStatus.PENDING],
+            'error': status_counts[SourceStatus.ERROR],
+            'by_type': {t.value: len(self._type_index.get(t, ())) for t in SourceType},
             'topics': self.get_all_topics(),
-            'sources': [
-                {
-                    'name': s.name,
-                    'slug': s.slug,
-                    'type': s.source_type.value,
-                    'status': s.status.value,
-                    'topics': s.topics,
-                    'report_count': s.report_count
-                }
-                for s in self.sources.values()
-            ]
+            'sources': sources
         }
@@ -1,10 +1,48 @@
 """Test Selenium per Deloitte"""
+import sys
+from pathlib import Path
+
 from selenium import webdriver
+from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
 from webdriver_manager.chrome import ChromeDriverManager
-import time
+
+DEFAULT_URLS = ['https://www2.deloitte.com/it/it/pages/technology/topics/insights.html']
+INSIGHT_LINKS = 'a[href*="/insights/"]'
+
+# Raccoglie tutte le metriche della pagina lato browser
+PAGE_STATS_JS = """
+const titles = document.querySelectorAll('h3, h4');
+return {
+    html: document.documentElement.outerHTML.length,
+    promo: document.querySelectorAll('div.promo').length,
+    insights: document.querySelectorAll(arguments[0]).length,
+    titles: titles.length,
+    top_titles: Array.from(titles).slice(0, 10)
+        .map(e => e.innerText.trim()).filter(Boolean),
+};
+"""
+
+# Percorso del chromedriver salvato: evita il controllo di rete a ogni avvio
+DRIVER_PATH_CACHE = Path.home() / '.cache' / 'webdriver' / 'chromedriver_path'
+
+
+def chromedriver_path() -> str:
+    """Ritorna il chromedriver installato, scaricandolo solo la prima volta"""
+    if DRIVER_PATH_CACHE.exists():
+        cached = DRIVER_PATH_CACHE.read_text().strip()
+        if Path(cached).exists():
+            return cached
+
+    path = ChromeDriverManager().install()
+    DRIVER_PATH_CACHE.parent.mkdir(parents=True, exist_ok=True)
+    DRIVER_PATH_CACHE.write_text(path)
+    return path
+
 
 opts = Options()
 opts.add_argument('--headless')
@@ -12,32 +50,35 @@ opts.add_argument('--no-sandbox')
 opts.add_argument('--disable-gpu')
 opts.add_argument('--disable-dev-shm-usage')
 
+urls = sys.argv[1:] or DEFAULT_URLS
+
 print("Avvio Chrome...")
-service = Service(ChromeDriverManager().install())
+service = Service(chromedriver_path())
 driver = webdriver.Chrome(service=service, options=opts)
 
-print("Carico pagina Deloitte...")
-driver.get('https://www2.deloitte.com/it/it/pages/technology/topics/insights.html')
-time.sleep(5)
-
-html = driver.page_source
-print(f'HTML: {len(html)} bytes')
-
-# Cerca elementi promo
-promo_els = driver.find_elements(By.CSS_SELECTOR, 'div.promo')
-print(f'div.promo: {len(promo_els)}')
+try:
+    # Un solo driver per tutte le pagine
+    for url in urls:
+        print(f"Carico pagina {url}...")
+        driver.get(url)
 
-# Cerca link insights
-cards = driver.find_elements(By.CSS_SELECTOR, 'a[href*="/insights/"]')
-print(f'Link insights: {len(cards)}')
+        # Attende i link insights invece di una pausa fissa
+        try:
+            WebDriverWait(driver, 10).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, INSIGHT_LINKS))
+            )
+        except TimeoutException:
+            print('Nessun link insights entro 10s')
 
-# Trova tutti i titoli h3/h4
-titles = driver.find_elements(By.CSS_SELECTOR, 'h3, h4')
-print(f'Titoli h3/h4: {len(titles)}')
-for t in titles[:10]:
-    txt = t.text.strip()
-    if txt:
-        print(f'  - {txt[:60]}')
+        # Conteggi e titoli in un solo round-trip verso il browser
+        stats = driver.execute_script(PAGE_STATS_JS, INSIGHT_LINKS)
+        print(f"HTML: {stats['html']} bytes")
+        print(f"div.promo: {stats['promo']}")
+        print(f"Link insights: {stats['insights']}")
+        print(f"Titoli h3/h4: {stats['titles']}")
+        for txt in stats['top_titles']:
+            print(f'  - {txt[:60]}')
+finally:
+    driver.quit()
 
-driver.quit()
 print("Test completato!")
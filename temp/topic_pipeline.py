@@ -7,14 +7,19 @@ Autore: Senior Python Developer
 Data: 23 Dicembre 2025
 """
 
+import os
+import re
+import copy
 import json
-import schedule
-import time
-from typing import Dict, List, Optional, Callable
+import tempfile
+from typing import Dict, List, Optional, Callable, Set, Tuple
 from datetime import datetime, timedelta
 from pathlib import Path
 from dataclasses import dataclass, field
-from threading import Thread
+from threading import Thread, Semaphore, Lock, Event
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from itertools import islice
+from urllib.parse import urlparse
 import hashlib
 
 from source_registry import SourceRegistry, SourceConfig, SourceStatus
@@ -22,30 +27,200 @@ from site_graph import SiteGraphRegistry, SiteGraph, NodeType
 from route_discovery import RouteDiscovery
 from document_manager import DocumentManager
 from document_parser import DocumentParser
-from ai_analyzer import AIAnalyzer, KeywordAnalyzer
+from ai_analyzer import AIAnalyzer, KeywordAnalyzer, MAX_BATCH_DOCS
 from story_builder import StoryBuilder
 import utils
 
+# Import opzionale di orjson per save/load più rapidi di topics_data.json
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
-@dataclass
+# Download di documenti in parallelo (IO-bound)
+DOWNLOAD_WORKERS = 16
+
+# Download simultanei massimi verso lo stesso host
+MAX_DOWNLOADS_PER_HOST = 4
+
+# Fonti scansionate in parallelo in discover_sources
+DISCOVERY_WORKERS = 8
+
+# Documenti per singola chiamata AI in analyze_reports (limite token di output)
+AI_BATCH_SIZE = MAX_BATCH_DOCS
+
+# Testo totale (caratteri) sotto cui l'analisi keyword resta seriale: la scansione
+# costa ~16 ms per milione di caratteri, avvio del pool e invio testi 15-40 ms
+KEYWORD_POOL_MIN_CHARS = 5_000_000
+
+# KeywordAnalyzer del processo worker (creato dall'initializer del pool)
+_worker_keyword_analyzer: Optional[KeywordAnalyzer] = None
+
+
+def _init_keyword_worker() -> None:
+    global _worker_keyword_analyzer
+    _worker_keyword_analyzer = KeywordAnalyzer()
+
+
+def _keyword_analyze(parsed: Dict) -> Dict:
+    """Analisi keyword eseguita in un processo worker"""
+    return _worker_keyword_analyzer.analyze_document(parsed)
+
+
+def _read_json(filepath: Path):
+    """Legge un file JSON (orjson se disponibile)"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(filepath.read_bytes())
+    with open(filepath, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _write_json(filepath: Path, data, indent: bool = False) -> None:
+    """
+    Scrive un file JSON in modo atomico (orjson se disponibile)
+    
+    Il file temporaneo è sincronizzato su disco prima di os.replace: dopo un
+    crash resta la versione vecchia o quella nuova, mai un file troncato.
+    Compatto di default; indent=True per un file leggibile.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=filepath.parent, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            if ORJSON_AVAILABLE:
+                f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else 0))
+            else:
+                f.write(json.dumps(data, indent=2 if indent else None,
+                                   ensure_ascii=False).encode('utf-8'))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def _topic_filename(name: str) -> str:
+    """Nome file sicuro e univoco per un topic (es. 'AI/ML' -> 'AI_ML_<hash>.json')"""
+    safe = re.sub(r'[^\w\-]+', '_', name).strip('_') or 'topic'
+    digest = hashlib.sha1(name.encode('utf-8')).hexdigest()[:8]
+    return f"{safe[:60]}_{digest}.json"
+
+
+def _json_sha256(data) -> str:
+    """Hash SHA-256 della serializzazione JSON (chiavi ordinate) di un valore"""
+    if ORJSON_AVAILABLE:
+        payload = orjson.dumps(data, option=orjson.OPT_SORT_KEYS)
+    else:
+        payload = json.dumps(data, sort_keys=True, ensure_ascii=False).encode('utf-8')
+    return hashlib.sha256(payload).hexdigest()
+
+
+def _file_sha256(filepath: str) -> str:
+    """Hash SHA-256 del contenuto di un file"""
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+# Campi di report e insights, salvati in colonne (una lista per campo)
+_REPORT_FIELDS = ('title', 'url', 'source', 'summary', 'analyzed_at')
+_INSIGHT_FIELDS = ('text', 'source', 'report', 'confidence')
+
+
+def _empty_columns(names: Tuple[str, ...]) -> Dict[str, List[str]]:
+    return {name: [] for name in names}
+
+
+def _to_columns(rows, names: Tuple[str, ...]) -> Dict[str, List[str]]:
+    """Colonne da righe (formato a lista di dict) o da colonne già pronte"""
+    if isinstance(rows, dict):
+        return {name: list(rows.get(name, ())) for name in names}
+    return {name: [row.get(name, '') for row in rows] for name in names}
+
+
+def _to_rows(columns: Dict[str, List[str]], names: Tuple[str, ...]) -> List[Dict]:
+    return [dict(zip(names, values)) for values in zip(*(columns[n] for n in names))]
+
+
+@dataclass(slots=True)
 class TopicData:
     """Dati aggregati per un singolo topic"""
     name: str
     sources: List[str] = field(default_factory=list)      # Fonti che coprono questo topic
-    reports: List[Dict] = field(default_factory=list)     # Report recenti
-    insights: List[Dict] = field(default_factory=list)    # Insights estratti
     narrative: str = ""                                    # Narrative aggregata
     last_updated: str = ""
+    narrative_input_hash: str = ""                         # Hash degli input della narrative
+    
+    # Report recenti e insights estratti in colonne: niente dict per elemento
+    report_columns: Dict[str, List[str]] = field(
+        default_factory=lambda: _empty_columns(_REPORT_FIELDS))
+    insight_columns: Dict[str, List[str]] = field(
+        default_factory=lambda: _empty_columns(_INSIGHT_FIELDS))
+    
+    # Insiemi per i controlli di duplicato (non serializzati)
+    _report_urls: Set[str] = field(default_factory=set, init=False, repr=False, compare=False)
+    _source_set: Set[str] = field(default_factory=set, init=False, repr=False, compare=False)
+    _insight_keys: Set[Tuple[str, str, str]] = field(default_factory=set, init=False,
+                                                      repr=False, compare=False)
+    
+    def __post_init__(self):
+        self._report_urls = {url for url in self.report_columns['url'] if url}
+        self._source_set = set(self.sources)
+        insights = self.insight_columns
+        self._insight_keys = set(zip(insights['source'], insights['report'], insights['text']))
+    
+    @property
+    def reports(self) -> List[Dict]:
+        """Report come lista di dict (costruita a ogni accesso)"""
+        return _to_rows(self.report_columns, _REPORT_FIELDS)
+    
+    @property
+    def insights(self) -> List[Dict]:
+        """Insights come lista di dict (costruita a ogni accesso)"""
+        return _to_rows(self.insight_columns, _INSIGHT_FIELDS)
+    
+    @property
+    def report_count(self) -> int:
+        return len(self.report_columns['url'])
+    
+    @property
+    def insight_count(self) -> int:
+        return len(self.insight_columns['text'])
+    
+    def add_report(self, **values: str) -> None:
+        for name in _REPORT_FIELDS:
+            self.report_columns[name].append(values.get(name, ''))
+    
+    def add_insight(self, **values: str) -> None:
+        for name in _INSIGHT_FIELDS:
+            self.insight_columns[name].append(values.get(name, ''))
     
     def to_dict(self) -> Dict:
         return {
             'name': self.name,
             'sources': self.sources,
-            'reports': self.reports,
-            'insights': self.insights,
+            'reports': self.report_columns,
+            'insights': self.insight_columns,
             'narrative': self.narrative,
-            'last_updated': self.last_updated
+            'last_updated': self.last_updated,
+            'narrative_input_hash': self.narrative_input_hash
         }
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'TopicData':
+        # Accetta sia il formato a colonne sia il vecchio formato a lista di dict
+        return cls(
+            name=data['name'],
+            sources=data.get('sources', []),
+            narrative=data.get('narrative', ''),
+            last_updated=data.get('last_updated', ''),
+            narrative_input_hash=data.get('narrative_input_hash', ''),
+            report_columns=_to_columns(data.get('reports', ()), _REPORT_FIELDS),
+            insight_columns=_to_columns(data.get('insights', ()), _INSIGHT_FIELDS)
+        )
 
 
 class TopicPipeline:
@@ -60,18 +235,28 @@ class TopicPipeline:
     def __init__(self, 
                  storage_dir: str = None,
                  ai_provider: str = None,
-                 ai_api_key: str = None):
+                 ai_api_key: str = None,
+                 narrative_workers: int = 4,
+                 analysis_workers: int = 4,
+                 debug: bool = False):
         """
         Args:
             storage_dir: Directory per storage dati
             ai_provider: 'openai' o 'anthropic' (opzionale)
             ai_api_key: API key per AI
+            narrative_workers: Narrative generate in parallelo (1 = sequenziale),
+                da adattare ai rate limit del provider AI
+            analysis_workers: Chiamate AI di analisi in parallelo (1 = sequenziale)
+            debug: Se True salva i JSON indentati (leggibili a mano)
         """
         if storage_dir is None:
             storage_dir = Path(__file__).parent / 'data'
         
         self.storage_dir = Path(storage_dir)
         self.storage_dir.mkdir(parents=True, exist_ok=True)
+        self.debug = debug
+        
+        self.logger = utils.logger
         
         # Inizializza componenti
         self.source_registry = SourceRegistry(str(self.storage_dir / 'sources.json'))
@@ -94,48 +279,108 @@ class TopicPipeline:
         self.keyword_analyzer = KeywordAnalyzer()
         
         self.story_builder = StoryBuilder(self.ai_analyzer)
+        if narrative_workers < 1 or analysis_workers < 1:
+            raise ValueError("narrative_workers e analysis_workers devono essere almeno 1")
+        self.narrative_workers = narrative_workers
+        self.analysis_workers = analysis_workers
         
-        # Topic data storage
+        # Topic data storage: un file per topic, riscritto solo se modificato
         self.topics_data: Dict[str, TopicData] = {}
+        self._topics_dir = self.storage_dir / 'topics'
+        self._dirty_topics: Set[str] = set()
+        self._topics_index_dirty = False  # elenco (e ordine) dei topic cambiato
         self._load_topics_data()
         
-        self.logger = utils.logger
+        # Cache delle analisi per hash del contenuto: hash -> analisi
+        self._analysis_cache_path = self.storage_dir / 'analysis_cache.json'
+        self._analysis_cache: Dict[str, Dict] = self._load_json_cache(self._analysis_cache_path)
+        
+        # Hash già calcolati: path -> [mtime_ns, size, sha256], file invariati non vengono riletti
+        self._digest_index_path = self.storage_dir / 'analysis_digests.json'
+        self._digest_by_path: Dict[str, List] = self._load_json_cache(self._digest_index_path)
+        self._digest_index_dirty = False
         
         # State
         self.is_running = False
         self._scheduler_thread = None
+        self._stop_event = Event()
+        
+        # Semafori per host: un dominio lento non occupa tutti i worker
+        self._host_slots: Dict[str, Semaphore] = {}
+        self._host_slots_lock = Lock()
     
     def _load_topics_data(self) -> None:
-        """Carica dati topics esistenti"""
-        topics_file = self.storage_dir / 'topics_data.json'
-        
-        if topics_file.exists():
-            try:
-                with open(topics_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+        """Carica dati topics esistenti (un file per topic, o il vecchio file unico)"""
+        index_file = self._topics_dir / 'index.json'
+        legacy_file = self.storage_dir / 'topics_data.json'
+        
+        try:
+            if index_file.exists():
+                for topic_name in _read_json(index_file):
+                    topic_file = self._topics_dir / _topic_filename(topic_name)
+                    self.topics_data[topic_name] = TopicData.from_dict(_read_json(topic_file))
+            elif legacy_file.exists():
+                for topic_name, topic_data in _read_json(legacy_file).items():
+                    self.topics_data[topic_name] = TopicData.from_dict(topic_data)
                 
-                for topic_name, topic_data in data.items():
-                    self.topics_data[topic_name] = TopicData(
-                        name=topic_data['name'],
-                        sources=topic_data.get('sources', []),
-                        reports=topic_data.get('reports', []),
-                        insights=topic_data.get('insights', []),
-                        narrative=topic_data.get('narrative', ''),
-                        last_updated=topic_data.get('last_updated', '')
-                    )
-                
-                self.logger.info(f"📂 Caricati {len(self.topics_data)} topics")
-            except Exception as e:
-                self.logger.error(f"❌ Errore caricamento topics: {e}")
+                # Migrazione: al prossimo salvataggio scrive tutti i file per topic
+                self._dirty_topics.update(self.topics_data)
+                self._topics_index_dirty = True
+            else:
+                return
+            
+            self.logger.info(f"📂 Caricati {len(self.topics_data)} topics")
+        except Exception as e:
+            self.logger.error(f"❌ Errore caricamento topics: {e}")
     
     def _save_topics_data(self) -> None:
-        """Salva dati topics"""
-        topics_file = self.storage_dir / 'topics_data.json'
+        """Salva solo i topics modificati (scrittura atomica per file)"""
+        if not self._dirty_topics and not self._topics_index_dirty:
+            return
+        
+        self._topics_dir.mkdir(exist_ok=True)
+        
+        for name in self._dirty_topics:
+            _write_json(self._topics_dir / _topic_filename(name),
+                        self.topics_data[name].to_dict(), indent=self.debug)
         
-        data = {name: td.to_dict() for name, td in self.topics_data.items()}
+        # Indice scritto dopo i file: non punta mai a topic non ancora salvati
+        if self._topics_index_dirty:
+            _write_json(self._topics_dir / 'index.json', list(self.topics_data), indent=self.debug)
         
-        with open(topics_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        self._dirty_topics.clear()
+        self._topics_index_dirty = False
+    
+    def _load_json_cache(self, filepath: Path) -> Dict:
+        """Carica un file di cache JSON (vuoto se assente o illeggibile)"""
+        if filepath.exists():
+            try:
+                return _read_json(filepath)
+            except Exception as e:
+                self.logger.error(f"❌ Errore caricamento cache {filepath.name}: {e}")
+        return {}
+    
+    def _file_digest(self, local_path: str) -> str:
+        """SHA-256 del file, ricalcolato solo se path, mtime o dimensione cambiano"""
+        st = os.stat(local_path)
+        
+        entry = self._digest_by_path.get(local_path)
+        if entry is not None and entry[0] == st.st_mtime_ns and entry[1] == st.st_size:
+            return entry[2]
+        
+        digest = _file_sha256(local_path)
+        self._digest_by_path[local_path] = [st.st_mtime_ns, st.st_size, digest]
+        self._digest_index_dirty = True
+        return digest
+    
+    def _analysis_key(self, local_path: str) -> Optional[str]:
+        """Chiave di cache: analizzatore usato + hash del contenuto del file"""
+        try:
+            digest = self._file_digest(local_path)
+        except OSError:
+            return None
+        mode = 'ai' if self.ai_analyzer else 'keywords'
+        return f"{mode}:{digest}"
     
     # ==================== Core Pipeline Steps ====================
     
@@ -158,23 +403,36 @@ class TopicPipeline:
             sources = [self.source_registry.get_source(s) for s in source_slugs]
             sources = [s for s in sources if s]
         
-        for source in sources:
-            self.logger.info(f"\n🔍 Scanning: {source.name}")
-            
+        if not sources:
+            self.source_registry.save()
+            return
+        
+        # Quick scan degli entry points in parallelo (crawl IO-bound indipendenti)
+        with ThreadPoolExecutor(max_workers=min(DISCOVERY_WORKERS, len(sources))) as executor:
+            futures = []
+            for source in sources:
+                existing = self.graph_registry.get_graph(source.slug)
+                futures.append((source, existing,
+                                executor.submit(self._scan_source, source, existing)))
+        
+        # Registry e fonti aggiornati qui, nell'ordine originale: niente lock
+        for source, existing, future in futures:
             try:
-                # Quick scan degli entry points
-                graph = self.route_discovery.quick_scan(
-                    site_name=source.slug,
-                    urls=source.entry_points
-                )
+                graph, etags, last_modified = future.result()
                 
-                # Salva grafo
-                self.graph_registry.graphs[source.slug] = graph
-                self.graph_registry.save_graph(source.slug)
+                # Salva grafo (solo se la scansione ne ha prodotto uno nuovo)
+                if graph is not existing:
+                    self.graph_registry.add_graph(source.slug, graph)
+                    self.graph_registry.save_graph(source.slug)
+                
+                # Validatori aggiornati solo a grafo salvato: se il salvataggio
+                # fallisce la prossima scansione non riceve 304 e lo ricostruisce
+                source.entry_etags = etags
+                source.entry_last_modified = last_modified
                 
                 # Aggiorna source
                 source.last_scan = datetime.now().isoformat()
-                source.report_count = len(graph.find_reports())
+                source.report_count = graph.report_count
                 source.mark_success()
                 
                 self.logger.info(f"  ✅ Trovati {source.report_count} report nodes")
@@ -185,6 +443,18 @@ class TopicPipeline:
         
         self.source_registry.save()
     
+    def _scan_source(self, source: SourceConfig,
+                     existing: Optional[SiteGraph]) -> Tuple[SiteGraph, Dict[str, str], Dict[str, str]]:
+        """Quick scan di una fonte (eseguita nei worker): grafo e validatori HTTP"""
+        self.logger.info(f"\n🔍 Scanning: {source.name}")
+        return self.route_discovery.quick_scan(
+            site_name=source.slug,
+            urls=source.entry_points,
+            existing_graph=existing,
+            etags=source.entry_etags,
+            last_modified=source.entry_last_modified
+        )
+    
     def fetch_reports(self, topic: str = None, max_per_source: int = 5) -> List[Dict]:
         """
         Step 2: Scarica report dalle fonti
@@ -202,6 +472,7 @@ class TopicPipeline:
         self.logger.info(f"{'='*80}\n")
         
         all_reports = []
+        to_download = []
         
         # Ottieni fonti per topic
         if topic:
@@ -221,12 +492,12 @@ class TopicPipeline:
             
             # Filtra report per topic se specificato
             if topic:
-                report_nodes = graph.find_reports_by_topic(topic)
+                report_nodes = graph.iter_reports_by_topic(topic)
             else:
-                report_nodes = graph.find_reports()
+                report_nodes = graph.iter_reports()
             
-            # Limita
-            report_nodes = report_nodes[:max_per_source]
+            # Limita (solo i primi max_per_source nodi vengono materializzati)
+            report_nodes = list(islice(report_nodes, max_per_source))
             
             self.logger.info(f"  📊 {len(report_nodes)} report da scaricare")
             
@@ -241,17 +512,42 @@ class TopicPipeline:
                     'discovered_at': node.discovered_at
                 }
                 
-                # Scarica documento se disponibile
+                # Documento da scaricare se disponibile
                 if node.document_url:
-                    filepath = self.document_manager.download_document(report_info)
-                    report_info['local_path'] = filepath
+                    to_download.append(report_info)
                 
                 all_reports.append(report_info)
         
+        self._download_documents(to_download)
+        
         self.logger.info(f"\n✅ Totale report: {len(all_reports)}")
         
         return all_reports
     
+    def _download_documents(self, reports: List[Dict]) -> None:
+        """Scarica i documenti in parallelo, impostando 'local_path' su ogni report"""
+        if not reports:
+            return
+        
+        with ThreadPoolExecutor(max_workers=min(DOWNLOAD_WORKERS, len(reports))) as executor:
+            futures = [(report, executor.submit(self._download_document, report))
+                       for report in reports]
+        
+        for report, future in futures:
+            report['local_path'] = future.result()
+    
+    def _download_document(self, report: Dict) -> Optional[str]:
+        """Scarica un documento rispettando il limite di download per host"""
+        host = urlparse(report['document_url']).netloc
+        
+        with self._host_slots_lock:
+            slots = self._host_slots.get(host)
+            if slots is None:
+                slots = self._host_slots[host] = Semaphore(MAX_DOWNLOADS_PER_HOST)
+        
+        with slots:
+            return self.document_manager.download_document(report)
+    
     def analyze_reports(self, reports: List[Dict]) -> List[Dict]:
         """
         Step 3: Analizza report scaricati
@@ -267,7 +563,9 @@ class TopicPipeline:
         self.logger.info(f"   Documents: {len(reports)}")
         self.logger.info(f"{'='*80}\n")
         
-        analyses = []
+        # Analisi per report, nello stesso ordine di reports
+        results: List[Tuple[Dict, Optional[Dict]]] = []
+        pending = []  # (posizione, chiave di cache, documento parsato)
         
         for report in reports:
             local_path = report.get('local_path')
@@ -278,18 +576,39 @@ class TopicPipeline:
             
             self.logger.info(f"  📄 Analyzing: {report['title'][:60]}")
             
+            # Documento già analizzato con lo stesso contenuto: niente parse né analisi
+            cache_key = self._analysis_key(local_path)
+            cached = self._analysis_cache.get(cache_key) if cache_key else None
+            
+            if cached is not None:
+                results.append((report, copy.deepcopy(cached)))
+                continue
+            
             # Parse documento
             parsed = self.document_parser.parse_document(local_path)
             
             if not parsed:
                 continue
             
-            # Analizza con AI o keywords
-            if self.ai_analyzer:
-                analysis = self.ai_analyzer.analyze_document(parsed)
-            else:
-                analysis = self.keyword_analyzer.analyze_document(parsed)
-            
+            pending.append((len(results), cache_key, parsed))
+            results.append((report, None))
+        
+        # Analizza con AI (a gruppi, una chiamata per gruppo) o keywords
+        if self.ai_analyzer:
+            new_analyses = self._ai_analyze_all([parsed for _, _, parsed in pending])
+        else:
+            new_analyses = self._keyword_analyze_all([parsed for _, _, parsed in pending])
+        
+        cache_updated = False
+        for (pos, cache_key, _), analysis in zip(pending, new_analyses):
+            results[pos] = (results[pos][0], analysis)
+            if analysis and cache_key:
+                self._analysis_cache[cache_key] = copy.deepcopy(analysis)
+                cache_updated = True
+        
+        analyses = []
+        
+        for report, analysis in results:
             if analysis:
                 # Aggiungi metadata del report
                 analysis['source'] = report['source']
@@ -300,10 +619,41 @@ class TopicPipeline:
                 
                 analyses.append(analysis)
         
+        if cache_updated:
+            _write_json(self._analysis_cache_path, self._analysis_cache, indent=self.debug)
+        
+        if self._digest_index_dirty:
+            _write_json(self._digest_index_path, self._digest_by_path, indent=self.debug)
+            self._digest_index_dirty = False
+        
         self.logger.info(f"\n✅ Analizzati: {len(analyses)} documenti")
         
         return analyses
     
+    def _ai_analyze_all(self, parsed_docs: List[Dict]) -> List[Dict]:
+        """Analisi AI a gruppi, con più gruppi in volo insieme (ordine preservato)"""
+        chunks = [parsed_docs[start:start + AI_BATCH_SIZE]
+                  for start in range(0, len(parsed_docs), AI_BATCH_SIZE)]
+        
+        if len(chunks) < 2 or self.analysis_workers == 1:
+            batches = [self.ai_analyzer.analyze_documents_batch(chunk) for chunk in chunks]
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.analysis_workers, len(chunks))) as executor:
+                batches = list(executor.map(self.ai_analyzer.analyze_documents_batch, chunks))
+        
+        return [analysis for batch in batches for analysis in batch]
+    
+    def _keyword_analyze_all(self, parsed_docs: List[Dict]) -> List[Dict]:
+        """Analisi keyword di più documenti, su più core se sono abbastanza"""
+        total_chars = sum(len(parsed.get('text', '')) for parsed in parsed_docs)
+        
+        if (os.cpu_count() or 1) < 2 or total_chars < KEYWORD_POOL_MIN_CHARS:
+            return [self.keyword_analyzer.analyze_document(parsed) for parsed in parsed_docs]
+        
+        # Pool limitato a questa chiamata: nessun processo worker resta attivo
+        with ProcessPoolExecutor(initializer=_init_keyword_worker) as pool:
+            return list(pool.map(_keyword_analyze, parsed_docs, chunksize=4))
+    
     def aggregate_by_topic(self, analyses: List[Dict]) -> Dict[str, TopicData]:
         """
         Step 4: Aggrega analisi per topic
@@ -329,41 +679,50 @@ class TopicPipeline:
             for topic in topics:
                 if topic not in self.topics_data:
                     self.topics_data[topic] = TopicData(name=topic)
+                    self._topics_index_dirty = True
                 
                 td = self.topics_data[topic]
+                self._dirty_topics.add(topic)
                 
                 # Aggiungi source se non presente
                 source_slug = analysis.get('source_slug', '')
-                if source_slug and source_slug not in td.sources:
+                if source_slug and source_slug not in td._source_set:
+                    td._source_set.add(source_slug)
                     td.sources.append(source_slug)
                 
                 # Aggiungi report (evita duplicati per URL)
                 report_url = analysis.get('report_url', '')
-                existing_urls = [r.get('url') for r in td.reports]
                 
-                if report_url and report_url not in existing_urls:
-                    td.reports.append({
-                        'title': analysis.get('report_title', ''),
-                        'url': report_url,
-                        'source': analysis.get('source', ''),
-                        'summary': analysis.get('summary', '')[:300],
-                        'analyzed_at': analysis.get('analyzed_at', '')
-                    })
+                if report_url and report_url not in td._report_urls:
+                    td._report_urls.add(report_url)
+                    td.add_report(
+                        title=analysis.get('report_title', ''),
+                        url=report_url,
+                        source=analysis.get('source', ''),
+                        summary=analysis.get('summary', '')[:300],
+                        analyzed_at=analysis.get('analyzed_at', '')
+                    )
                 
-                # Aggiungi insights
+                # Aggiungi insights (evita duplicati per fonte, report e testo)
+                source = analysis.get('source', '')
+                report_title = analysis.get('report_title', '')
                 for insight in analysis.get('key_insights', []):
-                    td.insights.append({
-                        'text': insight,
-                        'source': analysis.get('source', ''),
-                        'report': analysis.get('report_title', ''),
-                        'confidence': analysis.get('confidence', 'medium')
-                    })
+                    key = (source, report_title, insight)
+                    if key in td._insight_keys:
+                        continue
+                    td._insight_keys.add(key)
+                    td.add_insight(
+                        text=insight,
+                        source=source,
+                        report=report_title,
+                        confidence=analysis.get('confidence', 'medium')
+                    )
                 
                 td.last_updated = datetime.now().isoformat()
         
         # Log risultati
         for topic, data in self.topics_data.items():
-            self.logger.info(f"  📌 {topic}: {len(data.reports)} reports, {len(data.insights)} insights")
+            self.logger.info(f"  📌 {topic}: {data.report_count} reports, {data.insight_count} insights")
         
         self._save_topics_data()
         
@@ -377,29 +736,60 @@ class TopicPipeline:
         self.logger.info(f"📖 STEP 5: GENERATING NARRATIVES")
         self.logger.info(f"{'='*80}\n")
         
+        tasks = []
+        
         for topic, data in self.topics_data.items():
-            if not data.insights:
+            if not data.insight_count:
                 continue
             
-            self.logger.info(f"  📝 Generating narrative for: {topic}")
+            # Insights raggruppati per titolo del report in una sola passata
+            insights_by_report: Dict[str, List[str]] = {}
+            insights = data.insight_columns
+            for report_title, text in zip(insights['report'], insights['text']):
+                insights_by_report.setdefault(report_title, []).append(text)
             
             # Prepara analisi per story builder
             fake_analyses = []
-            for report in data.reports:
+            reports = data.report_columns
+            for title, summary in zip(reports['title'], reports['summary']):
                 fake_analyses.append({
-                    'summary': report.get('summary', ''),
-                    'key_insights': [i['text'] for i in data.insights if i.get('report') == report.get('title')],
-                    'source_document': report.get('title', ''),
+                    'summary': summary,
+                    'key_insights': insights_by_report.get(title, []),
+                    'source_document': title,
                     'confidence': 'medium'
                 })
             
-            if fake_analyses:
-                story = self.story_builder._build_topic_story(topic, fake_analyses)
-                data.narrative = story.get('narrative', '')
+            if not fake_analyses:
+                continue
+            
+            # Input invariati dall'ultima narrative: niente nuova generazione
+            mode = 'ai' if self.ai_analyzer else 'keywords'
+            input_hash = _json_sha256([mode, fake_analyses])
+            if data.narrative and input_hash == data.narrative_input_hash:
+                continue
+            
+            tasks.append((topic, fake_analyses, input_hash))
+        
+        # Una chiamata (eventualmente AI, IO-bound) per topic: in parallelo
+        if tasks:
+            with ThreadPoolExecutor(max_workers=min(self.narrative_workers, len(tasks))) as executor:
+                stories = executor.map(lambda task: self._build_narrative(*task[:2]), tasks)
+                for (topic, _, input_hash), story in zip(tasks, stories):
+                    data = self.topics_data[topic]
+                    narrative = story.get('narrative', '')
+                    if narrative != data.narrative or input_hash != data.narrative_input_hash:
+                        data.narrative = narrative
+                        data.narrative_input_hash = input_hash
+                        self._dirty_topics.add(topic)
         
         self._save_topics_data()
         self.logger.info(f"\n✅ Narrative generate per {len(self.topics_data)} topics")
     
+    def _build_narrative(self, topic: str, analyses: List[Dict]) -> Dict:
+        """Costruisce la story di un topic (eseguita nei worker)"""
+        self.logger.info(f"  📝 Generating narrative for: {topic}")
+        return self.story_builder._build_topic_story(topic, analyses)
+    
     # ==================== Full Pipeline ====================
     
     def run_full_pipeline(self, topics: List[str] = None) -> Dict[str, TopicData]:
@@ -461,22 +851,25 @@ class TopicPipeline:
             interval_hours: Intervallo tra aggiornamenti
         """
         self.is_running = True
-        
-        schedule.every(interval_hours).hours.do(self.run_full_pipeline)
+        self._stop_event.clear()
         
         self.logger.info(f"⏰ Scheduler avviato: ogni {interval_hours} ore")
         
+        # Attesa interrompibile fino alla prossima esecuzione (niente polling)
         def run_scheduler():
-            while self.is_running:
-                schedule.run_pending()
-                time.sleep(60)
+            while not self._stop_event.wait(interval_hours * 3600):
+                self.run_full_pipeline()
         
         self._scheduler_thread = Thread(target=run_scheduler, daemon=True)
         self._scheduler_thread.start()
     
     def stop_scheduler(self) -> None:
-        """Ferma scheduler"""
+        """Ferma scheduler (attende la fine di un'eventuale esecuzione in corso)"""
         self.is_running = False
+        self._stop_event.set()
+        if self._scheduler_thread is not None:
+            self._scheduler_thread.join()
+            self._scheduler_thread = None
         self.logger.info("⏹️ Scheduler fermato")
     
     # ==================== Getters ====================
@@ -496,14 +889,14 @@ class TopicPipeline:
                 {
                     'name': td.name,
                     'sources': len(td.sources),
-                    'reports': len(td.reports),
-                    'insights': len(td.insights),
+                    'reports': td.report_count,
+                    'insights': td.insight_count,
                     'has_narrative': bool(td.narrative),
                     'last_updated': td.last_updated
                 }
                 for td in self.topics_data.values()
             ],
             'total_topics': len(self.topics_data),
-            'total_reports': sum(len(td.reports) for td in self.topics_data.values()),
-            'total_insights': sum(len(td.insights) for td in self.topics_data.values())
+            'total_reports': sum(td.report_count for td in self.topics_data.values()),
+            'total_insights': sum(td.insight_count for td in self.topics_data.values())
         }
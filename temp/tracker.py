@@ -16,20 +16,47 @@ Data: 23 Dicembre 2025
 import os
 import sys
 import argparse
+from itertools import islice
 from datetime import datetime
 from pathlib import Path
 
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from source_registry import SourceRegistry, SourceType
-from site_graph import SiteGraphRegistry
-from route_discovery import RouteDiscovery, bootstrap_site_graphs
-from topic_pipeline import TopicPipeline
-from dashboard_generator import DashboardGenerator
+from source_registry import SourceRegistry
 import utils
 
 
+# Pipeline e dashboard importate solo dai comandi che le usano: caricano grafi,
+# discovery e parsing (numpy/numba, bs4, ...), inutili per 'sources'
+def _create_pipeline(data_dir: Path, ai_provider: str, ai_api_key: str, **kwargs):
+    """Crea la TopicPipeline sui dati in data_dir"""
+    from topic_pipeline import TopicPipeline
+    return TopicPipeline(
+        storage_dir=str(data_dir),
+        ai_provider=ai_provider,
+        ai_api_key=ai_api_key,
+        **kwargs
+    )
+
+
+def _create_dashboard_generator(output_dir: Path):
+    """Crea il DashboardGenerator su output_dir"""
+    from dashboard_generator import DashboardGenerator
+    return DashboardGenerator(str(output_dir))
+
+
+def _positive_int(value: str) -> int:
+    """Tipo argparse: intero >= 1"""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"intero non valido: {value!r}")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"deve essere almeno 1: {number}")
+    return number
+
+
 def main():
     """Entry point principale"""
     
@@ -69,6 +96,13 @@ def main():
         help='Max report per fonte'
     )
     
+    parser.add_argument(
+        '--workers',
+        type=_positive_int,
+        default=os.getenv('GIT_WORKERS', '4'),
+        help='Chiamate AI in parallelo per analisi e narrative (default: $GIT_WORKERS o 4)'
+    )
+    
     parser.add_argument(
         '--output-dir',
         type=str,
@@ -118,7 +152,7 @@ def main():
             if count > 0:
                 print(f"  • {type_name}: {count}")
         print("\n🏷️ Topics Coverage:")
-        for topic, count in list(census['topics'].items())[:10]:
+        for topic, count in islice(census['topics'].items(), 10):
             print(f"  • {topic}: {count} sources")
         print("\n📋 All Sources:")
         for source in census['sources']:
@@ -128,11 +162,7 @@ def main():
     
     elif args.command == 'status':
         # Mostra stato pipeline
-        pipeline = TopicPipeline(
-            storage_dir=str(data_dir),
-            ai_provider=ai_provider,
-            ai_api_key=ai_api_key
-        )
+        pipeline = _create_pipeline(data_dir, ai_provider, ai_api_key)
         
         summary = pipeline.get_topic_summary()
         
@@ -149,11 +179,7 @@ def main():
     
     elif args.command == 'discover':
         # Scopri struttura siti
-        pipeline = TopicPipeline(
-            storage_dir=str(data_dir),
-            ai_provider=ai_provider,
-            ai_api_key=ai_api_key
-        )
+        pipeline = _create_pipeline(data_dir, ai_provider, ai_api_key)
         
         source_slugs = [args.source] if args.source else None
         pipeline.discover_sources(source_slugs)
@@ -162,11 +188,7 @@ def main():
     
     elif args.command == 'fetch':
         # Scarica report
-        pipeline = TopicPipeline(
-            storage_dir=str(data_dir),
-            ai_provider=ai_provider,
-            ai_api_key=ai_api_key
-        )
+        pipeline = _create_pipeline(data_dir, ai_provider, ai_api_key)
         
         reports = pipeline.fetch_reports(
             topic=args.topic,
@@ -177,10 +199,10 @@ def main():
     
     elif args.command == 'analyze':
         # Analizza report esistenti
-        pipeline = TopicPipeline(
-            storage_dir=str(data_dir),
-            ai_provider=ai_provider,
-            ai_api_key=ai_api_key
+        pipeline = _create_pipeline(
+            data_dir, ai_provider, ai_api_key,
+            narrative_workers=args.workers,
+            analysis_workers=args.workers
         )
         
         # Get existing documents
@@ -211,13 +233,9 @@ def main():
     
     elif args.command == 'dashboard':
         # Genera dashboard
-        pipeline = TopicPipeline(
-            storage_dir=str(data_dir),
-            ai_provider=ai_provider,
-            ai_api_key=ai_api_key
-        )
+        pipeline = _create_pipeline(data_dir, ai_provider, ai_api_key)
         
-        dashboard_gen = DashboardGenerator(str(output_dir))
+        dashboard_gen = _create_dashboard_generator(output_dir)
         
         filepath = dashboard_gen.generate_dashboard(
             pipeline.topics_data,
@@ -230,17 +248,17 @@ def main():
         # Pipeline completa
         topics = [args.topic] if args.topic else None
         
-        pipeline = TopicPipeline(
-            storage_dir=str(data_dir),
-            ai_provider=ai_provider,
-            ai_api_key=ai_api_key
+        pipeline = _create_pipeline(
+            data_dir, ai_provider, ai_api_key,
+            narrative_workers=args.workers,
+            analysis_workers=args.workers
         )
         
         # Run pipeline
         pipeline.run_full_pipeline(topics=topics)
         
         # Generate dashboard
-        dashboard_gen = DashboardGenerator(str(output_dir))
+        dashboard_gen = _create_dashboard_generator(output_dir)
         filepath = dashboard_gen.generate_dashboard(
             pipeline.topics_data,
             pipeline.source_registry
@@ -0,0 +1,20 @@
+# -*- coding: utf-8 -*-
+"""
+Configurazione comune dei test
+"""
+
+import sys
+from pathlib import Path
+
+# Aggiungi root e temp al path (moduli v2 importati come top-level)
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+sys.path.insert(0, str(ROOT_DIR / 'temp'))
+
+# I moduli v2 importano `utils` top-level (logger, get_random_user_agent):
+# se il modulo legacy non c'è si usano le utility condivise di src.core
+try:
+    import utils
+except ImportError:
+    from src.core import utils
+    sys.modules['utils'] = utils
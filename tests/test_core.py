@@ -5,13 +5,14 @@ Test Scrapers
 
 import pytest
 import sys
+from datetime import datetime
 from pathlib import Path
 
 # Aggiungi root al path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from src.core.config import SOURCES
-from src.core.utils import normalize_url, clean_text, extract_category_from_url
+from src.core.utils import normalize_url, clean_text, extract_category_from_url, parse_date, is_relevant
 from src.analyzers.topic_classifier import TopicClassifier
 
 
@@ -31,6 +32,20 @@ class TestUtils:
         assert extract_category_from_url("/insights/ai-trends") == "Artificial Intelligence"
         assert extract_category_from_url("/cloud-computing") == "Cloud Computing"
         assert extract_category_from_url("/random-page") == "General"
+    
+    def test_parse_date(self):
+        assert parse_date("2025-12-23") == datetime(2025, 12, 23)
+        assert parse_date("23/12/2025") == datetime(2025, 12, 23)
+        assert parse_date("12/23/2025") == datetime(2025, 12, 23)
+        assert parse_date("December 23, 2025") == datetime(2025, 12, 23)
+        assert parse_date("2025-02-30") is None
+        assert parse_date("") is None
+    
+    def test_is_relevant(self):
+        assert is_relevant("The state of Machine Learning")
+        assert is_relevant("Quarterly outlook", "Zero Trust adoption")
+        assert not is_relevant("Quarterly outlook", keywords=["cloud"])
+        assert not is_relevant("Cloud outlook", keywords=[])
 
 
 class TestTopicClassifier:
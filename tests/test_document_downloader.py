@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""
+Test Document Downloader (rate limiting per dominio)
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Aggiungi root al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.processors import document_downloader
+from src.processors.document_downloader import DocumentDownloader, DOWNLOADS_PER_PAUSE
+
+
+@pytest.fixture
+def events(monkeypatch):
+    """Orologio finto: sleep avanza il tempo e registra la pausa"""
+    log = []
+    clock = [1000.0]
+
+    def fake_sleep(seconds):
+        log.append(('sleep', seconds))
+        clock[0] += seconds
+
+    monkeypatch.setattr(document_downloader.time, 'monotonic', lambda: clock[0])
+    monkeypatch.setattr(document_downloader.time, 'sleep', fake_sleep)
+    monkeypatch.setattr(document_downloader.SCRAPING, 'request_delay', 2.0)
+    return log
+
+
+@pytest.fixture
+def downloader(events):
+    """Downloader che registra gli URL invece di scaricarli"""
+    dl = DocumentDownloader()
+
+    def fake_download(article):
+        events.append(('download', article['url']))
+        return article
+
+    dl.download_article = fake_download
+    return dl
+
+
+def _articles(domain: str, count: int) -> list:
+    return [{'url': f'https://{domain}/doc-{i}', 'title': f'Doc {i}'} for i in range(count)]
+
+
+class TestDomainPacing:
+    """Pausa ogni DOWNLOADS_PER_PAUSE download, solo per il dominio interessato"""
+
+    def test_no_pause_below_threshold(self, downloader, events):
+        downloader.download_all(_articles('a.com', DOWNLOADS_PER_PAUSE))
+        assert [e for e in events if e[0] == 'sleep'] == []
+
+    def test_pause_after_threshold(self, downloader, events):
+        articles = _articles('a.com', DOWNLOADS_PER_PAUSE + 1)
+        downloader.download_all(articles)
+
+        assert events[DOWNLOADS_PER_PAUSE] == ('sleep', 2.0)
+        assert events[-1] == ('download', articles[-1]['url'])
+        assert [e for e in events if e[0] == 'sleep'] == [('sleep', 2.0)]
+
+    def test_other_domain_not_delayed(self, downloader, events):
+        burst = _articles('a.com', DOWNLOADS_PER_PAUSE)
+        other = _articles('b.com', 1)
+        after = [{'url': 'https://a.com/late', 'title': 'Late'}]
+        downloader.download_all(burst + other + after)
+
+        # b.com passa subito; la pausa arriva solo prima del download successivo di a.com
+        assert events[DOWNLOADS_PER_PAUSE] == ('download', other[0]['url'])
+        assert events[DOWNLOADS_PER_PAUSE + 1] == ('sleep', 2.0)
+        assert events[-1] == ('download', 'https://a.com/late')
+
+    def test_pause_only_for_remaining_time(self, downloader, events):
+        # Il tempo trascorso da altri download riduce l'attesa residua
+        burst = _articles('a.com', DOWNLOADS_PER_PAUSE)
+        downloader.download_all(burst)
+        document_downloader.time.sleep(0.5)
+        events.clear()
+
+        downloader.download_all([{'url': 'https://a.com/late', 'title': 'Late'}])
+        assert events == [('sleep', 1.5), ('download', 'https://a.com/late')]
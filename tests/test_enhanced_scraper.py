@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+"""
+Test Enhanced Scraper (estrazione link)
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Aggiungi temp al path (moduli v2 importati come top-level)
+sys.path.insert(0, str(Path(__file__).parent.parent / 'temp'))
+
+import enhanced_scraper
+from enhanced_scraper import EnhancedScraper
+
+
+CARD = ('<div class="card"><a href="/insights/report">Title of the report</a>'
+        '<p class="description">Desc after link</p></div>')
+
+
+class TestExtractInsightLinks:
+    """Test extract_insight_links"""
+    
+    def test_description_after_link_in_one_chunk(self):
+        scraper = EnhancedScraper()
+        html = f"<html><body>{CARD}</body></html>"
+        links = scraper.extract_insight_links(html, 'https://www2.deloitte.com')
+        assert links[0]['description'] == 'Desc after link'
+    
+    @pytest.mark.skipif(not enhanced_scraper.LXML_AVAILABLE, reason="lxml non installato")
+    def test_description_after_chunk_boundary(self):
+        scraper = EnhancedScraper()
+        html = f"<html><body><div>{'x' * 100}</div>{CARD}</body></html>"
+        # Sposta la card in modo che '</a>' termini esattamente a fine blocco
+        shift = enhanced_scraper._PARSE_CHUNK_SIZE - (html.index('</a>') + len('</a>'))
+        html = html.replace('x' * 100, 'x' * (100 + shift))
+        assert html.index('</a>') + len('</a>') == enhanced_scraper._PARSE_CHUNK_SIZE
+        
+        links = scraper.extract_insight_links(html, 'https://www2.deloitte.com')
+        assert links[0]['description'] == 'Desc after link'
+    
+    def test_same_href_on_different_sources(self):
+        scraper = EnhancedScraper()
+        first = scraper.extract_insight_links(
+            '<a href="/insights/2025">Deloitte tech trends</a>', 'https://www2.deloitte.com')
+        second = scraper.extract_insight_links(
+            '<a href="/insights/2025">McKinsey state of AI</a>', 'https://www.mckinsey.com')
+        assert first[0]['title'] == 'Deloitte tech trends'
+        assert second[0]['title'] == 'McKinsey state of AI'
+    
+    def test_untitled_anchor_does_not_hide_url(self):
+        scraper = EnhancedScraper()
+        seen = set()
+        html = ('<a href="/insights/report"><img src="x.png"></a>'
+                '<a href="/insights/report">Title of the report</a>')
+        links = scraper.extract_insight_links(html, 'https://www2.deloitte.com', seen=seen)
+        assert [link['title'] for link in links] == ['Title of the report']
+        
+        # Sulle pagine successive l'URL estratto resta deduplicato
+        assert scraper.extract_insight_links(html, 'https://www2.deloitte.com', seen=seen) == []
+
+
+class TestProfileDir:
+    """Profilo Chrome creato al primo driver e riservato a un solo scraper"""
+
+    def test_not_created_on_init(self, tmp_path):
+        EnhancedScraper(profile_dir=tmp_path / 'profile')
+        assert not (tmp_path / 'profile').exists()
+
+    @pytest.mark.skipif(not (enhanced_scraper.FCNTL_AVAILABLE or enhanced_scraper.MSVCRT_AVAILABLE),
+                        reason="lock file non supportato")
+    def test_profile_in_use_falls_back_to_temp(self, tmp_path):
+        profile = tmp_path / 'profile'
+        first = EnhancedScraper(profile_dir=profile)
+        second = EnhancedScraper(profile_dir=profile)
+
+        assert first._acquire_profile_dir() == profile
+        fallback = second._acquire_profile_dir()
+        assert fallback != profile
+        assert fallback.is_dir()
+
+        second.close()
+        assert not fallback.exists()
+        first.close()
+
+        # Lock rilasciato: il profilo persistente torna disponibile
+        assert second._acquire_profile_dir() == profile
+        second.close()
+
+
+# Altezza viewport del driver finto
+VIEWPORT = 1000
+
+
+class FakeDriver:
+    """Pagina simulata: lazy_loads caricamenti quando lo scroll arriva al fondo"""
+
+    def __init__(self, viewports: int, lazy_loads: int = 0):
+        self.height = viewports * VIEWPORT
+        self.links = 10
+        self.y = 0
+        self.lazy_loads = lazy_loads
+        self.scripts = []
+
+    def execute_script(self, script):
+        self.scripts.append(script)
+        if script == enhanced_scraper._PAGE_CONTENT_JS:
+            return [self.height, self.links]
+        if 'scrollBy' in script:
+            self.y = min(self.y + VIEWPORT, self.height - VIEWPORT)
+            at_bottom = self.y + VIEWPORT >= self.height
+            # Il contenuto lazy arriva dopo il ritorno dello script
+            if at_bottom and self.lazy_loads:
+                self.lazy_loads -= 1
+                self.height += 3 * VIEWPORT
+                self.links += 10
+            return at_bottom
+        if 'scrollTo' in script:
+            self.y = 0
+        return None
+
+
+@pytest.mark.skipif(not enhanced_scraper.SELENIUM_AVAILABLE, reason="selenium non installato")
+class TestScrollPage:
+    """Scroll fino al fondo, attendendo solo i contenuti lazy"""
+
+    @pytest.fixture(autouse=True)
+    def _short_wait(self, monkeypatch):
+        monkeypatch.setattr(enhanced_scraper, 'SCROLL_CONTENT_WAIT', 0.1)
+
+    def test_no_full_load_wait(self):
+        driver = FakeDriver(viewports=3)
+        EnhancedScraper()._scroll_page(driver, wait_time=8)
+
+        assert not any('readyState' in script for script in driver.scripts)
+        assert driver.y == 0
+
+    def test_scrolls_past_four_viewports(self):
+        driver = FakeDriver(viewports=12)
+        EnhancedScraper()._scroll_page(driver, wait_time=8)
+
+        scrolls = sum('scrollBy' in script for script in driver.scripts)
+        assert scrolls == 11
+
+    def test_follows_lazy_loaded_content(self):
+        driver = FakeDriver(viewports=2, lazy_loads=3)
+        EnhancedScraper()._scroll_page(driver, wait_time=8)
+
+        assert driver.lazy_loads == 0
+        assert driver.height == 11 * VIEWPORT
+        assert driver.links == 40
+
+    def test_safety_cap(self, monkeypatch):
+        monkeypatch.setattr(enhanced_scraper, 'MAX_SCROLL_STEPS', 5)
+        driver = FakeDriver(viewports=2, lazy_loads=1000)
+        EnhancedScraper()._scroll_page(driver, wait_time=8)
+
+        assert sum('scrollBy' in script for script in driver.scripts) == 5
+        assert driver.y == 0
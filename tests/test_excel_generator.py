@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+"""
+Test Excel Generator (database articoli ed export Excel)
+"""
+
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+# Aggiungi root al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.generators.excel_generator import ExcelGenerator
+
+
+@pytest.fixture
+def excel(tmp_path):
+    return ExcelGenerator(str(tmp_path / 'report.xlsx'))
+
+
+def _titles(df: pd.DataFrame) -> list:
+    return df['title'].tolist()
+
+
+class TestExcelGenerator:
+    """Test ExcelGenerator"""
+    
+    def test_save_only_writes_database(self, excel):
+        assert excel.save([{'title': 'a', 'url': 'u1', 'source': 'S'}])
+        assert excel.db_path.exists()
+        assert not excel.filepath.exists()
+    
+    def test_append_keeps_last_version_per_url(self, excel):
+        excel.save([{'title': 'a', 'url': 'u1'}, {'title': 'b', 'url': 'u2'}])
+        excel.save([{'title': 'a2', 'url': 'u1'}, {'title': 'c', 'url': 'u3'}])
+        assert _titles(excel.load()) == ['b', 'a2', 'c']
+    
+    def test_replace(self, excel):
+        excel.save([{'title': 'a', 'url': 'u1'}])
+        excel.save([{'title': 'z', 'url': 'u9'}], append=False)
+        assert _titles(excel.load()) == ['z']
+    
+    def test_articles_without_url_are_skipped(self, excel):
+        excel.save([{'title': 'a', 'url': ''}, {'title': 'b'}, {'title': 'c', 'url': 'u3'}])
+        assert _titles(excel.load()) == ['c']
+    
+    def test_export_to_excel(self, excel):
+        excel.save([{'title': 'a', 'url': 'u1', 'source': 'S', 'topic': 'AI'}])
+        assert excel.export_to_excel()
+        
+        df = pd.read_excel(excel.filepath)
+        assert df.columns[:2].tolist() == ['title', 'source']
+        assert df['url'].tolist() == ['u1']
+    
+    def test_migrates_existing_excel(self, excel):
+        pd.DataFrame([
+            {'title': 'old', 'url': 'u1', 'source': 'S'},
+            {'title': 'kept', 'url': 'u2', 'source': 'S'},
+        ]).to_excel(excel.filepath, index=False)
+        
+        excel.save([{'title': 'new', 'url': 'u1', 'source': 'S'}])
+        assert _titles(excel.load()) == ['kept', 'new']
+        assert excel.get_stats()['total'] == 2
+    
+    def test_warns_on_manual_excel_edits(self, excel, caplog):
+        excel.save([{'title': 'a', 'url': 'u1'}])
+        excel.export_to_excel()
+        pd.DataFrame([{'title': 'edited', 'url': 'u1'}]).to_excel(excel.filepath, index=False)
+        
+        excel.load()
+        assert 'modificato dopo l\'ultimo export' in caplog.text
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""
+Test Report Generator (report Excel per topic)
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+from openpyxl import load_workbook
+
+# Aggiungi temp al path (moduli v2 importati come top-level)
+sys.path.insert(0, str(Path(__file__).parent.parent / 'temp'))
+
+import report_generator
+from report_generator import TopicReportGenerator
+
+# Topic con i primi 31 caratteri uguali
+LONG_TOPIC = 'Artificial Intelligence in Financial Services'
+COLLIDING_TOPIC = 'Artificial Intelligence in Financial Markets'
+
+SUMMARY = {'total_topics': 3, 'total_documents': 3, 'total_insights': 3}
+
+
+def _stories(*topics) -> dict:
+    return {
+        topic: {'insights': [{'text': f'Insight {topic}', 'source': 'test', 'confidence': 'high'}]}
+        for topic in topics
+    }
+
+
+@pytest.fixture
+def generator(tmp_path):
+    return TopicReportGenerator(str(tmp_path))
+
+
+def _sheet_names(path: str) -> list:
+    wb = load_workbook(path, read_only=True)
+    try:
+        return wb.sheetnames
+    finally:
+        wb.close()
+
+
+class TestExcelSheetNames:
+    """Nomi sheet univoci e identici con entrambi i writer"""
+
+    def test_colliding_topics_openpyxl(self, generator):
+        path = generator.generate_excel_report(
+            _stories(LONG_TOPIC, COLLIDING_TOPIC, 'Summary'), SUMMARY)
+
+        names = _sheet_names(path)
+        assert len(names) == 4
+        assert len({name.lower() for name in names}) == 4
+        assert all(len(name) <= 31 for name in names)
+
+    @pytest.mark.skipif(not report_generator.XLSXWRITER_AVAILABLE, reason="xlsxwriter non installato")
+    def test_same_names_with_xlsxwriter(self, generator, monkeypatch):
+        stories = _stories(LONG_TOPIC, COLLIDING_TOPIC, 'Summary')
+        expected = _sheet_names(generator.generate_excel_report(stories, SUMMARY))
+
+        monkeypatch.setattr(report_generator, 'XLSXWRITER_ROW_THRESHOLD', 0)
+        path = generator.generate_excel_report(stories, SUMMARY)
+
+        assert _sheet_names(path) == expected
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""
+Test Route Discovery (quick scan con richieste condizionali)
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+from bs4 import BeautifulSoup
+
+# Aggiungi temp al path (moduli v2 importati come top-level)
+sys.path.insert(0, str(Path(__file__).parent.parent / 'temp'))
+
+from route_discovery import RouteDiscovery
+from site_graph import SiteGraph
+
+URL = 'https://example.com/insights/'
+
+
+def _page(etag: str) -> dict:
+    soup = BeautifulSoup('<html><title>Insights</title><a href="/r.pdf">Report</a></html>',
+                         'html.parser')
+    return {'soup': soup, 'title': 'Insights', 'content_type': 'text/html',
+            'status': 200, 'etag': etag, 'last_modified': None}
+
+
+@pytest.fixture
+def discovery():
+    return RouteDiscovery()
+
+
+class TestQuickScanValidators:
+    """I validatori HTTP sono ritornati, non aggiornati in place"""
+
+    def test_returns_new_validators(self, discovery, monkeypatch):
+        monkeypatch.setattr(discovery, '_fetch_page', lambda url, headers=None: _page('"v2"'))
+        etags = {URL: '"v1"'}
+        last_modified = {URL: 'Mon, 01 Jan 2024 00:00:00 GMT'}
+
+        graph, new_etags, new_last_modified = discovery.quick_scan(
+            'example', [URL], existing_graph=SiteGraph('example', 'https://example.com'),
+            etags=etags, last_modified=last_modified)
+
+        assert URL in graph.nodes
+        assert new_etags == {URL: '"v2"'}
+        assert new_last_modified == {}
+        # Gli originali restano invariati finché il chiamante non salva il grafo
+        assert etags == {URL: '"v1"'}
+        assert last_modified == {URL: 'Mon, 01 Jan 2024 00:00:00 GMT'}
+
+    def test_not_modified_keeps_graph(self, discovery, monkeypatch):
+        requests_headers = []
+
+        def fake_fetch(url, headers=None):
+            requests_headers.append(headers)
+            return {'status': 304}
+
+        monkeypatch.setattr(discovery, '_fetch_page', fake_fetch)
+        existing = SiteGraph('example', 'https://example.com')
+
+        graph, etags, _ = discovery.quick_scan('example', [URL], existing_graph=existing,
+                                               etags={URL: '"v1"'})
+
+        assert graph is existing
+        assert etags == {URL: '"v1"'}
+        assert requests_headers == [{'If-None-Match': '"v1"'}]
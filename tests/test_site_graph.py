@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+"""
+Test Site Graph (statistiche, censimento e serializzazione)
+"""
+
+import os
+import sys
+from dataclasses import fields
+from pathlib import Path
+
+import pytest
+
+# Aggiungi temp al path (moduli v2 importati come top-level)
+sys.path.insert(0, str(Path(__file__).parent.parent / 'temp'))
+
+import site_graph
+
+
+def _make_graph():
+    """Grafo minimo con una homepage"""
+    graph = site_graph.SiteGraph('Test', 'https://example.com')
+    graph.add_node(site_graph.GraphNode(
+        url='https://example.com',
+        node_type=site_graph.NodeType.HOME,
+        topics=['ai'],
+    ))
+    return graph
+
+
+class TestStatsCopies:
+    """Le statistiche in cache non sono modificabili dai chiamanti"""
+
+    def test_get_stats_nested_copy(self):
+        graph = _make_graph()
+        stats = graph.get_stats()
+        stats['node_types']['home'] = 99
+        stats['topics_covered'].append('altro')
+
+        fresh = graph.get_stats()
+        assert fresh['node_types']['home'] == 1
+        assert 'altro' not in fresh['topics_covered']
+
+    def test_get_census_copy_and_timestamp(self, tmp_path, monkeypatch):
+        registry = site_graph.SiteGraphRegistry(storage_dir=str(tmp_path))
+        registry.add_graph('test', _make_graph())
+
+        first = registry.get_census()
+        first['sites']['test']['total_nodes'] = 0
+        first['topics_coverage'].clear()
+
+        class _Later(site_graph.datetime):
+            @classmethod
+            def now(cls, tz=None):
+                return site_graph.datetime(2100, 1, 1)
+
+        monkeypatch.setattr(site_graph, 'datetime', _Later)
+        second = registry.get_census()
+        assert second['sites']['test']['total_nodes'] == 1
+        assert second['topics_coverage']
+        assert second['generated_at'] == '2100-01-01T00:00:00'
+        assert second['generated_at'] != first['generated_at']
+
+
+class TestSerializationFields:
+    """to_dict resta allineato ai campi delle dataclass"""
+
+    def test_node_to_dict_fields(self):
+        node = site_graph.GraphNode(url='https://example.com')
+        assert set(node.to_dict()) == {f.name for f in fields(site_graph.GraphNode)}
+
+    def test_edge_to_dict_fields(self):
+        edge = site_graph.GraphEdge(from_url='https://example.com', to_url='https://example.com/a')
+        assert set(edge.to_dict()) == {f.name for f in fields(site_graph.GraphEdge)}
+
+    def test_node_round_trip(self):
+        node = site_graph.GraphNode(
+            url='https://example.com/report',
+            node_type=site_graph.NodeType.REPORT_PAGE,
+            title='Report',
+            topics=['ai'],
+            depth=2,
+            parent_url='https://example.com',
+            visit_count=3,
+            document_url='https://example.com/report.pdf',
+            metadata={'lang': 'en'},
+        )
+        assert site_graph.GraphNode.from_dict(node.to_dict()) == node
+
+    def test_edge_round_trip(self):
+        edge = site_graph.GraphEdge('https://example.com', 'https://example.com/a',
+                                    link_text='A', edge_type='download', weight=2.0)
+        assert site_graph.GraphEdge(**edge.to_dict()) == edge
+
+
+def _add_page(graph, path: str):
+    graph.add_node(site_graph.GraphNode(url=f'https://example.com/{path}',
+                                        node_type=site_graph.NodeType.SECTION))
+
+
+class TestRegistryPersistence:
+    """Salvataggio e ricaricamento dei grafi dal registro"""
+
+    def test_json_round_trip(self, tmp_path):
+        registry = site_graph.SiteGraphRegistry(storage_dir=str(tmp_path))
+        registry.add_graph('test', _make_graph())
+        registry.save_graph('test')
+
+        reloaded = site_graph.SiteGraphRegistry(storage_dir=str(tmp_path))
+        assert set(reloaded.get_graph('test').nodes) == {'https://example.com'}
+
+    @pytest.mark.skipif(not site_graph.PYARROW_AVAILABLE, reason="pyarrow non installato")
+    def test_parquet_round_trip_keeps_format(self, tmp_path):
+        graph = _make_graph()
+        _add_page(graph, 'a')
+        graph.save_parquet(str(tmp_path / 'test'))
+
+        registry = site_graph.SiteGraphRegistry(storage_dir=str(tmp_path))
+        _add_page(registry.get_graph('test'), 'b')
+        registry.save_all()
+        assert not (tmp_path / 'test.json').exists()
+
+        reloaded = site_graph.SiteGraphRegistry(storage_dir=str(tmp_path))
+        assert len(reloaded.get_graph('test').nodes) == 3
+
+    @pytest.mark.skipif(not site_graph.PYARROW_AVAILABLE, reason="pyarrow non installato")
+    def test_newest_copy_wins(self, tmp_path):
+        old = _make_graph()
+        old.save_parquet(str(tmp_path / 'test'))
+        new = _make_graph()
+        _add_page(new, 'a')
+        new.save(str(tmp_path / 'test.json'))
+
+        # Parquet più vecchio del JSON: va ignorato
+        os.utime(tmp_path / 'test' / 'graph.json', ns=(1, 1))
+        assert len(site_graph.SiteGraphRegistry(storage_dir=str(tmp_path)).get_graph('test').nodes) == 2
+
+        # e viceversa
+        os.utime(tmp_path / 'test.json', ns=(0, 0))
+        os.utime(tmp_path / 'test' / 'graph.json', ns=(10**18, 10**18))
+        assert len(site_graph.SiteGraphRegistry(storage_dir=str(tmp_path)).get_graph('test').nodes) == 1